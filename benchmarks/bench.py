@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Benchmarks for magorder.
+
+Each benchmark reports operations per second (best of several timing runs) and the peak memory
+allocated by a single call, as traced by ``tracemalloc``. Results can be saved to a JSON file and
+compared against a previous one, typically the results of the previous release:
+
+    python benchmarks/bench.py --save benchmarks/results/0.21.json
+    python benchmarks/bench.py --compare benchmarks/results/0.21.json
+
+Only the standard library is required. NumPy benchmarks run when NumPy is installed.
+"""
+
+import argparse
+import array
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from magorder.base import MagnitudeSystem
+from magorder.buffers import convert_buffer
+from magorder.catalog import UnitCatalog
+from magorder.compound import DataRateUnit
+from magorder.data import IECDataMagnitudeUnit, SIDataMagnitudeUnit
+from magorder.duration import TimeMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+BULK_SIZE = 10_000
+
+FAMILIES = {
+    "si": (lambda: StdSIMagnitudeUnit("m"), "km", "µm"),
+    "si-data": (lambda: SIDataMagnitudeUnit("B"), "GB", "kB"),
+    "iec": (lambda: IECDataMagnitudeUnit("B"), "GiB", "KiB"),
+    "iec-nocase": (lambda: IECDataMagnitudeUnit("B", case=False), "giB", "KiB"),
+    "iec-legacy": (lambda: IECDataMagnitudeUnit("B", legacy=True), "GB", "KiB"),
+    "time": (TimeMagnitudeUnit, "h", "ms"),
+}
+
+BENCHMARKS = {}
+
+
+def benchmark(name, ops=1):
+    """Register a benchmark. The decorated function returns the callable to be measured, or a context
+    manager providing it, for benchmarks holding resources."""
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, ops)
+        return setup
+    return decorator
+
+
+def _register_family(family, make_unit, from_unit, to_unit):
+    def prefix(unit):
+        return make_unit().prefix_of(unit)
+
+    benchmark(f"{family}/unit-construction")(lambda: make_unit)
+
+    @benchmark(f"{family}/magnitude_by_prefix")
+    def _magnitude_by_prefix():
+        mag_sys, from_order = make_unit().mag_sys, prefix(from_unit)
+        return lambda: mag_sys.magnitude_by_prefix(from_order)
+
+    @benchmark(f"{family}/factor")
+    def _factor():
+        mag_sys, from_order = make_unit().mag_sys, prefix(from_unit)
+        return lambda: mag_sys.factor(from_order)
+
+    @benchmark(f"{family}/to_prefix")
+    def _to_prefix():
+        mag_sys = make_unit().mag_sys
+        return lambda: mag_sys.to_prefix(2)
+
+    @benchmark(f"{family}/convert")
+    def _convert():
+        mag_sys, from_order, to_order = make_unit().mag_sys, prefix(from_unit), prefix(to_unit)
+        return lambda: mag_sys.convert(1.5, from_order, to_order)
+
+    @benchmark(f"{family}/converter")
+    def _converter():
+        converter = make_unit().mag_sys.get_converter(prefix(from_unit), prefix(to_unit))
+        return lambda: converter(1.5)
+
+    @benchmark(f"{family}/transform")
+    def _transform():
+        unit = make_unit()
+        return lambda: unit.transform(1.5, from_unit, to_unit)
+
+    @benchmark(f"{family}/parse")
+    def _parse():
+        unit, text = make_unit(), f"1.5 {from_unit}"
+        return lambda: unit.parse(text, to_unit)
+
+    @benchmark(f"{family}/transform_many", ops=BULK_SIZE)
+    def _transform_many():
+        unit, values = make_unit(), [random.random() * 1000 for _ in range(BULK_SIZE)]
+        return lambda: unit.transform_many(values, from_unit, to_unit)
+
+    @benchmark(f"{family}/transform_many-units", ops=BULK_SIZE)
+    def _transform_many_units():
+        unit, values = make_unit(), [random.random() * 1000 for _ in range(BULK_SIZE)]
+        units = [random.choice((from_unit, to_unit)) for _ in range(BULK_SIZE)]
+        return lambda: unit.transform_many(values, units, to_unit)
+
+    @benchmark(f"{family}/parse_many", ops=BULK_SIZE)
+    def _parse_many():
+        unit = make_unit()
+        lines = [f"{random.random() * 1000:.3f} {random.choice((from_unit, to_unit))}" for _ in range(BULK_SIZE)]
+        return lambda: unit.parse_many(lines, to_unit)
+
+    @benchmark(f"{family}/format")
+    def _format():
+        unit = make_unit()
+        return lambda: unit.format(123_456.789)
+
+    @benchmark(f"{family}/write_many", ops=BULK_SIZE)
+    def _write_many():
+        unit, values = make_unit(), [random.random() * 1e9 for _ in range(BULK_SIZE)]
+        return lambda: unit.write_many(io.StringIO(), values)
+
+    @benchmark(f"{family}/histogram", ops=BULK_SIZE)
+    def _histogram():
+        unit, values = make_unit(), [random.random() * 1e9 for _ in range(BULK_SIZE)]
+        return lambda: unit.histogram(values, sums=True)
+
+    if numpy is not None:
+        @benchmark(f"{family}/histogram-numpy", ops=BULK_SIZE)
+        def _histogram_numpy():
+            unit, values = make_unit(), numpy.random.random(BULK_SIZE) * 1e9
+            return lambda: unit.histogram(values, sums=True)
+
+        @benchmark(f"{family}/transform_many-numpy", ops=BULK_SIZE)
+        def _transform_many_numpy():
+            unit, values = make_unit(), numpy.random.random(BULK_SIZE) * 1000
+            out = numpy.empty_like(values)
+            return lambda: unit.transform_many(values, from_unit, to_unit, out=out)
+
+    @benchmark(f"{family}/convert_buffer", ops=BULK_SIZE)
+    def _convert_buffer():
+        mag_sys, from_order, to_order = make_unit().mag_sys, prefix(from_unit), prefix(to_unit)
+        values = array.array("d", [random.random() * 1000 for _ in range(BULK_SIZE)])
+        out = array.array("d", values)
+        return lambda: convert_buffer(mag_sys, values, from_order, to_order, out)
+
+
+for _family, _args in FAMILIES.items():
+    _register_family(_family, *_args)
+
+
+@benchmark("system/construction")
+def _system_construction():
+    spec = StdSIMagnitudeUnit.std_si_order
+    return lambda: MagnitudeSystem(spec)
+
+
+@benchmark("system/transform-threads", ops=BULK_SIZE)
+@contextlib.contextmanager
+def _transform_threads():
+    unit, values = StdSIMagnitudeUnit("m"), [random.random() * 1000 for _ in range(BULK_SIZE)]
+    chunks = [values[i:i + 500] for i in range(0, BULK_SIZE, 500)]
+
+    def run(chunk):
+        return [unit.transform(value, "km", "m", decimals=3, rounding="floor") for value in chunk]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        yield lambda: list(executor.map(run, chunks))
+
+
+@benchmark("system/from_orders")
+def _system_from_orders():
+    orders = StdSIMagnitudeUnit.std_si_orders
+    return lambda: MagnitudeSystem.from_orders(orders)
+
+
+def _catalog_spec():
+    orders = [dict(kw, aliases=[kw["prefix"] + "_"]) for kw in StdSIMagnitudeUnit.std_si_order]
+    return {"families": {f"unit{i}": {"unit": f"u{i}", "orders": orders[::-1]} for i in range(20)}}
+
+
+@benchmark("catalog/compile")
+def _catalog_compile():
+    spec = _catalog_spec()
+    return lambda: UnitCatalog.compile(spec)
+
+
+@benchmark("catalog/load-cached")
+@contextlib.contextmanager
+def _catalog_load_cached():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "units.json")
+        with open(path, "w") as spec_file:
+            json.dump(_catalog_spec(), spec_file)
+        UnitCatalog.load(path)
+        yield lambda: UnitCatalog.load(path)
+
+
+@benchmark("rate/convert")
+def _rate_convert():
+    rate = DataRateUnit()
+    return lambda: rate.convert(1.5, "MiB/s", "Gbps")
+
+
+@benchmark("rate/converter")
+def _rate_converter():
+    converter = DataRateUnit().get_converter("MiB/s", "Gbps")
+    return lambda: converter(1.5)
+
+
+@benchmark("rate/convert_many", ops=BULK_SIZE)
+def _rate_convert_many():
+    rate, values = DataRateUnit(), [random.random() * 1000 for _ in range(BULK_SIZE)]
+    return lambda: rate.convert_many(values, "kB/ms", "Mbps")
+
+
+def measure(setup, ops, repeat):
+    """Measure one benchmark.
+
+    Returns:
+        dict: operations per second and peak bytes allocated per call.
+    """
+    context = setup()
+    if not isinstance(context, contextlib.AbstractContextManager):
+        context = contextlib.nullcontext(context)
+    with context as func:
+        func()
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=repeat, number=number))
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"ops_per_sec": number * ops / best, "alloc_bytes": peak}
+
+
+def compare(result, baseline):
+    if baseline is None:
+        return ""
+    ratio = result["ops_per_sec"] / baseline["ops_per_sec"]
+    return f"{ratio:8.2f}x {result['alloc_bytes'] - baseline['alloc_bytes']:+10d} B"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the magorder benchmarks.")
+    parser.add_argument("-k", "--filter", help="only run benchmarks whose name matches this regular expression")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="timing runs per benchmark, the best one is kept (default: 5)")
+    parser.add_argument("--save", metavar="FILE", help="save the results to a JSON file")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results to a JSON file saved previously")
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    results = {}
+    print(f"{'benchmark':42} {'ops/sec':>14} {'alloc':>10}{'  vs baseline' if baseline else ''}")
+    for name, (setup, ops) in BENCHMARKS.items():
+        if args.filter and not re.search(args.filter, name):
+            continue
+        results[name] = measure(setup, ops, args.repeat)
+        print(f"{name:42} {results[name]['ops_per_sec']:14,.0f} {results[name]['alloc_bytes']:8d} B {compare(results[name], baseline.get(name))}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "results": results}, file, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# code: language=python tabSize=4
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Conversion of values between orders of magnitude.
+
+The public classes are importable from the package itself, like ``from magorder import StdSIMagnitudeUnit``.
+Their modules are imported on first access, so importing the package costs almost nothing.
+"""
+
+import importlib
+from typing import Any, List
+
+
+_EXPORTS = {
+    "MagnitudeOrder": "base",
+    "MagnitudeSystem": "base",
+    "MagnitudeUnit": "base",
+    "StdSIMagnitudeUnit": "stdsi",
+    "SIDataMagnitudeUnit": "data",
+    "IECDataMagnitudeUnit": "data",
+    "TimeMagnitudeUnit": "duration",
+    "CompoundUnit": "compound",
+    "DataRateUnit": "compound",
+    "UnitRegistry": "registry",
+    "UnitCatalog": "catalog",
+    "Quantity": "quantity",
+    "MagnitudeAccumulator": "aggregate",
+    "UnitAccumulator": "aggregate",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+# code: language=python tabSize=4
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Optional NumPy support. NumPy is not a runtime dependency of this library.
+
+NumPy is imported only when it is needed: objects cannot be NumPy arrays before NumPy is imported by
+someone else, so importing this library does not pay for importing NumPy.
+"""
+
+import functools
+import importlib
+import sys
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from .types import Number
+
+
+@functools.lru_cache(maxsize=None)
+def load_numpy() -> Any:
+    """Import NumPy.
+
+    Returns:
+        Any: the ``numpy`` module, or ``None`` if NumPy is not installed.
+    """
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:  # pragma: no cover
+        return None
+
+
+def is_array(obj: Any) -> bool:
+    """Test whether an object is a NumPy array, without importing NumPy.
+
+    Args:
+        obj (Any): object to be tested.
+
+    Returns:
+        bool: ``True`` if NumPy is imported and ``obj`` is an array, ``False`` otherwise.
+    """
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(obj, numpy.ndarray)
+
+
+def convert_array(pair: Optional[Tuple[Number, int]], values: Any, out: Any = None) -> Any:
+    """Divide and round an array, given the parameters from ``MagnitudeSystem.conversion()``."""
+    numpy = load_numpy()
+    if pair is None:
+        if out is None:
+            return numpy.array(values, dtype=numpy.float64)
+        numpy.copyto(out, values)
+        return out
+    divisor, decimals = pair
+    out = numpy.divide(values, float(divisor), out=out)
+    return numpy.round(out, decimals, out=out)
+
+
+def convert_array_grouped(mag_sys: Any, values: Any, from_orders: Iterable[str],
+                           to_order: Optional[str], out: Any,
+                           prefix_of: Callable[[Optional[str]], Optional[str]]) -> Any:
+    """Convert an array with one origin per element, one vectorized operation per distinct origin."""
+    numpy = load_numpy()
+    if out is None:
+        out = numpy.empty(values.shape, dtype=numpy.float64)
+    keys, inverse = numpy.unique(numpy.asarray(from_orders), return_inverse=True)
+    inverse = inverse.reshape(values.shape)
+    for index, key in enumerate(keys):
+        mask = inverse == index
+        out[mask] = convert_array(mag_sys.conversion(prefix_of(str(key)), to_order), values[mask])
+    return out
+
+# code: language=python tabSize=4
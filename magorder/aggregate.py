@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Aggregation of quantities expressed in mixed orders of magnitude.
+
+Values are accumulated in one bucket per order of magnitude, in that order's own scale, and
+buckets are combined only when a result is requested. Integers are summed exactly; other numbers
+are summed with compensated (Neumaier) summation. Totals are combined as fractions, so no rounding
+error is introduced by mixing prefixes, and float results are rounded once, like ``convert()`` does.
+"""
+
+import math
+from fractions import Fraction
+from typing import Iterable, List, Optional, Tuple, Union
+
+from .base import MagnitudeSystem, MagnitudeUnit
+from .exact import exact_policy, exact_round
+from .types import Number
+
+
+class _Bucket:
+    """Aggregates of the values of one order of magnitude."""
+    __slots__ = ("count", "int_sum", "float_sum", "compensation", "minimum", "maximum", "values")
+
+    def __init__(self, keep_values: bool) -> None:
+        self.count = 0
+        self.int_sum = 0
+        self.float_sum = 0.0
+        self.compensation = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.values = [] if keep_values else None
+
+    def add(self, value: Number) -> None:
+        self.count += 1
+        if isinstance(value, int):
+            self.int_sum += value
+        else:
+            total = self.float_sum + value
+            if abs(self.float_sum) >= abs(value):
+                self.compensation += (self.float_sum - total) + value
+            else:
+                self.compensation += (value - total) + self.float_sum
+            self.float_sum = total
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        if self.values is not None:
+            self.values.append(value)
+
+    def merge(self, other: "_Bucket") -> None:
+        self.count += other.count
+        self.int_sum += other.int_sum
+        total = self.float_sum + other.float_sum
+        self.compensation += other.compensation + ((self.float_sum - total) + other.float_sum
+                                                   if abs(self.float_sum) >= abs(other.float_sum)
+                                                   else (other.float_sum - total) + self.float_sum)
+        self.float_sum = total
+        if other.minimum is not None and (self.minimum is None or other.minimum < self.minimum):
+            self.minimum = other.minimum
+        if other.maximum is not None and (self.maximum is None or other.maximum > self.maximum):
+            self.maximum = other.maximum
+        if self.values is not None:
+            if other.values is None:
+                raise ValueError("Cannot merge an accumulator that does not keep values into one that does")
+            self.values.extend(other.values)
+
+    def total(self) -> Fraction:
+        return self.int_sum + Fraction(self.float_sum) + Fraction(self.compensation)
+
+
+class MagnitudeAccumulator:
+    """Accumulate values in mixed orders of magnitude of a ``MagnitudeSystem``.
+
+    Results are expressed in any order of magnitude of the system. Accumulators fed separately,
+    for instance in worker processes, can be combined with ``merge()``.
+    """
+
+    def __init__(self, mag_sys: MagnitudeSystem, keep_values: bool = False) -> None:
+        """Create an object.
+
+        Args:
+            mag_sys (MagnitudeSystem): magnitude system of the values.
+            keep_values (bool, optional): keep every value, which is needed for ``percentile()``. Defaults to False.
+        """
+        self.mag_sys = mag_sys
+        self.keep_values = keep_values
+        self.buckets = {}  # maps primary prefixes to the aggregates of their values
+        self._prefix_buckets = {}
+
+    def _bucket(self, prefix: Optional[str]) -> _Bucket:
+        try:
+            return self._prefix_buckets[prefix]
+        except KeyError:
+            pass
+        primary = self.mag_sys.magnitude_by_prefix(prefix if prefix else self.mag_sys.default).prefix
+        bucket = self.buckets.get(primary)
+        if bucket is None:
+            bucket = self.buckets[primary] = _Bucket(self.keep_values)
+        self._prefix_buckets[prefix] = bucket
+        return bucket
+
+    def add(self, value: Number, prefix: Optional[str] = None) -> None:
+        """Add one value.
+
+        Args:
+            value (Number): value to be added.
+            prefix (Optional[str], optional): prefix of the value's order of magnitude. Defaults to the system's default.
+
+        Raises:
+            MagnitudeSystem.MagnitudeDoesNotExist: raised if the prefix does not exist.
+        """
+        self._bucket(prefix).add(value)
+
+    def update(self, items: Iterable[Tuple[Number, Optional[str]]]) -> None:
+        """Add many values.
+
+        Args:
+            items (Iterable[Tuple[Number, Optional[str]]]): pairs of value and prefix, see ``add()``.
+        """
+        for value, prefix in items:
+            self._bucket(prefix).add(value)
+
+    def merge(self, other: "MagnitudeAccumulator") -> "MagnitudeAccumulator":
+        """Add the values of another accumulator to this one.
+
+        Args:
+            other (MagnitudeAccumulator): accumulator of the same magnitude system, or of an identical one.
+
+        Raises:
+            ValueError: raised if the systems use different bases, orders or factors, or if this accumulator keeps values and the other one does not.
+
+        Returns:
+            MagnitudeAccumulator: this accumulator.
+        """
+        if other.mag_sys.base != self.mag_sys.base:
+            raise ValueError("Cannot merge accumulators of magnitude systems with different bases")
+        for prefix in other.buckets:
+            try:
+                factor = self.mag_sys.exact_factor(prefix)
+            except MagnitudeSystem.MagnitudeDoesNotExist:
+                raise ValueError(f"Cannot merge accumulators of magnitude systems without a common order for '{prefix}'")
+            if other.mag_sys.exact_factor(prefix) != factor:
+                raise ValueError(f"Cannot merge accumulators of magnitude systems with different factors for '{prefix}'")
+        for prefix, bucket in other.buckets.items():
+            mine = self.buckets.get(prefix)
+            if mine is None:
+                mine = self.buckets[prefix] = _Bucket(self.keep_values)
+            mine.merge(bucket)
+        self._prefix_buckets.clear()
+        return self
+
+    @property
+    def count(self) -> int:
+        """Number of values added."""
+        return sum(bucket.count for bucket in self.buckets.values())
+
+    def _scale(self, prefix: str, to_order: Optional[str]) -> Fraction:
+        return self.mag_sys.exact_factor(prefix) / self.mag_sys.exact_factor(to_order if to_order else self.mag_sys.default)
+
+    def _result(self, value: Fraction, to_order: Optional[str], exact: Union[None, bool, str]) -> Number:
+        """Convert a combined result to its final type.
+
+        Floats are rounded like ``MagnitudeSystem.convert()`` would round a value coming from the bucket
+        most distant from the target order of magnitude.
+        """
+        policy = exact_policy(exact)
+        if policy is not None:
+            return exact_round(value, policy)
+        decimals = self.mag_sys.decimals
+        if decimals is None:
+            pairs = [self.mag_sys.conversion(prefix, to_order) for prefix in self.buckets]
+            decimals = max([6] + [pair[1] for pair in pairs if pair is not None])
+        return round(float(value), decimals)
+
+    def total(self, to_order: Optional[str] = None, exact: Union[None, bool, str] = None) -> Number:
+        """Return the sum of the values.
+
+        Args:
+            to_order (Optional[str], optional): prefix of the result's order of magnitude. Defaults to the system's default.
+            exact (Union[None, bool, str], optional): exact policy of the result, see ``MagnitudeSystem.convert()``. Defaults to a float result.
+
+        Returns:
+            Number: the sum, ``0`` when no value was added.
+        """
+        total = sum((bucket.total() * self._scale(prefix, to_order) for prefix, bucket in self.buckets.items()), Fraction(0))
+        return self._result(total, to_order, exact)
+
+    def mean(self, to_order: Optional[str] = None, exact: Union[None, bool, str] = None) -> Optional[Number]:
+        """Return the mean of the values.
+
+        Args:
+            to_order (Optional[str], optional): prefix of the result's order of magnitude. Defaults to the system's default.
+            exact (Union[None, bool, str], optional): exact policy of the result, see ``MagnitudeSystem.convert()``. Defaults to a float result.
+
+        Returns:
+            Optional[Number]: the mean, ``None`` when no value was added.
+        """
+        count = self.count
+        if not count:
+            return None
+        total = sum((bucket.total() * self._scale(prefix, to_order) for prefix, bucket in self.buckets.items()), Fraction(0))
+        return self._result(total / count, to_order, exact)
+
+    def _extreme(self, attr: str, pick, to_order: Optional[str], exact: Union[None, bool, str]) -> Optional[Number]:
+        candidates = [Fraction(getattr(bucket, attr)) * self._scale(prefix, to_order)
+                      for prefix, bucket in self.buckets.items() if bucket.count]
+        return self._result(pick(candidates), to_order, exact) if candidates else None
+
+    def min(self, to_order: Optional[str] = None, exact: Union[None, bool, str] = None) -> Optional[Number]:
+        """Return the smallest value. See ``total()`` for the parameters.
+
+        Returns:
+            Optional[Number]: the smallest value, ``None`` when no value was added.
+        """
+        return self._extreme("minimum", min, to_order, exact)
+
+    def max(self, to_order: Optional[str] = None, exact: Union[None, bool, str] = None) -> Optional[Number]:
+        """Return the largest value. See ``total()`` for the parameters.
+
+        Returns:
+            Optional[Number]: the largest value, ``None`` when no value was added.
+        """
+        return self._extreme("maximum", max, to_order, exact)
+
+    def values(self, to_order: Optional[str] = None) -> List[float]:
+        """Return all the values, converted to one order of magnitude, in no particular order.
+
+        Args:
+            to_order (Optional[str], optional): prefix of the order of magnitude. Defaults to the system's default.
+
+        Raises:
+            ValueError: raised if the accumulator does not keep values.
+
+        Returns:
+            List[float]: the values.
+        """
+        return self._values(to_order)
+
+    def _values(self, to_order: Optional[str]) -> List[float]:
+        if not self.keep_values:
+            raise ValueError("The accumulator does not keep values, create it with keep_values=True")
+        result = []
+        for prefix, bucket in self.buckets.items():
+            scale = float(self._scale(prefix, to_order))
+            result.extend(value * scale for value in bucket.values)
+        return result
+
+    def percentile(self, q: float, to_order: Optional[str] = None) -> Optional[float]:
+        """Return a percentile of the values, interpolating linearly between the closest ranks.
+
+        Args:
+            q (float): percentile, between 0 and 100.
+            to_order (Optional[str], optional): prefix of the result's order of magnitude. Defaults to the system's default.
+
+        Raises:
+            ValueError: raised if the accumulator does not keep values, or if ``q`` is out of range.
+
+        Returns:
+            Optional[float]: the percentile, ``None`` when no value was added.
+        """
+        if not 0 <= q <= 100:
+            raise ValueError(f"Percentile must be between 0 and 100, got {q}")
+        values = sorted(self._values(to_order))
+        if not values:
+            return None
+        rank = (len(values) - 1) * q / 100
+        low = math.floor(rank)
+        high = min(low + 1, len(values) - 1)
+        return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class UnitAccumulator(MagnitudeAccumulator):
+    """Accumulate values in mixed prefixed units of a ``MagnitudeUnit``.
+
+    Works like ``MagnitudeAccumulator``, with prefixed units (like "KiB") in place of prefixes,
+    and it can also accumulate quantities written as text (like "1.5 GiB").
+    """
+
+    def __init__(self, unit: MagnitudeUnit, keep_values: bool = False) -> None:
+        """Create an object.
+
+        Args:
+            unit (MagnitudeUnit): unit of the values.
+            keep_values (bool, optional): keep every value, which is needed for ``percentile()``. Defaults to False.
+        """
+        super().__init__(unit.mag_sys, keep_values)
+        self.unit = unit
+        self._unit_buckets = {}
+
+    def _unit_bucket(self, unit: Optional[str]) -> _Bucket:
+        try:
+            return self._unit_buckets[unit]
+        except KeyError:
+            bucket = self._unit_buckets[unit] = self._bucket(self.unit.prefix_of(unit))
+            return bucket
+
+    def add(self, value: Number, prefix: Optional[str] = None) -> None:
+        """Add one value.
+
+        Args:
+            value (Number): value to be added.
+            prefix (Optional[str], optional): prefixed unit of the value. Defaults to the unit's base_unit.
+
+        Raises:
+            MagnitudeUnit.UnknownUnit: raised if the unit is not recognized.
+        """
+        self._unit_bucket(prefix).add(value)
+
+    def add_text(self, text: str) -> None:
+        """Add one quantity written as text.
+
+        Args:
+            text (str): quantity, see ``MagnitudeUnit.parse()``.
+
+        Raises:
+            MagnitudeUnit.InvalidQuantity: raised if the text is not a valid quantity in the unit.
+        """
+        value, prefix = self.unit.split(text)
+        self._bucket(prefix).add(value)
+
+    def update(self, items: Iterable[Union[str, Tuple[Number, Optional[str]]]]) -> None:
+        """Add many values.
+
+        Args:
+            items (Iterable[Union[str, Tuple[Number, Optional[str]]]]): quantities written as text, or pairs of value and prefixed unit.
+        """
+        for item in items:
+            if isinstance(item, str):
+                self.add_text(item)
+            else:
+                self._unit_bucket(item[1]).add(item[0])
+
+    def merge(self, other: MagnitudeAccumulator) -> "UnitAccumulator":
+        super().merge(other)
+        self._unit_buckets.clear()
+        return self
+
+    def total(self, to_order: Optional[str] = None, exact: Union[None, bool, str] = None) -> Number:
+        return super().total(self.unit.prefix_of(to_order), exact)
+
+    def mean(self, to_order: Optional[str] = None, exact: Union[None, bool, str] = None) -> Optional[Number]:
+        return super().mean(self.unit.prefix_of(to_order), exact)
+
+    def min(self, to_order: Optional[str] = None, exact: Union[None, bool, str] = None) -> Optional[Number]:
+        return super().min(self.unit.prefix_of(to_order), exact)
+
+    def max(self, to_order: Optional[str] = None, exact: Union[None, bool, str] = None) -> Optional[Number]:
+        return super().max(self.unit.prefix_of(to_order), exact)
+
+    def values(self, to_order: Optional[str] = None) -> List[float]:
+        return super().values(self.unit.prefix_of(to_order))
+
+    def percentile(self, q: float, to_order: Optional[str] = None) -> Optional[float]:
+        return super().percentile(q, self.unit.prefix_of(to_order))
+
+# code: language=python tabSize=4
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Conversion of quantities read from asyncio streams, like ``asyncio.StreamReader`` or any async iterator of lines.
+
+Lines are read by a background task into a bounded queue, so a slow consumer stops the reading
+(and, for sockets, the sender) instead of letting lines pile up in memory. Lines are converted in
+micro-batches made of whatever is already queued, so a burst is converted in a few batches while a
+quiet feed is converted line by line, without waiting. Large batches can be converted in an executor,
+keeping the event loop responsive.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, List, NamedTuple, Optional, Union
+
+from .base import MagnitudeUnit
+from .types import Number
+
+
+ON_ERROR = ("fail", "skip", "keep")
+
+_END = object()
+
+
+class Record(NamedTuple):
+    """One converted line."""
+    line: str
+    value: Optional[Number]
+
+
+def convert_batch(unit: MagnitudeUnit, to_unit: Optional[str], column: Optional[int], delimiter: str,
+                  on_error: str, lines: List[str]) -> List[Record]:
+    """Convert a batch of lines. Module-level, so that it can be sent to a process pool.
+
+    Args:
+        unit (MagnitudeUnit): unit of the quantities.
+        to_unit (Optional[str]): targeted unit.
+        column (Optional[int]): 0-based column holding the quantity, or ``None`` for the whole line.
+        delimiter (str): column delimiter.
+        on_error (str): one of ``ON_ERROR``, see ``convert_batches()``.
+        lines (List[str]): lines, without their line terminators.
+
+    Raises:
+        MagnitudeUnit.InvalidQuantity: raised if a line holds no quantity and ``on_error`` is "fail".
+
+    Returns:
+        List[Record]: the converted lines.
+    """
+    records = []
+    for line in lines:
+        if column is None:
+            field = line
+        else:
+            fields = line.split(delimiter)
+            field = fields[column] if column < len(fields) else ""
+        try:
+            records.append(Record(line, unit.parse(field, to_unit)))
+        except MagnitudeUnit.InvalidQuantity:
+            if on_error == "fail":
+                raise
+            if on_error == "keep":
+                records.append(Record(line, None))
+    return records
+
+
+async def _read(lines: AsyncIterable[Union[str, bytes]], queue: asyncio.Queue, encoding: str) -> None:
+    try:
+        async for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode(encoding)
+            await queue.put(line.rstrip("\r\n"))
+    except Exception as e:  # pylint: disable=broad-except
+        await queue.put(e)
+    else:
+        await queue.put(_END)
+
+
+async def _next_batch(queue: asyncio.Queue, batch_size: int) -> Optional[List[str]]:
+    """Wait for one line, then take the lines already queued, up to ``batch_size``.
+
+    The end of the stream, or the exception that ended it, is the last item of the queue. It is put
+    back when it follows lines, so that those lines are converted first.
+    """
+    batch = []
+    item = await queue.get()
+    while item is not _END and not isinstance(item, Exception):
+        batch.append(item)
+        if len(batch) >= batch_size or queue.empty():
+            return batch
+        item = queue.get_nowait()
+    if batch:
+        queue.put_nowait(item)
+        return batch
+    if item is _END:
+        return None
+    raise item
+
+
+async def _batches(lines: AsyncIterable[Union[str, bytes]], batch_size: int, max_pending: int,
+                   encoding: str) -> AsyncIterator[List[str]]:
+    queue = asyncio.Queue(maxsize=max(max_pending, 1))
+    reader = asyncio.ensure_future(_read(lines, queue, encoding))
+    try:
+        batch = await _next_batch(queue, batch_size)
+        while batch is not None:
+            yield batch
+            batch = await _next_batch(queue, batch_size)
+    finally:
+        reader.cancel()
+
+
+async def _convert(convert: Callable[[List[str]], List[Record]], batch: List[str],
+                   executor: Optional[Executor], offload_size: int) -> List[Record]:
+    if executor is None or len(batch) < offload_size:
+        return convert(batch)
+    return await asyncio.get_running_loop().run_in_executor(executor, convert, batch)
+
+
+async def convert_batches(unit: MagnitudeUnit, lines: AsyncIterable[Union[str, bytes]],
+                          to_unit: Optional[str] = None,
+                          column: Optional[int] = None, delimiter: str = "\t",
+                          on_error: str = "fail",
+                          batch_size: int = 256, max_pending: int = 4096,
+                          executor: Optional[Executor] = None, offload_size: int = 1024,
+                          encoding: str = "utf-8") -> AsyncIterator[List[Record]]:
+    """Convert the quantities of a stream of lines, in micro-batches.
+
+    Args:
+        unit (MagnitudeUnit): unit of the quantities.
+        lines (AsyncIterable[Union[str, bytes]]): ``asyncio.StreamReader`` or async iterator of lines, with or without their line terminators.
+        to_unit (Optional[str], optional): targeted unit. Defaults to the base unit.
+        column (Optional[int], optional): 0-based column holding the quantity. Defaults to the whole line.
+        delimiter (str, optional): column delimiter. Defaults to tab.
+        on_error (str, optional): what to do with lines holding no quantity: ``"fail"`` raises, ``"skip"`` drops them, ``"keep"`` yields them with a ``None`` value. Defaults to "fail".
+        batch_size (int, optional): maximum number of lines per batch. Defaults to 256.
+        max_pending (int, optional): maximum number of lines read ahead of the consumer. Defaults to 4096.
+        executor (Optional[Executor], optional): thread or process pool converting large batches. Defaults to None, converting every batch in the event loop.
+        offload_size (int, optional): minimum number of lines of the batches converted in ``executor``. Defaults to 1024.
+        encoding (str, optional): encoding of bytes lines. Defaults to "utf-8".
+
+    Raises:
+        ValueError: raised if ``on_error`` is not valid.
+        MagnitudeUnit.UnknownUnit: raised if ``to_unit`` is not known.
+        MagnitudeUnit.InvalidQuantity: raised if a line holds no quantity and ``on_error`` is "fail".
+
+    Returns:
+        AsyncIterator[List[Record]]: the converted lines, batch by batch, in their original order.
+    """
+    if on_error not in ON_ERROR:
+        raise ValueError(f"Invalid on_error '{on_error}', expected one of {ON_ERROR}")
+    unit.transform(0, to_unit=to_unit)
+    convert = functools.partial(convert_batch, unit, to_unit, column, delimiter, on_error)
+    batches = _batches(lines, batch_size, max_pending, encoding)
+    try:
+        async for batch in batches:
+            records = await _convert(convert, batch, executor, offload_size)
+            if records:
+                yield records
+    finally:
+        await batches.aclose()
+
+
+async def convert_lines(unit: MagnitudeUnit, lines: AsyncIterable[Union[str, bytes]], to_unit: Optional[str] = None,
+                        **kwargs: Any) -> AsyncIterator[Record]:
+    """Convert the quantities of a stream of lines, one record per line. See ``convert_batches()`` for the parameters.
+
+    Returns:
+        AsyncIterator[Record]: the converted lines, in their original order.
+    """
+    async for records in convert_batches(unit, lines, to_unit, **kwargs):
+        for record in records:
+            yield record
+
+# code: language=python tabSize=4
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Conversion of many values in one pass."""
+
+import array
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Sequence, Union
+
+from ._numpy import convert_array, convert_array_grouped, is_array, load_numpy
+from .types import Number
+
+
+def convert_many(mag_sys: Any, values: Iterable[Number],
+                 from_orders: Union[None, str, Iterable[str]], to_order: Optional[str],
+                 out: Any, prefix_of: Callable[[Optional[str]], Optional[str]]) -> Any:
+    """Batch conversion shared by ``MagnitudeSystem.convert_many()`` and ``MagnitudeUnit.transform_many()``.
+
+    Values sharing the same origin are converted as a group, ``prefix_of`` being called once per group.
+    See ``MagnitudeSystem.convert_many()`` for the parameters and the result.
+    """
+    single = from_orders is None or isinstance(from_orders, str)
+
+    if is_array(values) or is_array(out):
+        values = load_numpy().asarray(values)
+        if single:
+            return convert_array(mag_sys.conversion(prefix_of(from_orders), to_order), values, out)
+        return convert_array_grouped(mag_sys, values, from_orders, to_order, out, prefix_of)
+
+    if single:
+        results = map(mag_sys.get_converter(prefix_of(from_orders), to_order), values)
+    else:
+        converters = {}
+
+        def convert_one(value, order):
+            try:
+                converter = converters[order]
+            except KeyError:
+                converter = converters[order] = mag_sys.get_converter(prefix_of(order), to_order)
+            return converter(value)
+
+        results = map(convert_one, values, from_orders)
+
+    return collect(results, values, out)
+
+
+def collect(results: Iterable[Number], values: Iterable[Number], out: Any) -> Any:
+    """Store converted values in ``out``, or in a new container matching the type of the original ``values``.
+
+    Returns:
+        Any: ``out`` if specified, otherwise an ``array.array("d")`` for arrays and a list for other iterables.
+    """
+    if out is not None:
+        for index, result in enumerate(results):
+            out[index] = result
+        return out
+    if isinstance(values, array.array):
+        return array.array("d", results)
+    return list(results)
+
+
+class Histogram(NamedTuple):
+    """Number of values, and optionally their sum, per order of magnitude."""
+    counts: Dict[str, int]
+    sums: Optional[Dict[str, Number]]
+
+
+def histogram(indexes: Any, values: Iterable[Number], keys: Sequence[str], sums: bool) -> Histogram:
+    """Count values, and optionally sum them, per bucket.
+
+    Args:
+        indexes (Any): NumPy array or sequence with the bucket index of each value.
+        values (Iterable[Number]): the values.
+        keys (Sequence[str]): key of each bucket.
+        sums (bool): also sum the values.
+
+    Returns:
+        Histogram: counts, and sums if requested, for every key, in the order of ``keys``.
+    """
+    if is_array(indexes):
+        numpy = load_numpy()
+        counts = numpy.bincount(indexes.ravel(), minlength=len(keys)).tolist()
+        totals = numpy.bincount(indexes.ravel(), weights=numpy.ravel(values), minlength=len(keys)).tolist() if sums else None
+    else:
+        counts = [0] * len(keys)
+        totals = [0] * len(keys) if sums else None
+        for index, value in zip(indexes, values):
+            counts[index] += 1
+            if totals is not None:
+                totals[index] += value
+    return Histogram(dict(zip(keys, counts)), None if totals is None else dict(zip(keys, totals)))
+
+# code: language=python tabSize=4
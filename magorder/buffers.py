@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Conversion of raw binary columns, in place or into another buffer, without materializing them.
+
+Any object supporting the buffer protocol can be converted: ``bytearray``, ``memoryview``, ``array.array``,
+``mmap.mmap`` or NumPy arrays. Items are read in the machine's native byte order, with the formats of
+the ``array`` module. Buffers are walked in chunks of a fixed number of items, so the memory used on top
+of the buffers themselves is bounded by the chunk size.
+
+Floating-point formats are converted like ``MagnitudeSystem.convert()``. Integer formats are converted
+exactly, with the ``floor`` policy by default, see ``magorder.exact``.
+"""
+
+import array
+import mmap
+import os
+from typing import Any, Callable, Optional, Union
+
+from ._numpy import convert_array, load_numpy
+from .exact import exact_policy
+
+
+FLOAT_FORMATS = "fd"
+INT_FORMATS = "bBhHiIlLqQ"
+CHUNK_SIZE = 1 << 16
+
+
+def _items(buffer: Any, typecode: Optional[str], writable: bool = False) -> memoryview:
+    view = memoryview(buffer)
+    if typecode is None:
+        typecode = view.format
+    if typecode not in FLOAT_FORMATS + INT_FORMATS:
+        raise ValueError(f"Unsupported item format '{typecode}', expected one of '{FLOAT_FORMATS + INT_FORMATS}'")
+    if writable and view.readonly:
+        raise TypeError("The output buffer is read-only")
+    view = view.cast("B")
+    if len(view) % array.array(typecode).itemsize:
+        raise ValueError(f"Buffer size {len(view)} is not a multiple of the size of items of format '{typecode}'")
+    return view.cast(typecode)
+
+
+def _chunk_converter(mag_sys: Any, typecode: str,
+                     from_order: Optional[str], to_order: Optional[str],
+                     exact: Union[None, bool, str]) -> Callable[[memoryview, memoryview], None]:
+    numpy = load_numpy()
+    if typecode in FLOAT_FORMATS:
+        if numpy is not None:
+            pair = mag_sys.conversion(from_order, to_order)
+
+            def convert_float_array(source, target):
+                convert_array(pair, numpy.frombuffer(source, typecode), numpy.frombuffer(target, typecode))
+            return convert_float_array
+        converter = mag_sys.get_converter(from_order, to_order, exact=False)
+    else:
+        policy = exact_policy("floor" if exact is None else exact)
+        if policy not in ("floor", "ceil"):
+            raise ValueError(f"Integer buffers can only be converted with the 'floor' or 'ceil' policies, not '{exact}'")
+        entry = mag_sys.exact_conversion(from_order, to_order)
+        # NumPy cannot operate on factors beyond the range of the items, which the pure-Python path handles
+        if numpy is not None and (entry is None or max(entry[0], entry[1]) <= numpy.iinfo(numpy.dtype(typecode)).max):
+
+            def convert_int_array(source, target):
+                source, target = numpy.frombuffer(source, typecode), numpy.frombuffer(target, typecode)
+                if entry is None:
+                    numpy.copyto(target, source)
+                    return
+                multiplier, divisor, _ = entry
+                if divisor == 1:
+                    numpy.multiply(source, multiplier, out=target)
+                    return
+                if multiplier != 1:
+                    source = numpy.multiply(source, multiplier)
+                remainder = numpy.remainder(source, divisor) if policy == "ceil" else None
+                numpy.floor_divide(source, divisor, out=target)
+                if remainder is not None:
+                    target += remainder != 0
+            return convert_int_array
+        converter = mag_sys.get_converter(from_order, to_order, exact=policy)
+
+    def convert_items(source, target):
+        target[:] = array.array(typecode, map(converter, source))
+    return convert_items
+
+
+def convert_buffer(mag_sys: Any, buffer: Any,
+                   from_order: Optional[str] = None,
+                   to_order: Optional[str] = None,
+                   out: Any = None,
+                   typecode: Optional[str] = None,
+                   exact: Union[None, bool, str] = None,
+                   chunk_size: int = CHUNK_SIZE) -> Any:
+    """Convert every item of a buffer between two magnitude orders, chunk by chunk.
+
+    Args:
+        mag_sys (MagnitudeSystem): the magnitude system of the values.
+        buffer (Any): object supporting the buffer protocol, holding the values.
+        from_order (Optional[str], optional): prefix for the values' original order of magnitude. Defaults to the prefix matching the ``default_order``.
+        to_order (Optional[str], optional): prefix for the targeted order of magnitude. Defaults to the prefix matching the ``default_order``.
+        out (Any, optional): writable buffer of the same size receiving the results. Defaults to ``buffer`` itself, converted in place.
+        typecode (Optional[str], optional): format of the items, as in the ``array`` module. Defaults to the format of ``buffer``, which is ``"B"`` for ``bytes``, ``bytearray`` and ``mmap``.
+        exact (Union[None, bool, str], optional): rounding policy for integer formats, ``"floor"`` or ``"ceil"``. Defaults to ``"floor"``.
+        chunk_size (int, optional): number of items converted at once. Defaults to ``CHUNK_SIZE``.
+
+    Raises:
+        MagnitudeSystem.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+        ValueError: raised if the format, the policy or the size of the buffers is not valid.
+        TypeError: raised if the output buffer is read-only.
+        OverflowError: raised if a converted integer does not fit in its format (NumPy wraps around instead).
+
+    Returns:
+        Any: ``out``, or ``buffer`` if ``out`` is not specified.
+    """
+    if out is None:
+        out = buffer
+    source = _items(buffer, typecode)
+    typecode = source.format
+    target = _items(out, typecode, writable=True)
+    if len(source) != len(target):
+        raise ValueError(f"The output buffer has {len(target)} items, expected {len(source)}")
+    convert_chunk = _chunk_converter(mag_sys, typecode, from_order, to_order, exact)
+    for start in range(0, len(source), chunk_size):
+        convert_chunk(source[start:start + chunk_size], target[start:start + chunk_size])
+    return out
+
+
+def convert_file(mag_sys: Any, path: str, typecode: str,
+                 from_order: Optional[str] = None,
+                 to_order: Optional[str] = None,
+                 out_path: Optional[str] = None,
+                 exact: Union[None, bool, str] = None,
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    """Convert a binary file of values between two magnitude orders through memory mapping.
+
+    The file is never read as a whole: pages are mapped and written back by the operating system as
+    the chunks are converted, so resident memory stays bounded regardless of the file size.
+
+    Args:
+        mag_sys (MagnitudeSystem): the magnitude system of the values.
+        path (str): file holding the values.
+        typecode (str): format of the items, as in the ``array`` module.
+        from_order (Optional[str], optional): prefix for the values' original order of magnitude. Defaults to the prefix matching the ``default_order``.
+        to_order (Optional[str], optional): prefix for the targeted order of magnitude. Defaults to the prefix matching the ``default_order``.
+        out_path (Optional[str], optional): file receiving the results, created or truncated. Defaults to ``path`` itself, converted in place, as when ``out_path`` is the same file as ``path``.
+        exact (Union[None, bool, str], optional): rounding policy for integer formats, see ``convert_buffer()``.
+        chunk_size (int, optional): number of items converted at once. Defaults to ``CHUNK_SIZE``.
+
+    Raises:
+        MagnitudeSystem.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+        ValueError: raised if the format, the policy or the size of the file is not valid.
+
+    Returns:
+        int: the number of values converted.
+    """
+    if out_path is not None and os.path.exists(out_path) and os.path.samefile(path, out_path):
+        out_path = None
+    size = os.path.getsize(path)
+    itemsize = array.array(typecode).itemsize
+    if size % itemsize:
+        raise ValueError(f"File size {size} is not a multiple of the size of items of format '{typecode}'")
+    if out_path is not None:
+        with open(out_path, "wb") as out_file:
+            out_file.truncate(size)
+    if not size:
+        return 0
+
+    with open(path, "rb" if out_path else "r+b") as in_file:
+        source = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ if out_path else mmap.ACCESS_WRITE)
+        try:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                source.madvise(mmap.MADV_SEQUENTIAL)
+            if out_path is None:
+                convert_buffer(mag_sys, source, from_order, to_order, typecode=typecode, exact=exact, chunk_size=chunk_size)
+                source.flush()
+            else:
+                with open(out_path, "r+b") as out_file:
+                    target = mmap.mmap(out_file.fileno(), 0, access=mmap.ACCESS_WRITE)
+                    try:
+                        convert_buffer(mag_sys, source, from_order, to_order, target, typecode, exact, chunk_size)
+                        target.flush()
+                    finally:
+                        target.close()
+        finally:
+            source.close()
+    return size // itemsize
+
+# code: language=python tabSize=4
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class SystemCache:
+    """Bounded cache handing out shared objects, evicting the least recently used ones."""
+
+    def __init__(self, maxsize: Optional[int] = 256) -> None:
+        """Create an object.
+
+        Args:
+            maxsize (Optional[int], optional): maximum number of cached objects, or ``None`` for an unbounded cache. Defaults to 256.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the object cached for a key, creating it if needed.
+
+        Args:
+            key (Hashable): key identifying the object.
+            factory (Callable[[], Any]): function creating the object when it is not cached.
+
+        Returns:
+            Any: the cached object.
+        """
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            return self._miss(key, factory)
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            pass
+        return entry
+
+    def _miss(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        entry = factory()
+        with self._lock:
+            entry = self._entries.setdefault(key, entry)
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Remove all the cached objects."""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+systems = SystemCache()
+
+# code: language=python tabSize=4
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Custom unit families declared in JSON or TOML files, compiled once and cached on disk.
+
+A spec file declares families of units, each one with the parameters of ``MagnitudeSystem``:
+
+.. code-block:: json
+
+    {"families": {"packets": {"unit": "pkt", "orders": [{"prefix": "", "power": 0}, {"prefix": "k", "power": 3}]}}}
+
+Compiling a spec validates every family, like the ``MagnitudeSystem`` constructor does, and keeps the
+orders sorted and filtered by their bounds, with their exact factors. The compiled form is written to
+a cache file next to the spec, tagged with a format version, the Python bytecode magic number and the
+hash of the spec's content. Later loads read the cache file at once, skipping the parsing and the
+validation, and build the systems with ``MagnitudeSystem.from_orders()``. The cache file is rebuilt
+whenever the spec changes, or when it was written by another Python version, whose ``marshal`` format
+may differ.
+
+TOML spec files require Python 3.11 or newer, or the ``tomli`` package.
+"""
+
+import contextlib
+import hashlib
+import importlib
+import importlib.util
+import json
+import marshal
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .base import MagnitudeOrder, MagnitudeSystem, MagnitudeUnit
+from .cache import systems
+
+
+FORMAT_VERSION = 2
+CACHE_SUFFIX = ".magc"
+
+_MAGIC = b"MAGORDER"
+_HEADER = struct.Struct(f">{len(_MAGIC)}sH{len(importlib.util.MAGIC_NUMBER)}s32s")
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_CACHE_MODE = 0o666 & ~_UMASK  # the mode open() would give the cache file
+_FAMILY_KEYS = frozenset(("unit", "orders", "lower", "upper", "base", "default", "decimals", "exact"))
+
+CompiledFamily = Tuple[str, Tuple[Tuple[str, Optional[int], Tuple[str, ...], Optional[str]], ...], int, str, Optional[int], Optional[str]]
+
+
+def _load_toml(data: bytes) -> Dict[str, Any]:
+    for name in ("tomllib", "tomli"):
+        try:
+            toml = importlib.import_module(name)
+        except ImportError:
+            continue
+        return toml.loads(data.decode("utf-8"))
+    raise UnitCatalog.InvalidSpec("TOML spec files require Python 3.11 or newer, or the 'tomli' package")
+
+
+def parse_spec(data: bytes, path: str = "") -> Dict[str, Any]:
+    """Parse the content of a spec file.
+
+    Args:
+        data (bytes): content of the spec file.
+        path (str, optional): name of the spec file. TOML is parsed if it ends with ".toml", JSON otherwise. Defaults to "".
+
+    Raises:
+        UnitCatalog.InvalidSpec: raised if the content cannot be parsed.
+
+    Returns:
+        Dict[str, Any]: the spec.
+    """
+    try:
+        if path.endswith(".toml"):
+            return _load_toml(data)
+        return json.loads(data.decode("utf-8"))
+    except ValueError as e:
+        raise UnitCatalog.InvalidSpec(f"Cannot parse spec file '{path}': {e}")
+
+
+def _compile_family(name: str, family: Any) -> CompiledFamily:
+    if not isinstance(family, dict):
+        raise UnitCatalog.InvalidSpec(f"Family '{name}' must be a table, not {type(family).__name__}")
+    unknown = sorted(set(family) - _FAMILY_KEYS)
+    if unknown:
+        raise UnitCatalog.InvalidSpec(f"Unknown keys {unknown} in family '{name}'")
+    unit, orders = family.get("unit"), family.get("orders")
+    if not isinstance(unit, str) or not isinstance(orders, list) or not all(isinstance(kw, dict) for kw in orders):
+        raise UnitCatalog.InvalidSpec(f"Family '{name}' needs a 'unit' string and a list of 'orders' tables")
+    if not isinstance(family.get("base", 10), int):
+        raise UnitCatalog.InvalidSpec(f"The base of family '{name}' must be an integer")
+    try:
+        mag_sys = MagnitudeSystem(orders, **{k: v for k, v in family.items() if k not in ("unit", "orders")})
+    except (TypeError, ValueError) as e:
+        raise UnitCatalog.InvalidSpec(f"Invalid family '{name}': {e}")
+    mags = tuple((m.prefix, m.power, m.aliases, None if m.factor is None else str(m.factor)) for m in mag_sys.magnitudes)
+    return (unit, mags, mag_sys.base, mag_sys.default, mag_sys.decimals, mag_sys.exact)
+
+
+class UnitCatalog(Mapping):
+    """Read-only mapping of family names to the units declared in a spec."""
+
+    class InvalidSpec(ValueError):
+        """Exception for when a spec cannot be parsed or declares invalid families."""
+
+    def __init__(self, families: Dict[str, CompiledFamily], digest: bytes = b"") -> None:
+        """Create an object from compiled families. Use ``compile()`` or ``load()`` instead.
+
+        Args:
+            families (Dict[str, CompiledFamily]): compiled families by name.
+            digest (bytes, optional): hash of the spec the families were compiled from. Defaults to b"".
+        """
+        self.families = families
+        self.digest = digest
+        self._units = {}
+
+    @classmethod
+    def compile(cls, spec: Dict[str, Any], digest: bytes = b"") -> "UnitCatalog":
+        """Validate and compile a spec.
+
+        Args:
+            spec (Dict[str, Any]): spec holding the ``families`` table.
+            digest (bytes, optional): hash of the spec content. Defaults to b"".
+
+        Raises:
+            cls.InvalidSpec: raised if the spec or any of its families is not valid.
+
+        Returns:
+            UnitCatalog: the catalog of the spec's families.
+        """
+        families = spec.get("families") if isinstance(spec, dict) else None
+        if not isinstance(families, dict):
+            raise cls.InvalidSpec("The spec needs a 'families' table")
+        return cls({name: _compile_family(name, family) for name, family in families.items()}, digest)
+
+    @classmethod
+    def load(cls, path: str, cache_path: Optional[str] = None, use_mmap: bool = False) -> "UnitCatalog":
+        """Load a spec file, through its cache file when it is up to date.
+
+        The cache file is rebuilt when it is missing, stale or corrupted. Failing to write it is not an
+        error: the spec is then compiled on every load.
+
+        Args:
+            path (str): JSON or TOML spec file, see ``parse_spec()``.
+            cache_path (Optional[str], optional): cache file. Defaults to ``path`` with the ``CACHE_SUFFIX`` appended.
+            use_mmap (bool, optional): map the cache file in memory instead of reading it. Defaults to False.
+
+        Raises:
+            cls.InvalidSpec: raised if the spec is not valid.
+            OSError: raised if the spec file cannot be read.
+
+        Returns:
+            UnitCatalog: the catalog of the spec's families.
+        """
+        with open(path, "rb") as spec_file:
+            data = spec_file.read()
+        digest = hashlib.sha256(data).digest()
+        if cache_path is None:
+            cache_path = path + CACHE_SUFFIX
+        families = _read_cache(cache_path, digest, use_mmap)
+        if families is not None:
+            return cls(families, digest)
+        catalog = cls.compile(parse_spec(data, path), digest)
+        _write_cache(cache_path, digest, catalog.families)
+        return catalog
+
+    def __getitem__(self, name: str) -> MagnitudeUnit:
+        try:
+            return self._units[name]
+        except KeyError:
+            pass
+        unit, mags, base, default, decimals, exact = self.families[name]
+        orders = tuple(MagnitudeOrder(prefix, power, aliases, factor) for prefix, power, aliases, factor in mags)
+        spec = (tuple((m.prefix, m.power, m.aliases, m.factor) for m in orders), None, None, base, default)
+        mag_sys = systems.get((MagnitudeSystem,) + spec + (decimals, exact),
+                              lambda: MagnitudeSystem.from_orders(orders, base=base, default=default, decimals=decimals, exact=exact))
+        return self._units.setdefault(name, MagnitudeUnit(unit, mag_sys))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.families)
+
+    def __len__(self) -> int:
+        return len(self.families)
+
+
+def _read_cache(cache_path: str, digest: bytes, use_mmap: bool) -> Optional[Dict[str, CompiledFamily]]:
+    try:
+        with open(cache_path, "rb") as cache_file:
+            if not use_mmap:
+                return _decode(cache_file.read(), digest)
+            with mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    return _decode(view, digest)
+                finally:
+                    view.release()
+    except (OSError, ValueError):
+        return None
+
+
+def _decode(data: Any, digest: bytes) -> Optional[Dict[str, CompiledFamily]]:
+    if len(data) < _HEADER.size or _HEADER.unpack_from(data) != (_MAGIC, FORMAT_VERSION, importlib.util.MAGIC_NUMBER, digest):
+        return None
+    try:
+        families = marshal.loads(data[_HEADER.size:])
+    except (EOFError, TypeError, ValueError):
+        return None
+    return families if isinstance(families, dict) else None
+
+
+def _write_cache(cache_path: str, digest: bytes, families: Dict[str, CompiledFamily]) -> None:
+    data = _HEADER.pack(_MAGIC, FORMAT_VERSION, importlib.util.MAGIC_NUMBER, digest) + marshal.dumps(families)
+    try:
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(cache_path), dir=os.path.dirname(cache_path) or ".")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        os.chmod(temp_path, _CACHE_MODE)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+
+# code: language=python tabSize=4
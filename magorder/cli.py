@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Command-line converter for quantities in text streams.
+
+Input is read line by line in chunks, each chunk is converted and written before the next one is
+read, so memory use does not depend on the size of the input. With ``--jobs``, chunks are converted
+by a pool of processes and written in the original order.
+"""
+
+import argparse
+import functools
+import sys
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from .base import MagnitudeUnit
+from .data import IECDataMagnitudeUnit, SIDataMagnitudeUnit
+from .parallel import chunked, map_chunks
+from .stdsi import StdSIMagnitudeUnit
+
+
+FAMILIES = {
+    "si": StdSIMagnitudeUnit,
+    "si-data": SIDataMagnitudeUnit,
+    "iec": IECDataMagnitudeUnit,
+}
+
+
+class Options(NamedTuple):
+    """Conversion options, shared with the worker processes."""
+    family: str
+    unit: str
+    to_unit: Optional[str]
+    humanize: bool
+    precision: int
+    column: Optional[int]
+    delimiter: str
+    legacy: bool
+    case: bool
+    on_error: str
+
+
+class LineConverter:
+    """Convert the quantities found in lines of text."""
+
+    def __init__(self, options: Options) -> None:
+        """Create an object.
+
+        Args:
+            options (Options): conversion options.
+        """
+        self.options = options
+        if options.family == "iec":
+            self.unit = IECDataMagnitudeUnit(options.unit, legacy=options.legacy, case=options.case)
+        else:
+            self.unit = FAMILIES[options.family](options.unit)
+        self.unit.prefix_of(options.to_unit)
+
+    def convert_field(self, field: str) -> str:
+        """Convert one quantity.
+
+        Args:
+            field (str): quantity to be converted. Example: "1.5 GiB".
+
+        Raises:
+            MagnitudeUnit.InvalidQuantity: raised if the field is not a quantity and ``on_error`` is "fail".
+
+        Returns:
+            str: the converted quantity.
+        """
+        try:
+            value = self.unit.parse(field, self.options.to_unit)
+        except MagnitudeUnit.InvalidQuantity:
+            if self.options.on_error == "keep":
+                return field
+            if self.options.on_error == "empty":
+                return ""
+            raise
+        if self.options.humanize:
+            return self.unit.humanize(value, self.options.precision)
+        return str(value)
+
+    def __call__(self, lines: Sequence[str]) -> List[str]:
+        """Convert a chunk of lines.
+
+        Args:
+            lines (Sequence[str]): lines, with or without their line terminators.
+
+        Returns:
+            List[str]: converted lines, each one terminated by a newline.
+        """
+        column, delimiter = self.options.column, self.options.delimiter
+        result = []
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if column is None:
+                result.append(self.convert_field(line) + "\n")
+                continue
+            fields = line.split(delimiter)
+            if column < len(fields):
+                fields[column] = self.convert_field(fields[column])
+            result.append(delimiter.join(fields) + "\n")
+        return result
+
+
+_converters = {}  # type: Dict[Options, LineConverter]
+
+
+def convert_chunk(options: Options, lines: Sequence[str]) -> List[str]:
+    """Convert a chunk of lines, reusing the converter built for the same options in this process.
+
+    Args:
+        options (Options): conversion options.
+        lines (Sequence[str]): lines to be converted.
+
+    Returns:
+        List[str]: converted lines.
+    """
+    try:
+        converter = _converters[options]
+    except KeyError:
+        converter = _converters[options] = LineConverter(options)
+    return converter(lines)
+
+
+def convert_chunks(options: Options, chunks: Iterable[List[str]], jobs: int = 1) -> Iterator[List[str]]:
+    """Convert chunks of lines, preserving their order.
+
+    Args:
+        options (Options): conversion options.
+        chunks (Iterable[List[str]]): chunks of lines.
+        jobs (int, optional): number of worker processes. Defaults to 1, converting in this process.
+
+    Returns:
+        Iterator[List[str]]: the converted chunks.
+    """
+    return map_chunks(functools.partial(convert_chunk, options), chunks, max(jobs, 1))
+
+
+def read_lines(paths: Sequence[str], buffer_size: int) -> Iterator[str]:
+    """Read lines from files, or from the standard input.
+
+    Args:
+        paths (Sequence[str]): file names. "-" stands for the standard input, as does an empty list.
+        buffer_size (int): size of the read buffer, in bytes.
+
+    Returns:
+        Iterator[str]: the lines.
+    """
+    for path in paths or ["-"]:
+        if path == "-":
+            yield from sys.stdin
+            continue
+        with open(path, encoding="utf-8", buffering=buffer_size) as file:
+            yield from file
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="magorder", description="Convert quantities like '1.5 GiB' in text files or streams.")
+    parser.add_argument("files", nargs="*", metavar="FILE", help="input files, '-' or none for the standard input")
+    parser.add_argument("-f", "--family", choices=sorted(FAMILIES), default="si", help="unit family (default: si)")
+    parser.add_argument("-u", "--unit", required=True, help="base unit, for example 'm' or 'B'")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("-t", "--to", dest="to_unit", help="prefixed unit to convert to (default: the base unit)")
+    target.add_argument("-H", "--humanize", action="store_true", help="render each quantity with its best prefix")
+    parser.add_argument("-p", "--precision", type=int, default=2, help="decimal places with --humanize (default: 2)")
+    parser.add_argument("-c", "--column", type=int, help="1-based column holding the quantity (default: the whole line)")
+    parser.add_argument("-d", "--delimiter", default="\t", help="column delimiter (default: tab)")
+    parser.add_argument("--legacy", action="store_true", help="accept K, M and G as IEC prefixes")
+    parser.add_argument("--no-case", dest="case", action="store_false", help="accept IEC prefixes in any case")
+    parser.add_argument("--on-error", choices=["fail", "keep", "empty"], default="fail", help="what to do with invalid quantities (default: fail)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument("--chunk-lines", type=int, default=10_000, help="lines converted per chunk (default: 10000)")
+    parser.add_argument("--buffer-size", type=int, default=1 << 20, help="read buffer size in bytes (default: 1 MiB)")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if (args.legacy or not args.case) and args.family != "iec":
+        parser.error("--legacy and --no-case require --family iec")
+    if args.column is not None and args.column < 1:
+        parser.error("--column must be 1 or greater")
+
+    options = Options(
+        family=args.family, unit=args.unit, to_unit=args.to_unit, humanize=args.humanize,
+        precision=args.precision, column=None if args.column is None else args.column - 1,
+        delimiter=args.delimiter, legacy=args.legacy, case=args.case, on_error=args.on_error,
+    )
+    try:
+        LineConverter(options)
+        chunks = chunked(read_lines(args.files, args.buffer_size), max(args.chunk_lines, 1))
+        for converted in convert_chunks(options, chunks, args.jobs):
+            sys.stdout.writelines(converted)
+    except (ValueError, OSError) as e:
+        print(f"magorder: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# code: language=python tabSize=4
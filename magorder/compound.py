@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Compound units, made of a numerator and a denominator unit, like "MiB/s" or "Gbps".
+
+Each side is resolved by a ``UnitRegistry``, so it may mix unit families, and base units of the
+numerator can be scaled into each other, like bits and bytes. The factors of both sides are combined
+exactly, as fractions, into one float per pair of compound units, computed once: converting a value
+is a single multiplication.
+"""
+
+import re
+from fractions import Fraction
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from ._numpy import is_array, load_numpy
+from .base import MagnitudeUnit
+from .batch import collect
+from .data import IECDataMagnitudeUnit, SIDataMagnitudeUnit
+from .duration import TimeMagnitudeUnit
+from .registry import Resolution, UnitRegistry
+from .system import _NUMBER_PATTERN
+from .types import Number
+
+
+class CompoundUnit:
+    """Units made of a numerator unit divided by a denominator unit."""
+
+    def __init__(self, numerators: Iterable[MagnitudeUnit], denominators: Iterable[MagnitudeUnit],
+                 base_scales: Optional[Dict[str, Number]] = None,
+                 aliases: Optional[Dict[str, str]] = None) -> None:
+        """Create an object.
+
+        Args:
+            numerators (Iterable[MagnitudeUnit]): units of the numerator. Example: ``[IECDataMagnitudeUnit("B")]``.
+            denominators (Iterable[MagnitudeUnit]): units of the denominator. Example: ``[TimeMagnitudeUnit()]``.
+            base_scales (Optional[Dict[str, Number]], optional): scale of base units of the numerator that can be converted into each other. Example: ``{"B": 8, "b": 1}``. Defaults to None.
+            aliases (Optional[Dict[str, str]], optional): suffixes standing for a base unit and a denominator. Example: ``{"bps": "b/s"}`` reads "Gbps" as "Gb/s". Defaults to None.
+        """
+        self.numerators = UnitRegistry(numerators)
+        self.denominators = UnitRegistry(denominators)
+        self.base_scales = {base_unit: Fraction(scale) for base_unit, scale in (base_scales or {}).items()}
+        self.aliases = dict(aliases or {})
+        self._resolutions = {}
+        self._factors = {}
+        self._pattern = re.compile(rf"\s*(?P<value>{_NUMBER_PATTERN})\s*(?P<unit>\S+)\s*")
+
+    def resolve(self, unit: str) -> Tuple[Resolution, Resolution]:
+        """Resolve a compound unit into its numerator and denominator.
+
+        Args:
+            unit (str): compound unit. Examples: "MiB/s", "Gbps".
+
+        Raises:
+            MagnitudeUnit.UnknownUnit: raised if the unit is not made of known units.
+
+        Returns:
+            Tuple[Resolution, Resolution]: the resolutions of the numerator and of the denominator.
+        """
+        try:
+            return self._resolutions[unit]
+        except KeyError:
+            pass
+        text = unit
+        for suffix, replacement in self.aliases.items():
+            if unit.endswith(suffix):
+                text = unit[:len(unit) - len(suffix)] + replacement
+                break
+        numerator, _, denominator = text.rpartition("/")
+        resolutions = (self.numerators.resolve(numerator), self.denominators.resolve(denominator))
+        if None in resolutions:
+            raise MagnitudeUnit.UnknownUnit(unit)
+        return self._resolutions.setdefault(unit, resolutions)
+
+    def _base_scale(self, resolution: Resolution, from_unit: str, to_unit: str) -> Fraction:
+        try:
+            return self.base_scales[resolution.unit.base_unit]
+        except KeyError:
+            raise UnitRegistry.IncompatibleUnits(from_unit, to_unit)
+
+    def exact_factor(self, from_unit: str, to_unit: str) -> Fraction:
+        """Return the exact factor converting values between two compound units.
+
+        Args:
+            from_unit (str): compound unit to convert from.
+            to_unit (str): compound unit to convert to.
+
+        Raises:
+            MagnitudeUnit.UnknownUnit: raised if any of the units is not known.
+            UnitRegistry.IncompatibleUnits: raised if the numerators have different base units with no scale, or the denominators different base units.
+
+        Returns:
+            Fraction: the factor.
+        """
+        (from_num, from_den), (to_num, to_den) = self.resolve(from_unit), self.resolve(to_unit)
+        if from_den.unit.base_unit != to_den.unit.base_unit:
+            raise UnitRegistry.IncompatibleUnits(from_unit, to_unit)
+        factor = (from_num.unit.mag_sys.exact_factor(from_num.prefix) / to_num.unit.mag_sys.exact_factor(to_num.prefix)
+                  * to_den.unit.mag_sys.exact_factor(to_den.prefix) / from_den.unit.mag_sys.exact_factor(from_den.prefix))
+        if from_num.unit.base_unit != to_num.unit.base_unit:
+            factor *= self._base_scale(from_num, from_unit, to_unit) / self._base_scale(to_num, from_unit, to_unit)
+        return factor
+
+    def factor(self, from_unit: str, to_unit: str) -> float:
+        """Return the factor converting values between two compound units, computed once per pair.
+
+        Args:
+            from_unit (str): compound unit to convert from.
+            to_unit (str): compound unit to convert to.
+
+        Raises:
+            MagnitudeUnit.UnknownUnit: raised if any of the units is not known.
+            UnitRegistry.IncompatibleUnits: raised if the units cannot be converted into each other.
+
+        Returns:
+            float: the exact factor, rounded once to a float.
+        """
+        try:
+            return self._factors[(from_unit, to_unit)]
+        except KeyError:
+            return self._factors.setdefault((from_unit, to_unit), float(self.exact_factor(from_unit, to_unit)))
+
+    def convert(self, value: Number, from_unit: str, to_unit: str) -> float:
+        """Convert a value between two compound units. The result is not rounded.
+
+        Args:
+            value (Number): value to be converted.
+            from_unit (str): compound unit to convert from. Example: "MiB/s".
+            to_unit (str): compound unit to convert to. Example: "Gbps".
+
+        Raises:
+            MagnitudeUnit.UnknownUnit: raised if any of the units is not known.
+            UnitRegistry.IncompatibleUnits: raised if the units cannot be converted into each other.
+
+        Returns:
+            float: value in the target unit.
+        """
+        return value * self.factor(from_unit, to_unit)
+
+    def get_converter(self, from_unit: str, to_unit: str) -> Callable[[Number], float]:
+        """Return a callable converting values between two compound units. See ``convert()``.
+
+        Args:
+            from_unit (str): compound unit to convert from.
+            to_unit (str): compound unit to convert to.
+
+        Raises:
+            MagnitudeUnit.UnknownUnit: raised if any of the units is not known.
+            UnitRegistry.IncompatibleUnits: raised if the units cannot be converted into each other.
+
+        Returns:
+            Callable[[Number], float]: function taking one value and returning it converted.
+        """
+        factor = self.factor(from_unit, to_unit)
+
+        def converter(value: Number) -> float:
+            return value * factor
+
+        return converter
+
+    def convert_many(self, values: Iterable[Number], from_unit: str, to_unit: str, out: Any = None) -> Any:
+        """Convert many values between two compound units, with one vectorized multiplication for NumPy arrays.
+
+        Args:
+            values (Iterable[Number]): NumPy array, ``array.array`` or any iterable of numbers.
+            from_unit (str): compound unit to convert from.
+            to_unit (str): compound unit to convert to.
+            out (Any, optional): preallocated container (NumPy array or mutable sequence) receiving the results. It may be ``values`` itself for in-place conversion of float arrays. Defaults to ``None``.
+
+        Raises:
+            MagnitudeUnit.UnknownUnit: raised if any of the units is not known.
+            UnitRegistry.IncompatibleUnits: raised if the units cannot be converted into each other.
+
+        Returns:
+            Any: ``out`` if specified, otherwise a new float64 NumPy array, an ``array.array("d")`` or a list, matching the type of ``values``.
+        """
+        factor = self.factor(from_unit, to_unit)
+        if is_array(values) or is_array(out):
+            numpy = load_numpy()
+            return numpy.multiply(numpy.asarray(values, dtype=numpy.float64), factor, out=out)
+        return collect((value * factor for value in values), values, out)
+
+    def parse(self, text: str, to_unit: str) -> float:
+        """Parse a quantity in a compound unit and convert it.
+
+        Args:
+            text (str): quantity made of a number and a compound unit, optionally separated by whitespace. Example: "1.5 MiB/s".
+            to_unit (str): compound unit to convert to.
+
+        Raises:
+            MagnitudeUnit.InvalidQuantity: raised if the text is not a quantity.
+            MagnitudeUnit.UnknownUnit: raised if any of the units is not known.
+            UnitRegistry.IncompatibleUnits: raised if the units cannot be converted into each other.
+
+        Returns:
+            float: value in the target unit.
+        """
+        match = self._pattern.fullmatch(text)
+        if match is None:
+            raise MagnitudeUnit.InvalidQuantity(text)
+        return float(match.group("value")) * self.factor(match.group("unit"), to_unit)
+
+
+class DataRateUnit(CompoundUnit):
+    """Data rates, in bits or bytes, with SI or IEC prefixes, per unit of time: "MiB/s", "kB/ms", "Gbps"."""
+
+    def __init__(self):
+        super().__init__(
+            [SIDataMagnitudeUnit("B"), IECDataMagnitudeUnit("B"), SIDataMagnitudeUnit("b"), IECDataMagnitudeUnit("b")],
+            [TimeMagnitudeUnit()],
+            base_scales={"B": 8, "b": 1},
+            aliases={"bps": "b/s", "Bps": "B/s"},
+        )
+
+# code: language=python tabSize=4
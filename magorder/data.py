@@ -4,7 +4,10 @@
 # GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from .base import MagnitudeSystem, MagnitudeUnit
+import functools
+
+from .base import MagnitudeOrder, MagnitudeSystem, MagnitudeUnit
+from .cache import systems
 
 
 class SIDataMagnitudeUnit(MagnitudeUnit):
@@ -20,9 +23,18 @@ class SIDataMagnitudeUnit(MagnitudeUnit):
         {"prefix": "Y", "power": 8},
     ]
 
-    def __init__(self, unit, lower=None, upper=None):
-        orders = MagnitudeSystem(self.si_order, lower=lower, upper=upper, base=1000)
+    si_orders = tuple(MagnitudeOrder(**kw) for kw in si_order)
+
+    def __init__(self, unit, lower=None, upper=None, exact=None):
+        orders = systems.get((type(self), lower, upper, exact), lambda: self._build_system(lower, upper, exact))
         super().__init__(unit, orders)
+        self._args = (unit, lower, upper, exact)
+
+    @classmethod
+    def _build_system(cls, lower, upper, exact):
+        if cls.si_order is SIDataMagnitudeUnit.si_order:
+            return MagnitudeSystem.from_orders(cls.si_orders, lower=lower, upper=upper, base=1000, exact=exact)
+        return MagnitudeSystem(cls.si_order, lower=lower, upper=upper, base=1000, exact=exact)
 
 
 class IECDataMagnitudeUnit(MagnitudeUnit):
@@ -38,26 +50,43 @@ class IECDataMagnitudeUnit(MagnitudeUnit):
         {"prefix": "Yi", "power": 8},
     ]
 
-    def __init__(self, unit: str, lower=None, upper=None, legacy=False, case=True):
-        def _no_case(order):
-            existing = set(order.get("aliases", [])).union({order["prefix"]})
-            aliases = {e.lower() for e in existing}
-            new_order = dict(order)
-            new_order["aliases"] = list(aliases)
-            return new_order
-
+    def __init__(self, unit: str, lower=None, upper=None, legacy=False, case=True, exact=None):
         self.case = case
-        orders = list(self.iec_order)
-        if legacy:
-            orders.extend([
-                {"prefix": "K", "power": 1},
-                {"prefix": "M", "power": 2},
-                {"prefix": "G", "power": 3},
-            ])
-        if not case:
-            orders = [_no_case(o) for o in orders]
-
-        orders = MagnitudeSystem(orders, lower=lower, upper=upper, base=1024)
+        orders = systems.get((type(self), lower, upper, legacy, case, exact),
+                             lambda: self._build_system(lower, upper, legacy, case, exact))
         super().__init__(unit, orders)
+        self._args = (unit, lower, upper, legacy, case, exact)
+
+    @classmethod
+    def _build_system(cls, lower, upper, legacy, case, exact):
+        if cls.iec_order is IECDataMagnitudeUnit.iec_order:
+            return MagnitudeSystem.from_orders(cls._orders(legacy, case), lower=lower, upper=upper, base=1024, exact=exact)
+        return MagnitudeSystem(_iec_specs(cls.iec_order, legacy, case), lower=lower, upper=upper, base=1024, exact=exact)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _orders(legacy, case):
+        specs = _iec_specs(IECDataMagnitudeUnit.iec_order, legacy, case)
+        return tuple(sorted((MagnitudeOrder(**kw) for kw in specs), key=lambda m: m.power))
+
+
+def _iec_specs(iec_order, legacy, case):
+    def _no_case(order):
+        existing = set(order.get("aliases", [])).union({order["prefix"]})
+        aliases = {e.lower() for e in existing}
+        new_order = dict(order)
+        new_order["aliases"] = sorted(aliases)
+        return new_order
+
+    orders = list(iec_order)
+    if legacy:
+        orders.extend([
+            {"prefix": "K", "power": 1},
+            {"prefix": "M", "power": 2},
+            {"prefix": "G", "power": 3},
+        ])
+    if not case:
+        orders = [_no_case(o) for o in orders]
+    return orders
 
 # code: language=python tabSize=4
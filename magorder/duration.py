@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from .base import MagnitudeOrder, MagnitudeSystem, MagnitudeUnit
+from .cache import systems
+
+
+class TimeMagnitudeUnit(MagnitudeUnit):
+    """Durations, from nanoseconds to weeks.
+
+    Subdivisions of the second are powers of 10, larger units have explicit factors. The units are
+    whole symbols, like "ms" or "h", so the base unit is empty and the default order is "s".
+    """
+
+    time_order = [
+        {"prefix": "ns", "power": -9},
+        {"prefix": "µs", "power": -6, "aliases": ["us"]},
+        {"prefix": "ms", "power": -3},
+        {"prefix": "s", "power": 0},
+        {"prefix": "min", "factor": 60},
+        {"prefix": "h", "factor": 3600},
+        {"prefix": "d", "factor": 86400},
+        {"prefix": "w", "factor": 604800},
+    ]
+
+    time_orders = tuple(MagnitudeOrder(**kw) for kw in time_order)
+
+    def __init__(self, lower=None, upper=None, exact=None):
+        orders = systems.get((type(self), lower, upper, exact), lambda: self._build_system(lower, upper, exact))
+        super().__init__("", orders)
+        self._args = (lower, upper, exact)
+
+    @classmethod
+    def _build_system(cls, lower, upper, exact):
+        if cls.time_order is TimeMagnitudeUnit.time_order:
+            return MagnitudeSystem.from_orders(cls.time_orders, lower=lower, upper=upper, default="s", exact=exact)
+        return MagnitudeSystem(cls.time_order, lower=lower, upper=upper, default="s", exact=exact)
+
+# code: language=python tabSize=4
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Exact conversions, keeping integers as integers and never using floating-point arithmetic."""
+
+import math
+from fractions import Fraction
+from typing import Callable, Optional, Tuple, Union
+
+from .types import Number
+
+
+def _identity(value: Number) -> Number:
+    return value
+
+
+POLICIES = ("fraction", "floor", "ceil")
+
+
+def exact_policy(exact: Union[None, bool, str]) -> Optional[str]:
+    """Normalize an exact policy.
+
+    Args:
+        exact (Union[None, bool, str]): ``None`` or ``False`` for floating-point conversions, ``True`` or one of ``POLICIES``.
+
+    Raises:
+        ValueError: raised if the policy is not valid.
+
+    Returns:
+        Optional[str]: one of ``POLICIES``, or ``None`` for floating-point conversions.
+    """
+    if exact is True:
+        return "fraction"
+    if not exact:
+        return None
+    if exact not in POLICIES:
+        raise ValueError(f"Invalid exact policy '{exact}', expected one of {POLICIES}")
+    return exact
+
+
+def exact_convert(value: Number, entry: Optional[Tuple[int, int, Optional[int]]], policy: str) -> Number:
+    """Convert a value without floating-point arithmetic.
+
+    Integers are multiplied (or shifted, for bases that are powers of 2) when going to a smaller
+    order of magnitude. Going to a larger one, the division is either kept as a ``Fraction`` or
+    rounded with ``floor`` or ``ceil``. Other numbers are converted to ``Fraction`` first. Entries
+    with both a multiplier and a divisor, from systems with explicit factors, multiply before dividing.
+    """
+    if entry is None:
+        return value
+    multiplier, divisor, shift = entry
+    if not isinstance(value, int):
+        return exact_round(Fraction(value) * multiplier / divisor, policy)
+    if divisor == 1:
+        return value * multiplier if shift is None else value << shift
+    if multiplier != 1:
+        value *= multiplier
+    if policy == "floor":
+        return value // divisor if shift is None else value >> shift
+    if policy == "ceil":
+        return -(-value // divisor) if shift is None else -(-value >> shift)
+    return exact_round(Fraction(value, divisor), policy)
+
+
+def exact_entry(ratio: Fraction) -> Optional[Tuple[int, int, Optional[int]]]:
+    """Return the entry converting values by an exact ratio, see ``MagnitudeSystem.exact_conversion()``.
+
+    Args:
+        ratio (Fraction): factor of the original order of magnitude divided by the factor of the targeted one.
+
+    Returns:
+        Optional[Tuple[int, int, Optional[int]]]: the multiplier, the divisor and the bit shift equivalent to the one that is not 1, if it is a power of 2, or ``None`` if the ratio is 1.
+    """
+    if ratio == 1:
+        return None
+    multiplier, divisor = ratio.numerator, ratio.denominator
+    single = multiplier * divisor if 1 in (multiplier, divisor) else 0
+    shift = single.bit_length() - 1 if single & (single - 1) == 0 and single else None
+    return (multiplier, divisor, shift)
+
+
+def exact_round(value: Fraction, policy: str) -> Number:
+    """Apply an exact policy to a fraction: ``floor`` and ``ceil`` round it, ``fraction`` keeps it, as an ``int`` when possible."""
+    if policy == "floor":
+        return math.floor(value)
+    if policy == "ceil":
+        return math.ceil(value)
+    return value.numerator if value.denominator == 1 else value
+
+
+def exact_converter(entry: Optional[Tuple[int, int, Optional[int]]], policy: str) -> Callable[[Number], Number]:
+    """Return a callable equivalent to ``exact_convert()`` for one entry, specialized for integers."""
+    if entry is None:
+        return _identity
+    multiplier, divisor, shift = entry
+    if divisor == 1 and shift is not None:
+        def shift_left(value: Number) -> Number:
+            return value << shift if isinstance(value, int) else exact_convert(value, entry, policy)
+        return shift_left
+    if divisor == 1:
+        def multiply(value: Number) -> Number:
+            return value * multiplier if isinstance(value, int) else exact_convert(value, entry, policy)
+        return multiply
+    if policy == "floor" and shift is not None:
+        def shift_right(value: Number) -> Number:
+            return value >> shift if isinstance(value, int) else exact_convert(value, entry, policy)
+        return shift_right
+    if policy == "floor" and multiplier == 1:
+        def floor_divide(value: Number) -> Number:
+            return value // divisor if isinstance(value, int) else exact_convert(value, entry, policy)
+        return floor_divide
+
+    def converter(value: Number) -> Number:
+        return exact_convert(value, entry, policy)
+    return converter
+
+# code: language=python tabSize=4
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Rendering of values as quantities, like ``"1.50 GiB"``.
+
+Each prefixed unit and precision gets one template, built on first use and shared by every unit.
+Many values are rendered in chunks: the best prefixes of a chunk are selected at once, see
+``MagnitudeSystem.best_prefix_many()``, and each prefix's converter is resolved once per call.
+The output is read back by ``MagnitudeUnit.parse()``. Values are always rendered from floating-point
+conversions, even on systems with an exact policy, whose fractions cannot be formatted as decimals.
+"""
+
+import functools
+import itertools
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from ._numpy import is_array
+from .batch import convert_many
+from .types import Number
+
+
+CHUNK_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=1024)
+def template(unit: str, precision: int) -> Callable[[Number], str]:
+    """Return the function rendering a number in a prefixed unit.
+
+    Args:
+        unit (str): prefixed unit. Example: "GiB".
+        precision (int): number of decimal places.
+
+    Returns:
+        Callable[[Number], str]: function taking one value and returning it rendered. Example: ``"1.50 GiB"``.
+    """
+    return f"{{:.{precision}f}} {unit.replace('{', '{{').replace('}', '}}')}".format
+
+
+def _float_system(unit: Any) -> Any:
+    return unit.mag_sys if unit.mag_sys.exact is None else unit.mag_sys.with_exact(None)
+
+
+def _unit_of(unit: Any, prefixed_unit: Optional[str]) -> str:
+    """Validate a prefixed unit, returning it, or the unit of the default order if it is ``None``."""
+    prefix = unit.prefix_of(prefixed_unit) or unit.mag_sys.default
+    unit.mag_sys.magnitude_by_prefix(prefix)
+    return prefixed_unit if prefixed_unit is not None else prefix + unit.base_unit
+
+
+def format_quantity(unit: Any, value: Number, from_unit: Optional[str], precision: int, auto: bool) -> str:
+    """Render a value, see ``MagnitudeUnit.format()``."""
+    if not auto:
+        return template(_unit_of(unit, from_unit), precision)(value)
+    value = unit.transform(value, from_unit, exact=False)
+    prefix = unit.mag_sys.best_prefix(value)
+    return template(prefix + unit.base_unit, precision)(unit.mag_sys.convert(value, None, prefix, exact=False))
+
+
+def _chunks(values: Iterable[Number], units: Union[None, str, Iterable[str]]) -> Iterator[Tuple[Any, Any]]:
+    if is_array(values):
+        yield values, units
+        return
+    single = units is None or isinstance(units, str)
+    items = iter(values) if single else zip(values, units)
+    chunk = list(itertools.islice(items, CHUNK_SIZE))
+    while chunk:
+        yield (chunk, units) if single else (tuple(v for v, _ in chunk), tuple(u for _, u in chunk))
+        chunk = list(itertools.islice(items, CHUNK_SIZE))
+
+
+def _render_chunk(unit: Any, chunk: Iterable[Number], units: Union[None, str, Iterable[str]], precision: int,
+                  renderers: Dict[Optional[str], Callable[[Number], str]]) -> List[str]:
+    if units is None or isinstance(units, str):
+        units = itertools.repeat(units)
+    rendered = []
+    for value, prefixed_unit in zip(chunk, units):
+        try:
+            render = renderers[prefixed_unit]
+        except KeyError:
+            render = renderers[prefixed_unit] = template(_unit_of(unit, prefixed_unit), precision)
+        rendered.append(render(value))
+    return rendered
+
+
+def format_chunks(unit: Any, values: Iterable[Number], from_unit: Union[None, str, Iterable[str]],
+                  precision: int, auto: bool) -> Iterator[List[str]]:
+    """Render many values, chunk by chunk, see ``MagnitudeUnit.format_many()``.
+
+    Returns:
+        Iterator[List[str]]: the rendered values, in chunks of up to ``CHUNK_SIZE`` values, or one chunk for NumPy arrays.
+    """
+    mag_sys = _float_system(unit)
+    renderers = {}  # type: Dict[Optional[str], Callable[[Number], str]]
+    converters = {}  # type: Dict[str, Tuple[Callable[[Number], Number], Callable[[Number], str]]]
+    for chunk, units in _chunks(values, from_unit):
+        if not auto:
+            yield _render_chunk(unit, chunk, units, precision, renderers)
+            continue
+        if units is not None:
+            chunk = convert_many(mag_sys, chunk, units, None, None, unit.prefix_of)
+        rendered = []
+        for value, prefix in zip(chunk, mag_sys.best_prefix_many(chunk)):
+            try:
+                converter, render = converters[prefix]
+            except KeyError:
+                converter, render = converters[prefix] = (mag_sys.get_converter(None, prefix), template(prefix + unit.base_unit, precision))
+            rendered.append(render(converter(value)))
+        yield rendered
+
+
+def write_quantities(unit: Any, out: TextIO, values: Iterable[Number], from_unit: Union[None, str, Iterable[str]],
+                     precision: int, auto: bool, end: str) -> int:
+    """Write many rendered values to a text stream, see ``MagnitudeUnit.write_many()``."""
+    count = 0
+    for rendered in format_chunks(unit, values, from_unit, precision, auto):
+        if rendered:
+            out.write(end.join(rendered) + end)
+            count += len(rendered)
+    return count
+
+# code: language=python tabSize=4
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Opt-in instrumentation of the conversion entry points.
+
+``enable()`` replaces the instrumented methods with wrappers counting the calls, their duration, their
+keys (prefix pairs, units) and the exceptions they raise, and ``disable()`` puts the original methods back.
+While disabled, the library runs its original code, with no check of any kind.
+
+Callables returned by ``get_converter()`` are not instrumented, only their creation is. Calls made by
+instrumented methods to other instrumented methods are counted in both, for instance ``transform()``
+calls ``convert()``.
+"""
+
+import functools
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .base import MagnitudeSystem, MagnitudeUnit
+from .cache import SystemCache
+
+
+Hook = Callable[[str, Hashable, float, Optional[BaseException]], None]
+
+_INSTRUMENTED = [
+    (MagnitudeSystem, "convert", lambda self, value, from_order=None, to_order=None, *args, **kwargs: (from_order or self.default, to_order or self.default)),
+    (MagnitudeSystem, "get_converter", lambda self, from_order=None, to_order=None, *args, **kwargs: (from_order or self.default, to_order or self.default)),
+    (MagnitudeSystem, "magnitude_by_prefix", lambda self, prefix: prefix),
+    (MagnitudeUnit, "transform", lambda self, value, from_unit=None, to_unit=None, *args, **kwargs: (from_unit or self.base_unit, to_unit or self.base_unit)),
+    (MagnitudeUnit, "parse", lambda self, text, to_unit=None: to_unit or self.base_unit),
+]
+
+_lock = threading.Lock()
+_originals = {}  # type: Dict[Any, Any]
+_state = {"hook": None}  # type: Dict[str, Optional[Hook]]
+_calls = Counter()
+_seconds = defaultdict(float)
+_keys = defaultdict(Counter)
+_errors = defaultdict(Counter)
+_cache = Counter()
+
+
+def _record(name: str, key: Hashable, seconds: float, error: Optional[BaseException]) -> None:
+    with _lock:
+        _calls[name] += 1
+        _seconds[name] += seconds
+        _keys[name][key] += 1
+        if error is not None:
+            _errors[name][type(error).__name__] += 1
+        hook = _state["hook"]
+    if hook is not None:
+        hook(name, key, seconds, error)
+
+
+def _instrument(name: str, method: Callable[..., Any], key: Callable[..., Hashable]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        error = None
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _record(name, key(*args, **kwargs), time.perf_counter() - start, error)
+    return wrapper
+
+
+def _instrument_cache_get(method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def get(self, key, factory):
+        with _lock:
+            _cache["lookups"] += 1
+        return method(self, key, factory)
+    return get
+
+
+def _instrument_cache_miss(method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def miss(self, key, factory):
+        before, inserted = len(self), key not in self
+        entry = method(self, key, factory)
+        with _lock:
+            _cache["misses"] += 1
+            _cache["evictions"] += max(before + inserted - len(self), 0)
+        return entry
+    return miss
+
+
+def enable(hook: Optional[Hook] = None) -> None:
+    """Start instrumenting. Counters accumulate from previous runs until ``reset()``.
+
+    Args:
+        hook (Optional[Hook], optional): function called after every instrumented call, with the method name, its key, its duration in seconds and the exception raised, if any. Defaults to None.
+    """
+    with _lock:
+        _state["hook"] = hook
+        if _originals:
+            return
+        for cls, name, key in _INSTRUMENTED:
+            method = _originals[(cls, name)] = cls.__dict__[name]
+            setattr(cls, name, _instrument(name, method, key))
+        for name, instrument in (("get", _instrument_cache_get), ("_miss", _instrument_cache_miss)):
+            method = _originals[(SystemCache, name)] = SystemCache.__dict__[name]
+            setattr(SystemCache, name, instrument(method))
+
+
+def disable() -> None:
+    """Stop instrumenting, restoring the original methods. Counters are kept."""
+    with _lock:
+        _state["hook"] = None
+        for (cls, name), method in _originals.items():
+            setattr(cls, name, method)
+        _originals.clear()
+
+
+def is_enabled() -> bool:
+    """Test whether instrumentation is enabled.
+
+    Returns:
+        bool: ``True`` between ``enable()`` and ``disable()``.
+    """
+    return bool(_originals)
+
+
+def reset() -> None:
+    """Clear the counters."""
+    with _lock:
+        for counter in (_calls, _seconds, _keys, _errors, _cache):
+            counter.clear()
+
+
+def snapshot() -> Dict[str, Any]:
+    """Return a copy of the counters.
+
+    Returns:
+        Dict[str, Any]: dictionary with the keys:
+
+            - ``calls``: number of calls per method name.
+            - ``seconds``: total time spent per method name.
+            - ``keys``: number of calls per key, per method name. Keys are ``(from, to)`` pairs of prefixes for ``convert`` and ``get_converter``, of units for ``transform``, the prefix for ``magnitude_by_prefix`` and the targeted unit for ``parse``.
+            - ``errors``: number of exceptions per exception class name, per method name.
+            - ``cache``: ``lookups``, ``hits``, ``misses`` and ``evictions`` of the system caches.
+    """
+    with _lock:
+        cache = {name: _cache[name] for name in ("lookups", "misses", "evictions")}
+        cache["hits"] = cache["lookups"] - cache["misses"]
+        return {
+            "calls": dict(_calls),
+            "seconds": dict(_seconds),
+            "keys": {name: dict(keys) for name, keys in _keys.items()},
+            "errors": {name: dict(errors) for name, errors in _errors.items()},
+            "cache": cache,
+        }
+
+# code: language=python tabSize=4
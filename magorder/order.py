@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from fractions import Fraction
+import operator
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+
+from .types import MagOrderSpec
+
+
+class MagnitudeOrder:
+    """This class represents one order of magnitude. Objects are immutable and hashable.
+
+    The ``prefixes`` attribute is a frozenset containing the primary prefix and its aliases.
+    Orders are either a power of the base of their system, or an explicit factor, for units that
+    do not follow a single base, like minutes and hours.
+    """
+
+    __slots__ = ("prefix", "power", "aliases", "factor", "prefixes")
+
+    def __init__(self, prefix: str, power: Optional[int] = None, aliases: Optional[Sequence[str]] = None,
+                 factor: Union[None, int, str, Fraction] = None) -> None:
+        """Create an object.
+
+        Args:
+            prefix (str): primary prefix for this order of magnitude. Examples: "c" for centimeters or "k" for kilograms.
+            power (Optional[int], optional): integer power of the base (usually 10) for this order of magnitude. Examples: 3 for "k" (from 10 ** 3), and -3 for "m" (from 10 ** -3). Required unless ``factor`` is specified.
+            aliases (Optional[Sequence[str]], optional): List of prefix aliases. Defaults to ``None``. Examples: some systems won't display "µg" correctly, so we might use "ug" as an alias.
+            factor (Union[None, int, str, Fraction], optional): exact factor of this order of magnitude, taking precedence over ``power``. Examples: 3600 for "h" in a system of seconds, or "1/60" for "s" in a system of minutes. Defaults to ``None``.
+
+        Raises:
+            ValueError: raised if neither ``power`` nor ``factor`` is specified, or if ``factor`` is not positive.
+        """
+        if factor is not None:
+            factor = Fraction(factor)
+            if factor <= 0:
+                raise ValueError(f"Factor of magnitude order '{prefix}' must be positive, not {factor}")
+        elif power is None:
+            raise ValueError(f"Magnitude order '{prefix}' needs either a power or a factor")
+        self.prefix = prefix
+        self.power = power
+        self.aliases = tuple(aliases) if aliases else ()
+        self.factor = factor
+        self.prefixes = frozenset(self.aliases).union((prefix,))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if hasattr(self, name):
+            raise AttributeError(f"Cannot set '{name}': MagnitudeOrder objects are immutable")
+        super().__setattr__(name, value)
+
+    def __reduce__(self) -> Tuple[type, Tuple[str, Optional[int], Tuple[str, ...], Optional[Fraction]]]:
+        return type(self), (self.prefix, self.power, self.aliases, self.factor)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, MagnitudeOrder):
+            return NotImplemented
+        return (self.prefix, self.power, self.aliases, self.factor) == (other.prefix, other.power, other.aliases, other.factor)
+
+    def __hash__(self) -> int:
+        return hash((self.prefix, self.power, self.aliases, self.factor))
+
+    def match(self, prefix: str) -> bool:
+        """Test whether a string is a valid prefix for this magnitude order.
+
+        Args:
+            prefix (str): string to be tested.
+
+        Returns:
+            bool: ``True`` if it is a valid prefix, ``False`` otherwise.
+        """
+        return prefix in self.prefixes
+
+    def match_all(self, loc: MagOrderSpec) -> bool:
+        """Test whether the parameter is a valid prefix or if it matches the
+        power of the base for this order of magnitude.
+
+        Args:
+            loc (MagOrderSpec): string to be tested.
+
+        Returns:
+            bool: ``True`` if it is a valid prefix or power, ``False`` otherwise.
+        """
+        return loc in self.prefixes or loc == self.power
+
+    def __str__(self) -> str:
+        scale = self.power if self.factor is None else f"x{self.factor}"
+        return f"<MagnitudeOrder: '{self.prefix}' ({scale}){f' aliases: {list(self.aliases)}' if self.aliases else ''}>"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def magnitude_key(orders: Sequence[MagnitudeOrder], base: int) -> Callable[[MagnitudeOrder], Any]:
+    """Return the function ranking orders of magnitude in a system: their power, or their exact factor
+    when any of them declares one, so that systems without explicit factors never compute fractions.
+
+    Args:
+        orders (Sequence[MagnitudeOrder]): orders of magnitude of the system.
+        base (int): base of the system.
+
+    Returns:
+        Callable[[MagnitudeOrder], Any]: function returning the sort key of one order.
+    """
+    if all(m.factor is None for m in orders):
+        return operator.attrgetter("power")
+    base = Fraction(base)
+    return lambda m: base ** m.power if m.factor is None else m.factor
+
+# code: language=python tabSize=4
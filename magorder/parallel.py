@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Conversion of large inputs by pools of processes.
+
+Inputs are split in chunks, and each chunk is sent to a worker along with the unit. Units and systems
+are pickled as their configuration only, a few dozen bytes, and workers rehydrate them from their
+own cache, so the conversion tables are built once per worker, not once per task.
+"""
+
+import collections
+import functools
+import itertools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+
+from .base import MagnitudeUnit
+from .types import Number
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+CHUNK_SIZE = 10_000
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split items in chunks.
+
+    Args:
+        items (Iterable[T]): items to be split.
+        size (int): maximum number of items per chunk.
+
+    Returns:
+        Iterator[List[T]]: the chunks, lazily read from ``items``.
+    """
+    items = iter(items)
+    chunk = list(itertools.islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(items, size))
+
+
+def map_chunks(function: Callable[[List[T]], R], chunks: Iterable[List[T]],
+               jobs: Optional[int] = None, executor: Optional[Executor] = None) -> Iterator[R]:
+    """Apply a function to chunks in a pool of processes, preserving their order.
+
+    At most two chunks per worker are in flight at any time, so ``chunks`` may be an unbounded stream.
+
+    Args:
+        function (Callable[[List[T]], R]): picklable function, typically a module-level function, a ``functools.partial`` or a bound method of a unit.
+        chunks (Iterable[List[T]]): the chunks.
+        jobs (Optional[int], optional): number of worker processes, or of tasks submitted to ``executor``. ``1`` applies the function in this process. Defaults to the number of CPUs.
+        executor (Optional[Executor], optional): existing pool to be used instead of creating one. Defaults to None.
+
+    Returns:
+        Iterator[R]: the results, one per chunk.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if executor is not None:
+        yield from _map_bounded(executor, function, chunks, 2 * jobs)
+    elif jobs == 1:
+        yield from map(function, chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            yield from _map_bounded(pool, function, chunks, 2 * jobs)
+
+
+def _map_bounded(executor: Executor, function: Callable[[List[T]], R], chunks: Iterable[List[T]], backlog: int) -> Iterator[R]:
+    pending = collections.deque()
+    for chunk in chunks:
+        pending.append(executor.submit(function, chunk))
+        if len(pending) >= backlog:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def transform_many(unit: MagnitudeUnit, values: Iterable[Number],
+                   from_unit: Optional[str] = None, to_unit: Optional[str] = None,
+                   jobs: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+                   executor: Optional[Executor] = None) -> List[Number]:
+    """Parallel version of ``MagnitudeUnit.transform_many()``, with one unit for all the values.
+
+    Args:
+        unit (MagnitudeUnit): unit of the values.
+        values (Iterable[Number]): values to be transformed.
+        from_unit (Optional[str], optional): unit of the values. Defaults to the base unit.
+        to_unit (Optional[str], optional): targeted unit. Defaults to the base unit.
+        jobs (Optional[int], optional): number of worker processes, see ``map_chunks()``.
+        chunk_size (int, optional): number of values per task. Defaults to ``CHUNK_SIZE``.
+        executor (Optional[Executor], optional): existing pool, see ``map_chunks()``.
+
+    Raises:
+        MagnitudeUnit.UnknownUnit: raised if any of the units is not known.
+        MagnitudeSystem.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+
+    Returns:
+        List[Number]: the transformed values.
+    """
+    unit.transform(0, from_unit, to_unit)
+    function = functools.partial(unit.transform_many, from_unit=from_unit, to_unit=to_unit)
+    return _flatten(map_chunks(function, chunked(values, chunk_size), jobs, executor))
+
+
+def parse_many(unit: MagnitudeUnit, lines: Iterable[str], to_unit: Optional[str] = None,
+               jobs: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+               executor: Optional[Executor] = None) -> List[Number]:
+    """Parallel version of ``MagnitudeUnit.parse_many()``.
+
+    Args:
+        unit (MagnitudeUnit): unit of the quantities.
+        lines (Iterable[str]): quantities to be parsed, one per line.
+        to_unit (Optional[str], optional): targeted unit. Defaults to the base unit.
+        jobs (Optional[int], optional): number of worker processes, see ``map_chunks()``.
+        chunk_size (int, optional): number of lines per task. Defaults to ``CHUNK_SIZE``.
+        executor (Optional[Executor], optional): existing pool, see ``map_chunks()``.
+
+    Raises:
+        MagnitudeUnit.UnknownUnit: raised if ``to_unit`` is not known.
+        MagnitudeSystem.MagnitudeDoesNotExist: raised if the prefix of ``to_unit`` does not exist.
+        MagnitudeUnit.InvalidQuantity: raised if any of the lines is not a quantity of the unit.
+
+    Returns:
+        List[Number]: the parsed values.
+    """
+    unit.transform(0, to_unit=to_unit)
+    function = functools.partial(unit.parse_many, to_unit=to_unit)
+    return _flatten(map_chunks(function, chunked(lines, chunk_size), jobs, executor))
+
+
+def _flatten(results: Iterable[Iterable[Any]]) -> List[Any]:
+    return list(itertools.chain.from_iterable(results))
+
+# code: language=python tabSize=4
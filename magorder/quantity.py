@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import functools
+from typing import Any, Optional
+
+from .base import MagnitudeUnit
+from .types import Number
+
+
+@functools.total_ordering
+class Quantity:
+    """A value in a prefixed unit, comparable to other quantities of the same magnitude system.
+
+    Comparisons use the sort key of the quantity (see ``MagnitudeSystem.sort_key()``), computed once
+    when the object is created, so quantities work directly with ``sorted()``, ``heapq`` and ``bisect``.
+    """
+
+    __slots__ = ("value", "prefix", "unit", "key")
+
+    def __init__(self, unit: MagnitudeUnit, value: Number, prefix: str = "") -> None:
+        """Create an object.
+
+        Args:
+            unit (MagnitudeUnit): unit of the quantity.
+            value (Number): value of the quantity.
+            prefix (str, optional): prefix of the value's order of magnitude. Defaults to "".
+
+        Raises:
+            MagnitudeSystem.MagnitudeDoesNotExist: raised if the prefix does not exist.
+        """
+        self.value = value
+        self.prefix = prefix
+        self.unit = unit
+        self.key = unit.mag_sys.sort_key(value, prefix)
+
+    @classmethod
+    def parse(cls, unit: MagnitudeUnit, text: str) -> "Quantity":
+        """Create a quantity from text.
+
+        Args:
+            unit (MagnitudeUnit): unit of the quantity.
+            text (str): quantity, see ``MagnitudeUnit.parse()``. Example: "1.5 GiB".
+
+        Raises:
+            MagnitudeUnit.InvalidQuantity: raised if the text is not a valid quantity in the unit.
+
+        Returns:
+            Quantity: the quantity.
+        """
+        value, prefix = unit.split(text)
+        return cls(unit, value, prefix)
+
+    def to(self, to_unit: Optional[str] = None) -> Number:
+        """Return the value transformed to a prefixed unit.
+
+        Args:
+            to_unit (Optional[str], optional): prefixed unit to transform to. Defaults to the base unit.
+
+        Returns:
+            Number: value in the target unit.
+        """
+        return self.unit.mag_sys.convert(self.value, self.prefix, self.unit.prefix_of(to_unit))
+
+    def _comparable(self, other: Any) -> bool:
+        return isinstance(other, Quantity) and other.unit.mag_sys is self.unit.mag_sys and other.unit.base_unit == self.unit.base_unit
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Quantity):
+            return NotImplemented
+        return self._comparable(other) and self.key == other.key
+
+    def __lt__(self, other: Any) -> bool:
+        if not self._comparable(other):
+            return NotImplemented
+        return self.key < other.key
+
+    def __hash__(self) -> int:
+        return hash((self.unit.base_unit, self.key))
+
+    def __str__(self) -> str:
+        return f"{self.value} {self.prefix}{self.unit.base_unit}"
+
+    def __repr__(self) -> str:
+        return f"<Quantity: {self}>"
+
+# code: language=python tabSize=4
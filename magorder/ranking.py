@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Ranking of values by order of magnitude: best prefixes, histograms and sort keys.
+
+These methods only read the sorted factors and lookup tables built by ``MagnitudeSystem``, which
+they are mixed into.
+"""
+
+import bisect
+from typing import Any, Iterable, List, Optional, Tuple, Union
+
+from ._numpy import is_array, load_numpy
+from .batch import Histogram, histogram
+from .types import Number
+
+
+class RankingMixin:
+    """Methods of ``MagnitudeSystem`` ranking values by order of magnitude."""
+
+    def _best_index(self, value: Number) -> int:
+        if not value:
+            if self.default not in self._prefix_mag_map:
+                return 0
+            return self._display.index(self._key_mag_map[self._key(self._prefix_mag_map[self.default])])
+        return max(bisect.bisect_right(self._scales, abs(value)) - 1, 0)
+
+    def best_prefix(self, value: Number) -> str:
+        """Return the primary prefix of the largest order of magnitude not exceeding a value.
+
+        The order is found by bisecting the sorted factors of the orders, clamped to the ``lower`` and
+        ``upper`` bounds of the system. Zero is best displayed with the ``default`` prefix.
+
+        Args:
+            value (Number): value in the ``default`` order of magnitude.
+
+        Returns:
+            str: primary prefix best suited to display the value.
+        """
+        return self._display[self._best_index(value)].prefix
+
+    def best_prefix_many(self, values: Iterable[Number]) -> List[str]:
+        """Return the best prefix for each one of many values. See ``best_prefix()``.
+
+        NumPy arrays are bisected with one vectorized ``searchsorted()``.
+
+        Args:
+            values (Iterable[Number]): values in the ``default`` order of magnitude.
+
+        Returns:
+            List[str]: primary prefix best suited to display each value.
+        """
+        prefixes = [m.prefix for m in self._display]
+        indexes = self._best_indexes(values)
+        return [prefixes[index] for index in (indexes.tolist() if is_array(indexes) else indexes)]
+
+    def _best_indexes(self, values: Iterable[Number]) -> Any:
+        if not is_array(values):
+            return [self._best_index(value) for value in values]
+        numpy = load_numpy()
+        indexes = numpy.searchsorted(numpy.asarray(self._scales), numpy.abs(values), side="right") - 1
+        numpy.maximum(indexes, 0, out=indexes)
+        indexes[values == 0] = self._best_index(0)
+        return indexes
+
+    def histogram(self, values: Iterable[Number], sums: bool = False, from_order: Optional[str] = None) -> Histogram:
+        """Count values per order of magnitude, each value falling in the order ``best_prefix()`` picks for it.
+
+        Values beyond the ``lower`` and ``upper`` bounds of the system are counted in the lowest and
+        the highest orders. NumPy arrays are bucketed with one vectorized ``searchsorted()`` over the
+        factors of the orders and counted with ``bincount()``, other iterables are bisected value by value.
+
+        Args:
+            values (Iterable[Number]): values to be counted.
+            sums (bool, optional): also sum the values per order, in the ``default`` order. Defaults to False.
+            from_order (Optional[str], optional): prefix of the values' order of magnitude. Values are scaled without rounding. Defaults to the prefix matching the ``default_order``.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if the prefix does not exist.
+
+        Returns:
+            Histogram: counts, and sums if requested, keyed by primary prefix in ascending order. Sums of NumPy arrays are floats.
+        """
+        scale = self._prefix_scale(from_order) if from_order and from_order != self.default else 1
+        if is_array(values):
+            if scale != 1:
+                values = self._scaled(values, from_order)
+        else:
+            values = list(values) if scale == 1 else [value * scale for value in values]
+        return histogram(self._best_indexes(values), values, [m.prefix for m in self._display], sums)
+
+    def _prefix_scale(self, from_order: Optional[str]) -> float:
+        from_order = from_order if from_order else self.default
+        try:
+            return self._prefix_scales[from_order]
+        except KeyError:
+            raise self.MagnitudeDoesNotExist(from_order)
+
+    def _scaled(self, values: Any, from_order: Union[None, str, Iterable[str]]) -> Any:
+        """Scale an array to the ``default`` order with unrounded factors, so values keep their order."""
+        numpy = load_numpy()
+        if from_order is None or isinstance(from_order, str):
+            return numpy.multiply(values, self._prefix_scale(from_order), dtype=numpy.float64)
+        keys, inverse = numpy.unique(numpy.asarray(from_order), return_inverse=True)
+        scales = numpy.array([self._prefix_scale(str(key)) for key in keys], dtype=numpy.float64)
+        return numpy.multiply(values, scales[inverse.reshape(numpy.shape(values))], dtype=numpy.float64)
+
+    def sort_key(self, value: Number, from_order: Optional[str] = None) -> Tuple[int, int, Number]:
+        """Return a key ordering values expressed in any order of magnitude of this system.
+
+        The key is made of the sign of the value, the (signed) rank of the value's best order of
+        magnitude (see ``best_prefix()``) and the value converted to that order. Tuples compare
+        element by element, so keys sort like the values they stand for without converting every
+        value to the same order. The converted value is not rounded, so values differing only below
+        ``decimals`` keep their order.
+
+        Args:
+            value (Number): value to be ranked.
+            from_order (Optional[str], optional): prefix of the value's order of magnitude. Defaults to the prefix matching the ``default_order``.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if the prefix does not exist.
+
+        Returns:
+            Tuple[int, int, Number]: the key. Example: ``(1, 3, 1.5)`` for 1.5 G in the SI data system.
+        """
+        if not value:
+            return 0, 0, 0
+        value = value * self._prefix_scale(from_order)
+        index = self._best_index(value)
+        mantissa = value / self._scales[index]
+        return (1, index, mantissa) if value > 0 else (-1, -index, mantissa)
+
+    def sort_keys(self, values: Iterable[Number],
+                  from_order: Union[None, str, Iterable[str]] = None) -> Any:
+        """Return the sort keys of many values. See ``sort_key()``.
+
+        Keys of NumPy arrays are computed with vectorized operations, and returned as a structured
+        array with the fields ``sign``, ``rank`` and ``mantissa``, suitable for ``numpy.argsort()`` and
+        ``numpy.sort()``. The mantissas of that array are not rounded.
+
+        Args:
+            values (Iterable[Number]): values to be ranked.
+            from_order (Union[None, str, Iterable[str]], optional): prefix of the values' order of magnitude, or a sequence with one prefix per value. Defaults to the prefix matching the ``default_order``.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+
+        Returns:
+            Any: a list of keys, or a structured NumPy array for NumPy arrays.
+        """
+        if not is_array(values):
+            if from_order is None or isinstance(from_order, str):
+                return [self.sort_key(value, from_order) for value in values]
+            return [self.sort_key(value, order) for value, order in zip(values, from_order)]
+
+        numpy = load_numpy()
+        values = self._scaled(values, from_order)
+        indexes = numpy.asarray(self._best_indexes(values))
+        sign = numpy.sign(values).astype(numpy.int8)
+        keys = numpy.empty(values.shape, dtype=[("sign", numpy.int8), ("rank", numpy.int64), ("mantissa", numpy.float64)])
+        keys["sign"] = sign
+        keys["rank"] = numpy.where(sign == 0, 0, indexes * sign)
+        keys["mantissa"] = values / numpy.asarray(self._scales)[indexes]
+        return keys
+
+# code: language=python tabSize=4
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import math
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from .base import MagnitudeOrder, MagnitudeUnit
+from .types import Number
+
+
+class Resolution(NamedTuple):
+    """Result of resolving a prefixed unit."""
+    unit: MagnitudeUnit
+    prefix: str
+    order: MagnitudeOrder
+
+
+class UnitRegistry:
+    """Registry resolving the prefixed units of many ``MagnitudeUnit`` objects with a single lookup.
+
+    Every prefixed unit of every registered unit is indexed once, when the unit is registered.
+    When the same text is valid for more than one unit, the one with the shortest prefix wins
+    (that is, the longest base unit), then the one registered first. For instance, with meters and
+    seconds registered, "ms" is milliseconds and "m" is meters.
+    """
+
+    class IncompatibleUnits(ValueError):
+        """Exception for when two units cannot be converted into each other."""
+        def __init__(self, from_unit: str, to_unit: str) -> None:
+            """Create the exception object.
+
+            Args:
+                from_unit (str): unit to convert from.
+                to_unit (str): unit to convert to.
+            """
+            super().__init__(f"Cannot convert '{from_unit}' to '{to_unit}'")
+
+    def __init__(self, units: Iterable[MagnitudeUnit] = ()) -> None:
+        """Create an object.
+
+        Args:
+            units (Iterable[MagnitudeUnit], optional): units to be registered. Defaults to none.
+        """
+        self.units = []
+        self._resolutions = {}
+        self._converters = {}
+        for unit in units:
+            self.register(unit)
+
+    def register(self, unit: MagnitudeUnit) -> None:
+        """Register a unit, indexing all its prefixed units.
+
+        Args:
+            unit (MagnitudeUnit): unit to be registered.
+        """
+        index = len(self.units)
+        self.units.append(unit)
+        for text, prefix in unit.mag_sys.unit_prefixes(unit.base_unit).items():
+            rank = (len(prefix), index)
+            existing = self._resolutions.get(text)
+            if existing is None or rank < existing[:2]:
+                self._resolutions[text] = rank + (Resolution(unit, prefix, unit.mag_sys.magnitude_by_prefix(prefix)),)
+        self._converters.clear()
+
+    def resolve(self, text: str) -> Optional[Resolution]:
+        """Resolve a prefixed unit.
+
+        Args:
+            text (str): prefixed unit. Examples: "ms", "MiB".
+
+        Returns:
+            Optional[Resolution]: the unit, prefix and order of magnitude, or ``None`` if the text is not a known prefixed unit.
+        """
+        entry = self._resolutions.get(text)
+        return None if entry is None else entry[2]
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._resolutions
+
+    def get_converter(self, from_unit: str, to_unit: str) -> Callable[[Number], Number]:
+        """Return a callable converting values between two prefixed units.
+
+        Units of the same ``MagnitudeUnit`` are converted by its magnitude system. Units of different
+        systems sharing the same base unit, like "MiB" and "kB", are converted by the ratio of their factors.
+        Converters are cached, so only the first call for a pair of units pays for building it.
+
+        Args:
+            from_unit (str): prefixed unit to convert from.
+            to_unit (str): prefixed unit to convert to.
+
+        Raises:
+            MagnitudeUnit.UnknownUnit: raised if any of the units is not registered.
+            self.IncompatibleUnits: raised if the units have different base units.
+
+        Returns:
+            Callable[[Number], Number]: function taking one value and returning it converted.
+        """
+        try:
+            return self._converters[(from_unit, to_unit)]
+        except KeyError:
+            pass
+        source, target = self.resolve(from_unit), self.resolve(to_unit)
+        if source is None:
+            raise MagnitudeUnit.UnknownUnit(from_unit)
+        if target is None:
+            raise MagnitudeUnit.UnknownUnit(to_unit)
+        if source.unit.base_unit != target.unit.base_unit:
+            raise self.IncompatibleUnits(from_unit, to_unit)
+        if source.unit.mag_sys is target.unit.mag_sys:
+            converter = source.unit.mag_sys.get_converter(source.prefix, target.prefix)
+        else:
+            converter = self._cross_converter(source, target)
+        return self._converters.setdefault((from_unit, to_unit), converter)
+
+    @staticmethod
+    def _cross_converter(source: Resolution, target: Resolution) -> Callable[[Number], Number]:
+        ratio = source.unit.mag_sys.exact_factor(source.order.prefix) / target.unit.mag_sys.exact_factor(target.order.prefix)
+        decimals = max(6, math.ceil(abs(math.log10(ratio))))
+        ratio = float(ratio)
+
+        def converter(value: Number) -> float:
+            return round(value * ratio, decimals)
+
+        return converter
+
+    def convert(self, value: Number, from_unit: str, to_unit: str) -> Number:
+        """Convert a value between two prefixed units. See ``get_converter()``.
+
+        Args:
+            value (Number): value to be converted.
+            from_unit (str): prefixed unit to convert from. Example: "MiB".
+            to_unit (str): prefixed unit to convert to. Example: "kB".
+
+        Raises:
+            MagnitudeUnit.UnknownUnit: raised if any of the units is not registered.
+            self.IncompatibleUnits: raised if the units have different base units.
+
+        Returns:
+            Number: value in the target unit.
+        """
+        try:
+            converter = self._converters[(from_unit, to_unit)]
+        except KeyError:
+            converter = self.get_converter(from_unit, to_unit)
+        return converter(value)
+
+# code: language=python tabSize=4
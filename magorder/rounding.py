@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Rounding of floating-point conversion results."""
+
+import math
+import sys
+from typing import Optional
+
+
+ROUNDING_MODES = ("round", "floor", "ceil", "none")
+
+# Relative distance under which a value is taken as a float artefact of its rounded decimal representation
+_ARTEFACT_TOLERANCE = 4 * sys.float_info.epsilon
+
+
+def rounding_mode(rounding: Optional[str]) -> str:
+    """Validate a rounding mode.
+
+    Args:
+        rounding (Optional[str]): one of ``ROUNDING_MODES``, or ``None`` for ``"round"``.
+
+    Raises:
+        ValueError: raised if the rounding mode is not valid.
+
+    Returns:
+        str: the rounding mode.
+    """
+    if rounding is None:
+        return "round"
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Invalid rounding mode '{rounding}', expected one of {ROUNDING_MODES}")
+    return rounding
+
+
+def round_value(value: float, decimals: int, rounding: str) -> float:
+    """Round a value to a number of decimals with one of ``ROUNDING_MODES``.
+
+    ``floor`` and ``ceil`` start from ``round()`` and step by one unit of the last decimal when it went
+    the wrong way. Values within a few units in the last place of the rounded result, like ``0.1 * 3``
+    or ``0.7 * 3``, are float artefacts of that decimal and snap to it in both directions, so they are
+    neither ceiled to ``0.31`` nor floored to ``2.09``.
+    """
+    if rounding == "none":
+        return value
+    rounded = round(value, decimals)
+    if math.isclose(rounded, value, rel_tol=_ARTEFACT_TOLERANCE):
+        return rounded
+    if rounding == "floor" and rounded > value:
+        return round(rounded - 10 ** -decimals, decimals)
+    if rounding == "ceil" and rounded < value:
+        return round(rounded + 10 ** -decimals, decimals)
+    return rounded
+
+# code: language=python tabSize=4
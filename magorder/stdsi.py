@@ -4,7 +4,8 @@
 # GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from .base import MagnitudeSystem, MagnitudeUnit
+from .base import MagnitudeOrder, MagnitudeSystem, MagnitudeUnit
+from .cache import systems
 
 
 class StdSIMagnitudeUnit(MagnitudeUnit):
@@ -32,8 +33,17 @@ class StdSIMagnitudeUnit(MagnitudeUnit):
         {"prefix": "Y", "power": 24},
     ]
 
+    std_si_orders = tuple(MagnitudeOrder(**kw) for kw in std_si_order)
+
     def __init__(self, unit, lower=None, upper=None, base=10):
-        orders = MagnitudeSystem(self.std_si_order, lower=lower, upper=upper, base=base)
+        orders = systems.get((type(self), lower, upper, base), lambda: self._build_system(lower, upper, base))
         super().__init__(unit, orders)
+        self._args = (unit, lower, upper, base)
+
+    @classmethod
+    def _build_system(cls, lower, upper, base):
+        if cls.std_si_order is StdSIMagnitudeUnit.std_si_order:
+            return MagnitudeSystem.from_orders(cls.std_si_orders, lower=lower, upper=upper, base=base)
+        return MagnitudeSystem(cls.std_si_order, lower=lower, upper=upper, base=base)
 
 # code: language=python tabSize=4
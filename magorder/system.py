@@ -0,0 +1,543 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import math
+import operator
+import re
+from fractions import Fraction
+from typing import Any, Callable, Dict, Iterable, Optional, Pattern, Sequence, Tuple, Union
+
+from .batch import convert_many as _convert_many
+from .cache import systems
+from .exact import exact_convert, exact_converter, exact_entry, exact_policy
+from .order import MagnitudeOrder, magnitude_key
+from .ranking import RankingMixin
+from .rounding import round_value, rounding_mode
+from .types import MagOrderListSpec, MagOrderSpec, Number
+
+
+_NUMBER_PATTERN = r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?"
+_UNIT_ORDER = MagnitudeOrder("", 0)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _shared_system(cls: type, spec: Tuple[Any, ...], decimals: Optional[int], exact: Optional[str]) -> "MagnitudeSystem":
+    def build():
+        orders = [{"prefix": prefix, "power": power, "aliases": aliases, "factor": factor} for prefix, power, aliases, factor in spec[0]]
+        return cls(orders, *spec[1:], decimals=decimals, exact=exact)
+
+    return systems.get((cls,) + spec + (decimals, exact), build)
+
+
+# The lookup and conversion tables are attributes precomputed at construction, so that conversions are dict lookups
+class MagnitudeSystem(RankingMixin):  # pylint: disable=too-many-instance-attributes
+    """System allowing conversion between different magnitudes.
+
+    Orders of magnitude are powers of a base, or explicit factors for mixed-radix systems like
+    durations. Either way, conversions go through the same lazily filled table of divisors.
+
+    Systems are immutable: precision and rounding are chosen per call or per converter, never by
+    mutating a system, so one system can serve any number of threads without locks. The conversion
+    tables are filled on first use of each pair with atomic dictionary operations.
+    """
+
+    class MagnitudeDoesNotExist(ValueError):
+        """Exception for when a magnitude order passed as a parameter does not exist."""
+        def __init__(self, text: MagOrderSpec) -> None:
+            """Create the exception object.
+
+            Args:
+                text (MagOrderSpec): the invalid specification for the magnitude order.
+            """
+            super().__init__(f"Cannot find magnitude order with '{text}'")
+
+
+    class PrefixConflict(ValueError):
+        """Exception for when a magnitude order declares an alias that clashes with
+        a prefix (or alias) of another order of magnitude.
+        """
+        def __init__(self, prefix: str, alias: Optional[str] = None) -> None:
+            """Create the exception object.
+
+            Args:
+                prefix (str): prefix causing the conflict.
+                alias (Optional[str]): the offending alias, when applicable.
+            """
+            if alias is None:
+                msg = f"Magnitude order '{prefix}' conflicts with existing magnitude order"
+            else:
+                msg = f"Alias '{alias}' for magnitude order '{prefix}' conflicts with existing magnitude order"
+            super().__init__(msg)
+
+
+    def __init__(self, magnitudes_spec: MagOrderListSpec,
+                 lower: Optional[MagOrderSpec] = None,
+                 upper: Optional[MagOrderSpec] = None,
+                 base: int = 10, default: str = "",
+                 decimals: Optional[int] = None,
+                 exact: Union[None, bool, str] = None):
+        """Create an object.
+
+        Args:
+            magnitudes (MagOrderListSpec): list of dictionaries, each specifying one order of magnitude, see ``MagnitudeOrder``.
+            lower (Optional[MagOrderSpec], optional): smaller order of magnitude allowed. Defaults to the smaller one in ``magnitudes``.
+            upper (Optional[MagOrderSpec], optional): largest order of magnitude allowed. Defaults to the largest one in ``magnitudes``.
+            base (int, optional): base number used to apply the magnitude order's powers. Defaults to 10.
+            default_power (int, optional): default power of the base to be used when not specified in transformations. Defaults to 0.
+            decimals (Optional[int], optional): result is rounded to mitigate floating-point errors. Defaults to the greater of 6 and the absolute difference between the two magnitude's powers.
+            exact (Union[None, bool, str], optional): default exact policy for conversions. ``None`` or ``False`` use floating-point arithmetic. ``"fraction"`` (or ``True``), ``"floor"`` and ``"ceil"`` keep integers as integers, see ``convert()``. Defaults to ``None``.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if any of the specified lower or upper bounds does not exist.
+            self.PrefixConflict: raised if the magnitudes specs contains conflicts.
+            ValueError: raised if the exact policy is not valid.
+        """
+        mags = [MagnitudeOrder(**kw) for kw in magnitudes_spec]
+        self._spec = (tuple((m.prefix, m.power, m.aliases, m.factor) for m in mags), lower, upper, base, default)
+        key = magnitude_key(mags, base)
+        mags = self._within_bounds(sorted(mags, key=key), lower, upper, key)
+
+        self._prefix_mag_map = {}
+        for m in mags:
+            if m.prefix in self._prefix_mag_map:
+                raise self.PrefixConflict(m.prefix)
+            self._prefix_mag_map[m.prefix] = m
+            for a in m.aliases:
+                if a in self._prefix_mag_map and self._prefix_mag_map[a] != m:
+                    raise self.PrefixConflict(m.prefix, a)
+                self._prefix_mag_map[a] = m
+        self._setup(mags, key, base, default, decimals, exact)
+
+    @classmethod
+    def from_orders(cls, orders: Sequence[MagnitudeOrder],
+                    lower: Optional[MagOrderSpec] = None,
+                    upper: Optional[MagOrderSpec] = None,
+                    base: int = 10, default: str = "",
+                    decimals: Optional[int] = None,
+                    exact: Union[None, bool, str] = None) -> "MagnitudeSystem":
+        """Create an object from trusted, prebuilt orders of magnitude, like the ones of the built-in families.
+
+        The orders are neither sorted nor checked for conflicts, which makes this constructor cheaper
+        than the regular one. See the constructor for the other parameters.
+
+        Args:
+            orders (Sequence[MagnitudeOrder]): orders of magnitude sorted by factor, with no conflicting prefixes or aliases.
+
+        Raises:
+            cls.MagnitudeDoesNotExist: raised if any of the specified lower or upper bounds does not exist.
+            ValueError: raised if the exact policy is not valid.
+
+        Returns:
+            MagnitudeSystem: the new system.
+        """
+        self = cls.__new__(cls)
+        self._spec = (tuple((m.prefix, m.power, m.aliases, m.factor) for m in orders), lower, upper, base, default)
+        key = magnitude_key(orders, base)
+        mags = self._within_bounds(orders, lower, upper, key)
+        self._prefix_mag_map = {p: m for m in mags for p in (m.prefix,) + m.aliases}
+        self._setup(mags, key, base, default, decimals, exact)
+        return self
+
+    def _within_bounds(self, mags: Sequence[MagnitudeOrder], lower: Optional[MagOrderSpec], upper: Optional[MagOrderSpec],
+                       key: Callable[[MagnitudeOrder], Any]) -> Sequence[MagnitudeOrder]:
+        if lower is None and upper is None:
+            return mags
+        bounds = {}
+        for m in reversed(mags):
+            bounds[m.power] = m
+            bounds.update(dict.fromkeys(m.prefixes, m))
+        lower_key = key(self._bound(bounds, lower, mags[0]))
+        upper_key = key(self._bound(bounds, upper, mags[-1]))
+        return [m for m in mags if lower_key <= key(m) <= upper_key]
+
+    def _setup(self, mags: Sequence[MagnitudeOrder], key: Callable[[MagnitudeOrder], Any],
+               base: int, default: str, decimals: Optional[int], exact: Union[None, bool, str]) -> None:
+        self.magnitudes = tuple(mags)
+        self._key = key
+        self._key_mag_map = {}  # maps each magnitude key to its first order
+        for m in reversed(mags):
+            self._key_mag_map[key(m)] = m
+        self.base = base
+        self.default = default
+        self.decimals = decimals
+        self.exact = exact_policy(exact)
+        self._pair_table = {}
+        self._exact_table = {}
+        default_order = self._prefix_mag_map.get(default, _UNIT_ORDER)
+        scales = [self._scale(default_order, m) for m in mags]
+        self._display = tuple(m for m in mags if self._key_mag_map[key(m)] is m)
+        self._scales = [scale for m, scale in zip(mags, scales) if self._key_mag_map[key(m)] is m]
+        self._prefix_scales = {p: scale for m, scale in zip(mags, scales) for p in (m.prefix,) + m.aliases}
+        self._unit_tables = {}
+        self._unit_patterns = {}
+        self._frozen = True
+
+    def _bound(self, bounds: Dict[MagOrderSpec, MagnitudeOrder], bound: Optional[MagOrderSpec], default: MagnitudeOrder) -> MagnitudeOrder:
+        if bound is None:
+            return default
+        try:
+            return bounds[bound]
+        except (KeyError, TypeError):
+            raise self.MagnitudeDoesNotExist(bound)
+
+    def _exact_factor(self, order: MagnitudeOrder) -> Fraction:
+        return Fraction(self.base) ** order.power if order.factor is None else order.factor
+
+    def _scale(self, from_mag: MagnitudeOrder, to_mag: MagnitudeOrder) -> float:
+        if from_mag.factor is None and to_mag.factor is None:
+            return float(self.base ** (to_mag.power - from_mag.power))
+        return float(self._exact_factor(to_mag) / self._exact_factor(from_mag))
+
+    @classmethod
+    def shared(cls, magnitudes_spec: MagOrderListSpec,
+               lower: Optional[MagOrderSpec] = None,
+               upper: Optional[MagOrderSpec] = None,
+               base: int = 10, default: str = "",
+               decimals: Optional[int] = None,
+               exact: Union[None, bool, str] = None) -> "MagnitudeSystem":
+        """Return a system shared by every caller using the same configuration.
+
+        Systems are kept in the bounded ``magorder.cache.systems`` cache, so only the first call
+        with a given configuration pays for building the system. See the constructor for the parameters.
+
+        Returns:
+            MagnitudeSystem: the shared system.
+        """
+        spec_key = tuple((kw["prefix"], kw.get("power"), tuple(kw.get("aliases") or ()), kw.get("factor")) for kw in magnitudes_spec)
+        return _shared_system(cls, (spec_key, lower, upper, base, default), decimals, exact_policy(exact))
+
+    def __reduce__(self) -> Tuple[Callable[..., "MagnitudeSystem"], Tuple[Any, ...]]:
+        """Pickle the system as its configuration only. Unpickling returns the system shared in the
+        process, see ``shared()``, so the tables are built at most once per process."""
+        return (_shared_system, (type(self), self._spec, self.decimals, self.exact))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(f"Cannot set '{name}': {type(self).__name__} objects are immutable")
+        super().__setattr__(name, value)
+
+    def set_decimals(self, decimals: Optional[int] = None) -> None:
+        """Deprecated: systems are shared and immutable, use ``with_decimals()`` instead.
+
+        Args:
+            decimals (Optional[int], optional): see the constructor parameter. Defaults to None.
+
+        Raises:
+            AttributeError: always raised, pointing to ``with_decimals()``.
+        """
+        raise AttributeError(f"set_decimals({decimals!r}) is no longer supported: systems are shared and immutable, "
+                             f"use with_decimals({decimals!r}) on the system or on the unit, which returns a copy")
+
+    def with_decimals(self, decimals: Optional[int] = None) -> "MagnitudeSystem":
+        """Return a copy of this system rounding results to another number of decimals.
+
+        Args:
+            decimals (Optional[int], optional): see the constructor parameter. Defaults to None.
+
+        Returns:
+            MagnitudeSystem: the new system, sharing the magnitude orders with this one.
+        """
+        def derive():
+            other = type(self).__new__(type(self))
+            other.__dict__.update(self.__dict__)
+            other.__dict__.update(decimals=decimals, _pair_table={})
+            return other
+
+        return systems.get((type(self),) + self._spec + (decimals, self.exact), derive)
+
+    def with_exact(self, exact: Union[None, bool, str] = None) -> "MagnitudeSystem":
+        """Return a copy of this system using another default exact policy.
+
+        Args:
+            exact (Union[None, bool, str], optional): see the constructor parameter. Defaults to None.
+
+        Raises:
+            ValueError: raised if the exact policy is not valid.
+
+        Returns:
+            MagnitudeSystem: the new system, sharing the magnitude orders with this one.
+        """
+        exact = exact_policy(exact)
+
+        def derive():
+            other = type(self).__new__(type(self))
+            other.__dict__.update(self.__dict__)
+            other.__dict__.update(exact=exact)
+            return other
+
+        return systems.get((type(self),) + self._spec + (self.decimals, exact), derive)
+
+    def unit_prefixes(self, base_unit: str) -> Dict[str, str]:
+        """Return the mapping of every prefixed unit to its prefix. The mapping is computed once per base unit.
+
+        Args:
+            base_unit (str): base unit. Examples: "m", "B".
+
+        Returns:
+            Dict[str, str]: maps prefixed units to prefixes. Example: ``{"km": "k", ...}``.
+        """
+        try:
+            return self._unit_tables[base_unit]
+        except KeyError:
+            return self._unit_tables.setdefault(base_unit, {p + base_unit: p for p in self._prefix_mag_map})
+
+    def quantity_pattern(self, base_unit: str) -> Pattern:
+        """Return a regular expression matching a quantity in a unit, like ``"1.5 km"``.
+
+        Prefixes are tried longest first, so ``"dam"`` is read as decameters rather than decimeters.
+        The pattern is compiled once per base unit.
+
+        Args:
+            base_unit (str): base unit. Examples: "m", "B".
+
+        Returns:
+            Pattern: compiled pattern with the groups ``value`` and ``prefix``.
+        """
+        try:
+            return self._unit_patterns[base_unit]
+        except KeyError:
+            pass
+        prefixes = sorted(self._prefix_mag_map, key=lambda p: (-len(p), p))
+        alternation = "|".join(re.escape(p) for p in prefixes)
+        pattern = re.compile(rf"\s*(?P<value>{_NUMBER_PATTERN})\s*(?P<prefix>{alternation}){re.escape(base_unit)}\s*")
+        return self._unit_patterns.setdefault(base_unit, pattern)
+
+    def _pair(self, from_order: str, to_order: str) -> Optional[Tuple[Number, int]]:
+        """Compute the divisor and the rounding decimals between two prefixes, see ``conversion()``."""
+        from_mag, to_mag = self.magnitude_by_prefix(from_order), self.magnitude_by_prefix(to_order)
+        if from_mag.factor is None and to_mag.factor is None:
+            diff = to_mag.power - from_mag.power
+            if diff == 0:
+                return None
+            return (self.base ** diff, max(6, abs(diff)) if self.decimals is None else self.decimals)
+        ratio = self._exact_factor(to_mag) / self._exact_factor(from_mag)
+        if ratio == 1:
+            return None
+        divisor = ratio.numerator if ratio.denominator == 1 else float(ratio)
+        return (divisor, max(6, math.ceil(abs(math.log10(ratio)))) if self.decimals is None else self.decimals)
+
+    def _exact_pair(self, from_order: str, to_order: str) -> Optional[Tuple[int, int, Optional[int]]]:
+        """Compute the integer multiplier, divisor and bit shift between two prefixes, see ``exact_conversion()``."""
+        return exact_entry(self.exact_factor(from_order) / self.exact_factor(to_order))
+
+    def conversion(self, from_order: Optional[str] = None,
+                   to_order: Optional[str] = None) -> Optional[Tuple[Number, int]]:
+        """Return the conversion parameters between two magnitude orders, computed once per pair.
+
+        Args:
+            from_order (Optional[str], optional): prefix for the value's original order of magnitude. Defaults to the prefix matching the ``default_order``.
+            to_order (Optional[str], optional): prefix for the targeted order of magnitude. Defaults to the prefix matching the ``default_order``.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+
+        Returns:
+            Optional[Tuple[Number, int]]: the divisor and the rounding decimals, or ``None`` if no conversion is needed.
+        """
+        from_order = from_order if from_order else self.default
+        to_order = to_order if to_order else self.default
+        try:
+            return self._pair_table[(from_order, to_order)]
+        except KeyError:
+            return self._pair_table.setdefault((from_order, to_order), self._pair(from_order, to_order))
+
+    def magnitude_by_prefix(self, prefix: str) -> "MagnitudeOrder":
+        """Return the MagnitudeOrder object matching a prefix.
+
+        Args:
+            prefix (str): magnitude order's prefix to be matched.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if the prefix does not exist.
+
+        Returns:
+            MagnitudeOrder: the MagnitudeOrder object corresponding the specified prefix.
+        """
+        try:
+            return self._prefix_mag_map[prefix]
+        except KeyError:
+            raise self.MagnitudeDoesNotExist(prefix)
+
+    def convert(self, value: Number,
+                from_order: Optional[str] = None,
+                to_order: Optional[str] = None,
+                exact: Union[None, bool, str] = None,
+                decimals: Optional[int] = None,
+                rounding: Optional[str] = None) -> Number:
+        """Convert a value between two specified magnitude orders.
+
+        In exact mode integers stay integers when converted to a smaller order of magnitude, and
+        they are either kept as ``Fraction`` (``"fraction"``) or rounded (``"floor"``, ``"ceil"``) when
+        converted to a larger one. Other numbers are handled as ``Fraction``. No precision is lost.
+
+        Otherwise the result is a float, rounded to ``decimals`` places with the ``rounding`` mode:
+        ``"round"`` like ``round()``, ``"floor"``, ``"ceil"``, or ``"none"`` to skip rounding.
+        Values are returned unchanged when both orders share the same factor.
+
+        Args:
+            value (Number): number to be converted.
+            from_order (Optional[str], optional): prefix for the targeted order of magnitude. Defaults to the prefix matching the ``default_order``.
+            to_order (Optional[str], optional): prefix for the value's original order of magnitude. Defaults to the prefix matching the ``default_order``.
+            exact (Union[None, bool, str], optional): exact policy for this call, see the constructor parameter. Defaults to the system's policy.
+            decimals (Optional[int], optional): decimal places for this call, ignored in exact mode. Defaults to the system's ``decimals``.
+            rounding (Optional[str], optional): one of ``magorder.rounding.ROUNDING_MODES``, ignored in exact mode. Defaults to ``"round"``.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+            ValueError: raised if the exact policy or the rounding mode is not valid.
+
+        Returns:
+            Number: the value converted to
+        """
+        policy = self.exact if exact is None else exact_policy(exact)
+        if policy is not None:
+            return exact_convert(value, self.exact_conversion(from_order, to_order), policy)
+        pair = self.conversion(from_order, to_order)
+        if pair is None:
+            return value
+        if rounding is None:
+            return round(value / pair[0], pair[1] if decimals is None else decimals)
+        return round_value(value / pair[0], pair[1] if decimals is None else decimals, rounding_mode(rounding))
+
+    def exact_conversion(self, from_order: Optional[str] = None,
+                         to_order: Optional[str] = None) -> Optional[Tuple[int, int, Optional[int]]]:
+        """Return the exact conversion parameters between two magnitude orders, computed once per pair.
+
+        Args:
+            from_order (Optional[str], optional): prefix for the value's original order of magnitude. Defaults to the prefix matching the ``default_order``.
+            to_order (Optional[str], optional): prefix for the targeted order of magnitude. Defaults to the prefix matching the ``default_order``.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+
+        Returns:
+            Optional[Tuple[int, int, Optional[int]]]: the integer multiplier, the integer divisor and the bit shift equivalent to either of them when the other one is 1 (``None`` if not a power of 2), or ``None`` if no conversion is needed.
+        """
+        from_order = from_order if from_order else self.default
+        to_order = to_order if to_order else self.default
+        try:
+            return self._exact_table[(from_order, to_order)]
+        except KeyError:
+            return self._exact_table.setdefault((from_order, to_order), self._exact_pair(from_order, to_order))
+
+    def get_converter(self, from_order: Optional[str] = None,
+                      to_order: Optional[str] = None,
+                      exact: Union[None, bool, str] = None,
+                      decimals: Optional[int] = None,
+                      rounding: Optional[str] = None) -> Callable[[Number], Number]:
+        """Return a callable converting values between two specified magnitude orders.
+
+        The prefixes are resolved only once, so the returned callable is meant to be used in tight loops.
+        It yields the same results as ``convert()`` for the same pair of prefixes and options.
+
+        Args:
+            from_order (Optional[str], optional): prefix for the value's original order of magnitude. Defaults to the prefix matching the ``default_order``.
+            to_order (Optional[str], optional): prefix for the targeted order of magnitude. Defaults to the prefix matching the ``default_order``.
+            exact (Union[None, bool, str], optional): exact policy, see ``convert()``. Defaults to the system's policy.
+            decimals (Optional[int], optional): decimal places, see ``convert()``. Defaults to the system's ``decimals``.
+            rounding (Optional[str], optional): rounding mode, see ``convert()``. Defaults to ``"round"``.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+            ValueError: raised if the exact policy or the rounding mode is not valid.
+
+        Returns:
+            Callable[[Number], Number]: function taking one value and returning it converted.
+        """
+        policy = self.exact if exact is None else exact_policy(exact)
+        rounding = rounding_mode(rounding)
+        if policy is not None:
+            return exact_converter(self.exact_conversion(from_order, to_order), policy)
+        pair = self.conversion(from_order, to_order)
+        if pair is None:
+            return _identity
+        divisor, places = pair[0], pair[1] if decimals is None else decimals
+
+        if rounding == "round":
+            def converter(value: Number) -> float:
+                return round(value / divisor, places)
+        elif rounding == "none":
+            def converter(value: Number) -> float:
+                return value / divisor
+        else:
+            def converter(value: Number) -> float:
+                return round_value(value / divisor, places, rounding)
+
+        return converter
+
+    def convert_many(self, values: Iterable[Number],
+                     from_order: Union[None, str, Iterable[str]] = None,
+                     to_order: Optional[str] = None,
+                     out: Any = None) -> Any:
+        """Convert many values between magnitude orders in one pass.
+
+        NumPy arrays are converted with vectorized operations, one division and one rounding per
+        distinct origin prefix. NumPy rounds half to even, like ``round()``, but by scaling, so results
+        may differ from ``convert()`` in the last digit. Other iterables are converted element-wise,
+        yielding exactly the same values as ``convert()``.
+
+        Args:
+            values (Iterable[Number]): NumPy array, ``array.array`` or any iterable of numbers.
+            from_order (Union[None, str, Iterable[str]], optional): prefix for the values' original order of magnitude, or a sequence with one prefix per value. Defaults to the prefix matching the ``default_order``.
+            to_order (Optional[str], optional): prefix for the targeted order of magnitude. Defaults to the prefix matching the ``default_order``.
+            out (Any, optional): preallocated container (NumPy array or mutable sequence) receiving the results. It may be ``values`` itself for in-place conversion of float arrays. Defaults to ``None``.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+
+        Returns:
+            Any: ``out`` if specified, otherwise a new float64 NumPy array, an ``array.array("d")`` or a list, matching the type of ``values``.
+        """
+        return _convert_many(self, values, from_order, to_order, out, _identity)
+
+    def factor(self, prefix: str) -> Number:
+        """Return the multiplication factor for a specific prefix.
+
+        Args:
+            prefix (str): magnitude prefix for which to calculate the multiplication factor (base to the prefix's power, or its explicit factor).
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if the prefix does not exist.
+
+        Returns:
+            Number: the multiplication factor for the prefix, a float if it is not an integer.
+        """
+        m = self.magnitude_by_prefix(prefix)
+        if m.factor is not None:
+            return m.factor.numerator if m.factor.denominator == 1 else float(m.factor)
+        return self.base ** m.power
+
+    def exact_factor(self, prefix: str) -> Fraction:
+        """Return the multiplication factor for a specific prefix as an exact fraction. See ``factor()``.
+
+        Args:
+            prefix (str): magnitude prefix.
+
+        Raises:
+            self.MagnitudeDoesNotExist: raised if the prefix does not exist.
+
+        Returns:
+            Fraction: the multiplication factor for the prefix.
+        """
+        return self._exact_factor(self.magnitude_by_prefix(prefix))
+
+    def to_prefix(self, power: int) -> Optional[str]:
+        """Return the primary prefix for a specific power of base.
+
+        Args:
+            power (int): value of the power to be converted.
+
+        Returns:
+            Optional[str]: primary prefix for the specified power, or ``None`` if there's no magnitude for that value of power.
+        """
+        key = power if isinstance(self._key, operator.attrgetter) else Fraction(self.base) ** power
+        m = self._key_mag_map.get(key)
+        return None if m is None else m.prefix
+
+# code: language=python tabSize=4
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Match, Optional, Pattern, TextIO, Tuple, Union
+
+from ._numpy import is_array
+from .batch import Histogram
+from .batch import convert_many as _convert_many
+from .formatting import format_chunks, format_quantity, write_quantities
+from .system import MagnitudeSystem
+from .types import Number
+
+
+def _family_unit(cls: type, args: Tuple[Any, ...], decimals: Optional[int]) -> "MagnitudeUnit":
+    unit = cls(*args)
+    return unit if unit.mag_sys.decimals == decimals else unit.with_decimals(decimals)
+
+
+def _is_family_init(init: Callable[..., None]) -> bool:
+    """Test whether a constructor is the one of a built-in family, taking the arguments recorded in ``_args``."""
+    return getattr(init, "__module__", "").partition(".")[0] == __name__.partition(".")[0]
+
+
+def _restore_unit(cls: type, base_unit: str, mag_sys: "MagnitudeSystem") -> "MagnitudeUnit":
+    unit = cls.__new__(cls)
+    MagnitudeUnit.__init__(unit, base_unit, mag_sys)
+    return unit
+
+
+class MagnitudeUnit:
+    """Base class for magnitude-aware unit."""
+    class UnknownUnit(ValueError):
+        """Exception for when a unit passed as parameter is not known."""
+        def __init__(self, unit: str) -> None:
+            """Create the exception object.
+
+            Args:
+                unit (str): offending unit parameter.
+            """
+            super().__init__(f"Unknown unit '{unit}'")
+
+    class InvalidQuantity(ValueError):
+        """Exception for when a text cannot be parsed as a quantity of the unit."""
+        def __init__(self, text: str) -> None:
+            """Create the exception object.
+
+            Args:
+                text (str): offending text.
+            """
+            super().__init__(f"Invalid quantity '{text}'")
+
+    def __init__(self, base_unit: str, mag_sys: MagnitudeSystem):
+        """Create the object.
+
+        Args:
+            base_unit (str): base unit for this system. Examples: "m", "g".
+            mag_sys (MagnitudeSystem): magnitude system to be used with the base unit.
+        """
+        self.base_unit = base_unit
+        self.mag_sys = mag_sys
+        self._unit_prefix = mag_sys.unit_prefixes(base_unit)
+
+    def __reduce__(self) -> Tuple[Callable[..., "MagnitudeUnit"], Tuple[Any, ...], Optional[Dict[str, Any]]]:
+        """Pickle the unit compactly. Units of the built-in families are pickled as their constructor
+        arguments, other units, including subclasses with a constructor of their own, as their base unit
+        and their magnitude system, see ``MagnitudeSystem.__reduce__()``. Either way, unpickling reuses
+        the systems already built in the process."""
+        args = self.__dict__.get("_args")
+        if args is not None and _is_family_init(type(self).__init__):
+            return (_family_unit, (type(self), args, self.mag_sys.decimals), None)
+        state = {k: v for k, v in self.__dict__.items() if k not in ("base_unit", "mag_sys", "_unit_prefix")}
+        return (_restore_unit, (type(self), self.base_unit, self.mag_sys), state or None)
+
+    def with_decimals(self, decimals: Optional[int] = None) -> "MagnitudeUnit":
+        """Return a copy of this unit whose magnitude system rounds results to another number of decimals.
+
+        Args:
+            decimals (Optional[int], optional): see the ``MagnitudeSystem`` constructor parameter. Defaults to None.
+
+        Returns:
+            MagnitudeUnit: the new unit.
+        """
+        other = type(self).__new__(type(self))
+        other.__dict__.update(self.__dict__)
+        other.mag_sys = self.mag_sys.with_decimals(decimals)
+        return other
+
+    @property
+    def parser(self) -> Pattern:
+        """Regular expression matching a quantity in this unit, like ``"1.5 km"``.
+        See ``MagnitudeSystem.quantity_pattern()``.
+
+        Returns:
+            Pattern: compiled pattern with the groups ``value`` and ``prefix``.
+        """
+        return self.mag_sys.quantity_pattern(self.base_unit)
+
+    def parse(self, text: str, to_unit: Optional[str] = None) -> Number:
+        """Parse a quantity and transform it to a prefixed unit.
+
+        Args:
+            text (str): quantity made of a number and a prefixed unit, optionally separated by whitespace. Examples: "1.5 km", "300kb".
+            to_unit (Optional[str], optional): prefixed unit to transform to. Defaults to the object's base_unit.
+
+        Raises:
+            self.InvalidQuantity: raised if the text is not a valid quantity in this unit.
+            self.UnknownUnit: raised if to_unit is not recognized.
+
+        Returns:
+            Number: value in the target unit.
+        """
+        value, prefix = self.split(text)
+        return self.mag_sys.convert(value, prefix, self.prefix_of(to_unit))
+
+    def split(self, text: str) -> Tuple[Number, str]:
+        """Parse a quantity without transforming it.
+
+        Args:
+            text (str): quantity, see ``parse()``.
+
+        Raises:
+            self.InvalidQuantity: raised if the text is not a valid quantity in this unit.
+
+        Returns:
+            Tuple[Number, str]: the number, as ``int`` unless written with a decimal point or an exponent, and the prefix.
+        """
+        return self._parse_match(text, self.parser.fullmatch(text))
+
+    def parse_many(self, lines: Iterable[str], to_unit: Optional[str] = None) -> List[Number]:
+        """Parse many quantities and transform them to a prefixed unit.
+
+        The converter for each prefix is resolved only once, see ``MagnitudeSystem.get_converter()``.
+
+        Args:
+            lines (Iterable[str]): quantities, see ``parse()``.
+            to_unit (Optional[str], optional): prefixed unit to transform to. Defaults to the object's base_unit.
+
+        Raises:
+            self.InvalidQuantity: raised if any of the texts is not a valid quantity in this unit.
+            self.UnknownUnit: raised if to_unit is not recognized.
+
+        Returns:
+            List[Number]: values in the target unit.
+        """
+        to_prefix = self.prefix_of(to_unit)
+        fullmatch = self.parser.fullmatch
+        converters = {}
+        result = []
+        for text in lines:
+            value, prefix = self._parse_match(text, fullmatch(text))
+            try:
+                converter = converters[prefix]
+            except KeyError:
+                converter = converters[prefix] = self.mag_sys.get_converter(prefix, to_prefix)
+            result.append(converter(value))
+        return result
+
+    def _parse_match(self, text: str, match: Optional[Match]) -> Tuple[Number, str]:
+        if match is None:
+            raise self.InvalidQuantity(text)
+        value = match.group("value")
+        if "." in value or "e" in value or "E" in value:
+            return float(value), match.group("prefix")
+        return int(value), match.group("prefix")
+
+    def transform(self, value: Number,
+                  from_unit: Optional[str] = None,
+                  to_unit: Optional[str] = None,
+                  exact: Union[None, bool, str] = None,
+                  decimals: Optional[int] = None,
+                  rounding: Optional[str] = None) -> Number:
+        """Transform a value from one prefixed unit to another.
+
+        Args:
+            value (Number): value to be transofrmed.
+            from_unit (Optional[str], optional): prefixed unit to transform from. Defaults to the object's base_unit.
+            to_unit (Optional[str], optional): prefixed unit to transform to. Defaults to the object's base_unit.
+            exact (Union[None, bool, str], optional): exact policy, see ``MagnitudeSystem.convert()``. Defaults to the system's policy.
+            decimals (Optional[int], optional): decimal places, see ``MagnitudeSystem.convert()``. Defaults to the system's ``decimals``.
+            rounding (Optional[str], optional): rounding mode, see ``MagnitudeSystem.convert()``. Defaults to ``"round"``.
+
+        Raises:
+            self.UnknownUnit: raised if any of from_unit or to_unit is not recognized.
+
+        Returns:
+            Number: value in the target unit.
+        """
+        return self.mag_sys.convert(value=value, to_order=self.prefix_of(to_unit), from_order=self.prefix_of(from_unit),
+                                    exact=exact, decimals=decimals, rounding=rounding)
+
+    def transform_many(self, values: Iterable[Number],
+                       from_unit: Union[None, str, Iterable[str]] = None,
+                       to_unit: Optional[str] = None,
+                       out: Any = None) -> Any:
+        """Transform many values from one prefixed unit to another in one pass.
+
+        See ``MagnitudeSystem.convert_many()`` for the supported containers and rounding semantics.
+
+        Args:
+            values (Iterable[Number]): NumPy array, ``array.array`` or any iterable of numbers.
+            from_unit (Union[None, str, Iterable[str]], optional): prefixed unit to transform from, or a sequence with one unit per value. Defaults to the object's base_unit.
+            to_unit (Optional[str], optional): prefixed unit to transform to. Defaults to the object's base_unit.
+            out (Any, optional): preallocated container receiving the results. Defaults to ``None``.
+
+        Raises:
+            self.UnknownUnit: raised if any of from_unit or to_unit is not recognized.
+
+        Returns:
+            Any: ``out`` if specified, otherwise a new container with the values in the target unit.
+        """
+        return _convert_many(self.mag_sys, values, from_unit, self.prefix_of(to_unit), out, self.prefix_of)
+
+    def best_prefix(self, value: Number, from_unit: Optional[str] = None) -> str:
+        """Return the prefix best suited to display a value. See ``MagnitudeSystem.best_prefix()``.
+
+        Args:
+            value (Number): value to be displayed.
+            from_unit (Optional[str], optional): prefixed unit of the value. Defaults to the object's base_unit.
+
+        Raises:
+            self.UnknownUnit: raised if from_unit is not recognized.
+
+        Returns:
+            str: the prefix, without the base unit.
+        """
+        return self.mag_sys.best_prefix(self.transform(value, from_unit))
+
+    def humanize(self, value: Number, precision: int = 2, from_unit: Optional[str] = None) -> str:
+        """Render a value with the prefix best suited to display it.
+
+        Args:
+            value (Number): value to be displayed.
+            precision (int, optional): number of decimal places. Defaults to 2.
+            from_unit (Optional[str], optional): prefixed unit of the value. Defaults to the object's base_unit.
+
+        Raises:
+            self.UnknownUnit: raised if from_unit is not recognized.
+
+        Returns:
+            str: the rendered value. Example: ``"117.74 MiB"``.
+        """
+        return format_quantity(self, value, from_unit, precision, True)
+
+    def humanize_many(self, values: Iterable[Number], precision: int = 2,
+                      from_unit: Union[None, str, Iterable[str]] = None) -> List[str]:
+        """Render many values, each one with the prefix best suited to display it. See ``humanize()``.
+
+        The best prefixes of NumPy arrays are selected with vectorized operations.
+
+        Args:
+            values (Iterable[Number]): values to be displayed.
+            precision (int, optional): number of decimal places. Defaults to 2.
+            from_unit (Union[None, str, Iterable[str]], optional): prefixed unit of the values, or a sequence with one unit per value. Defaults to the object's base_unit.
+
+        Raises:
+            self.UnknownUnit: raised if any of the units is not recognized.
+
+        Returns:
+            List[str]: the rendered values.
+        """
+        return list(self.format_many(values, from_unit, precision))
+
+    def format(self, value: Number, unit: Optional[str] = None, precision: int = 2, auto: bool = True) -> str:
+        """Render a value as a quantity that ``parse()`` reads back.
+
+        Args:
+            value (Number): value to be rendered.
+            unit (Optional[str], optional): prefixed unit of the value. Defaults to the object's base_unit.
+            precision (int, optional): number of decimal places. Defaults to 2.
+            auto (bool, optional): render the value with the prefix best suited to display it, like ``humanize()``. Otherwise render it as it is, in ``unit``. Defaults to True.
+
+        Raises:
+            self.UnknownUnit: raised if unit is not recognized.
+            MagnitudeSystem.MagnitudeDoesNotExist: raised if the prefix of unit does not exist.
+
+        Returns:
+            str: the rendered value. Example: ``"117.74 MiB"``.
+        """
+        return format_quantity(self, value, unit, precision, auto)
+
+    def format_many(self, values: Iterable[Number], unit: Union[None, str, Iterable[str]] = None,
+                    precision: int = 2, auto: bool = True) -> Iterator[str]:
+        """Render many values, lazily. See ``format()``.
+
+        Values are read and rendered in chunks, so ``values`` may be an unbounded stream. The best
+        prefixes of each chunk, or of a whole NumPy array, are selected at once.
+
+        Args:
+            values (Iterable[Number]): values to be rendered.
+            unit (Union[None, str, Iterable[str]], optional): prefixed unit of the values, or a sequence with one unit per value. Defaults to the object's base_unit.
+            precision (int, optional): number of decimal places. Defaults to 2.
+            auto (bool, optional): render the values with their best prefixes, see ``format()``. Defaults to True.
+
+        Raises:
+            self.UnknownUnit: raised if any of the units is not recognized.
+            MagnitudeSystem.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+
+        Returns:
+            Iterator[str]: the rendered values.
+        """
+        for rendered in format_chunks(self, values, unit, precision, auto):
+            yield from rendered
+
+    def write_many(self, out: TextIO, values: Iterable[Number], unit: Union[None, str, Iterable[str]] = None,
+                   precision: int = 2, auto: bool = True, end: str = "\n") -> int:
+        """Render many values straight into a text stream, one write per chunk. See ``format_many()``.
+
+        Args:
+            out (TextIO): text stream or buffer, like a file or an ``io.StringIO``.
+            values (Iterable[Number]): values to be rendered.
+            unit (Union[None, str, Iterable[str]], optional): prefixed unit of the values, see ``format_many()``.
+            precision (int, optional): number of decimal places. Defaults to 2.
+            auto (bool, optional): render the values with their best prefixes, see ``format()``. Defaults to True.
+            end (str, optional): text written after each value. Defaults to a newline.
+
+        Raises:
+            self.UnknownUnit: raised if any of the units is not recognized.
+            MagnitudeSystem.MagnitudeDoesNotExist: raised if any of the prefixes does not exist.
+
+        Returns:
+            int: the number of values written.
+        """
+        return write_quantities(self, out, values, unit, precision, auto, end)
+
+    def histogram(self, values: Iterable[Number], from_unit: Optional[str] = None, sums: bool = False) -> Histogram:
+        """Count values per prefixed unit. See ``MagnitudeSystem.histogram()``.
+
+        Args:
+            values (Iterable[Number]): values to be counted.
+            from_unit (Optional[str], optional): unit of the values. Defaults to the object's base_unit.
+            sums (bool, optional): also sum the values per prefixed unit, in the base unit. Defaults to False.
+
+        Raises:
+            self.UnknownUnit: raised if from_unit is not recognized.
+
+        Returns:
+            Histogram: counts, and sums if requested, keyed by prefixed unit in ascending order. Example: ``{"B": 10, "KiB": 3, ...}``.
+        """
+        result = self.mag_sys.histogram(values, sums, self.prefix_of(from_unit))
+        counts = {prefix + self.base_unit: count for prefix, count in result.counts.items()}
+        if result.sums is None:
+            return Histogram(counts, None)
+        return Histogram(counts, {prefix + self.base_unit: total for prefix, total in result.sums.items()})
+
+    def sort_key(self, value: Union[str, Number], from_unit: Optional[str] = None) -> Tuple[int, int, Number]:
+        """Return a key ordering quantities in any prefixed unit. See ``MagnitudeSystem.sort_key()``.
+
+        Args:
+            value (Union[str, Number]): value, or quantity written as text (like "1.2 GiB").
+            from_unit (Optional[str], optional): prefixed unit of a numeric value. Defaults to the object's base_unit.
+
+        Raises:
+            self.UnknownUnit: raised if from_unit is not recognized.
+            self.InvalidQuantity: raised if the text is not a valid quantity in this unit.
+
+        Returns:
+            Tuple[int, int, Number]: the key.
+        """
+        if isinstance(value, str):
+            value, prefix = self.split(value)
+            return self.mag_sys.sort_key(value, prefix)
+        return self.mag_sys.sort_key(value, self.prefix_of(from_unit))
+
+    def sort_keys(self, values: Iterable[Union[str, Number]],
+                  from_unit: Union[None, str, Iterable[str]] = None) -> Any:
+        """Return the sort keys of many quantities. See ``MagnitudeSystem.sort_keys()``.
+
+        Args:
+            values (Iterable[Union[str, Number]]): values, or quantities written as text.
+            from_unit (Union[None, str, Iterable[str]], optional): prefixed unit of numeric values, or a sequence with one unit per value. Defaults to the object's base_unit.
+
+        Raises:
+            self.UnknownUnit: raised if any of the units is not recognized.
+            self.InvalidQuantity: raised if any of the texts is not a valid quantity in this unit.
+
+        Returns:
+            Any: a list of keys, or a structured NumPy array for NumPy arrays.
+        """
+        if is_array(values):
+            return self.mag_sys.sort_keys(values, self._prefixes(from_unit))
+        if from_unit is None or isinstance(from_unit, str):
+            return [self.sort_key(value, from_unit) for value in values]
+        return [self.sort_key(value, unit) for value, unit in zip(values, from_unit)]
+
+    def _prefixes(self, units: Union[None, str, Iterable[str]]) -> Union[str, List[str]]:
+        """Return the prefix of a unit, or the prefixes of a sequence of units, looking each distinct unit up once."""
+        if units is None or isinstance(units, str):
+            return self.prefix_of(units)
+        prefixes = {}  # type: Dict[str, str]
+        return [prefixes[unit] if unit in prefixes else prefixes.setdefault(unit, self.prefix_of(unit)) for unit in map(str, units)]
+
+    def prefix_of(self, unit: Optional[str] = None) -> str:
+        """Return the prefix part of a prefixed unit.
+
+        Args:
+            unit (Optional[str], optional): prefixed unit. Defaults to the object's base_unit.
+
+        Raises:
+            self.UnknownUnit: raised if the unit does not end with the base_unit.
+
+        Returns:
+            str: the prefix, without the base unit.
+        """
+        if unit is None:
+            return ""
+        try:
+            return self._unit_prefix[unit]
+        except KeyError:
+            pass
+        if not unit.endswith(self.base_unit):
+            raise self.UnknownUnit(unit)
+        return unit[:len(unit) - len(self.base_unit)]
+
+# code: language=python tabSize=4
@@ -5,4 +5,11 @@ from setuptools import setup, find_packages
 setup(name='magorder',
       version='0.20',
       packages=find_packages(),
+      python_requires='>=3.7',
+      entry_points={
+          'console_scripts': ['magorder=magorder.cli:main'],
+      },
+      extras_require={
+          'numpy': ['numpy'],
+      },
       )
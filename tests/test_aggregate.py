@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pickle
+from fractions import Fraction
+
+import pytest
+
+from magorder.aggregate import MagnitudeAccumulator, UnitAccumulator
+from magorder.data import IECDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+def test_accumulator_system():
+    acc = MagnitudeAccumulator(IECDataMagnitudeUnit("B").mag_sys)
+    acc.add(1, "Ki")
+    acc.add(512)
+    acc.update([(1, "Mi"), (2, "Ki")])
+    assert acc.count == 4
+    assert acc.total() == 1024 + 512 + 1024 * 1024 + 2048
+    assert acc.total("Ki", exact=True) == Fraction(1024 + 512 + 1024 * 1024 + 2048, 1024)
+    assert acc.total("Ki", exact="floor") == 1027
+    assert acc.mean() == (1024 + 512 + 1024 * 1024 + 2048) / 4
+    assert acc.min() == 512
+    assert acc.max("Mi") == 1
+
+def test_accumulator_no_float_error():
+    acc = MagnitudeAccumulator(StdSIMagnitudeUnit("m").mag_sys)
+    for _ in range(10):
+        acc.add(0.1, "k")
+        acc.add(100, "m")
+    assert acc.total() == 1001.0
+    assert acc.total("k") == 1.001
+
+def test_accumulator_empty():
+    acc = MagnitudeAccumulator(StdSIMagnitudeUnit("m").mag_sys)
+    assert acc.count == 0
+    assert acc.total() == 0
+    assert acc.mean() is None
+    assert acc.min() is None
+    with pytest.raises(ValueError):
+        acc.percentile(50)
+
+def test_unit_accumulator():
+    acc = UnitAccumulator(IECDataMagnitudeUnit("B"), keep_values=True)
+    acc.add_text("1.5 GiB")
+    acc.update(["512 MiB", (1, "GiB"), (1024, "KiB")])
+    assert acc.count == 4
+    assert acc.total("MiB") == 1536 + 512 + 1024 + 1
+    assert acc.total("GiB", exact=True) == Fraction(3073, 1024)
+    assert acc.min("MiB") == 1
+    assert acc.max("MiB") == 1536
+    assert acc.percentile(50, "MiB") == 768
+    assert acc.percentile(100, "MiB") == 1536
+    assert sorted(acc.values("MiB")) == [1, 512, 1024, 1536]
+    with pytest.raises(ValueError):
+        acc.add(1, "XB")
+    with pytest.raises(ValueError):
+        acc.add_text("1 XB")
+
+def test_accumulator_merge():
+    unit = IECDataMagnitudeUnit("B")
+    left, right = UnitAccumulator(unit, keep_values=True), UnitAccumulator(unit, keep_values=True)
+    left.update(["1 KiB", "2 MiB"])
+    right.update(["3 KiB", "4 GiB"])
+    right = pickle.loads(pickle.dumps(right))
+    assert left.merge(right) is left
+    assert left.count == 4
+    assert left.total("KiB") == 1 + 2048 + 3 + 4 * 1024 * 1024
+    assert left.min("KiB") == 1
+    assert left.percentile(0, "KiB") == 1
+    with pytest.raises(ValueError):
+        left.merge(MagnitudeAccumulator(StdSIMagnitudeUnit("m").mag_sys))
+    other = UnitAccumulator(unit)
+    other.add(1)
+    with pytest.raises(ValueError):
+        left.merge(other)
+
+def test_accumulator_merge_missing_order():
+    legacy = MagnitudeAccumulator(IECDataMagnitudeUnit("B", legacy=True).mag_sys)
+    legacy.update([(1, "Ki"), (1, "K")])
+    acc = MagnitudeAccumulator(IECDataMagnitudeUnit("B").mag_sys)
+    acc.add(1, "Ki")
+    with pytest.raises(ValueError, match="common order for 'K'"):
+        acc.merge(legacy)
+    assert acc.count == 1
+    assert acc.total("Ki") == 1
+
+# code: language=python tabSize=4
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from magorder.aio import Record, convert_batches, convert_lines
+from magorder.data import IECDataMagnitudeUnit
+
+
+UNIT = IECDataMagnitudeUnit("B")
+
+
+async def _collect(records):
+    return [record async for record in records]
+
+
+async def _lines(texts, read=None):
+    for text in texts:
+        if read is not None:
+            read.append(text)
+        yield text
+        await asyncio.sleep(0)
+
+
+def test_convert_stream_reader():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"1 KiB\n2 MiB\r\n")
+        reader.feed_data(b"512 B")
+        reader.feed_eof()
+        return await _collect(convert_lines(UNIT, reader, "KiB"))
+
+    assert asyncio.run(run()) == [Record("1 KiB", 1), Record("2 MiB", 2048), Record("512 B", 0.5)]
+
+def test_convert_columns_and_errors():
+    lines = ["a\t1 KiB", "b\tnone", "c"]
+    records = asyncio.run(_collect(convert_lines(UNIT, _lines(lines), column=1, on_error="keep")))
+    assert records == [Record("a\t1 KiB", 1024), Record("b\tnone", None), Record("c", None)]
+    records = asyncio.run(_collect(convert_lines(UNIT, _lines(lines), column=1, on_error="skip")))
+    assert records == [Record("a\t1 KiB", 1024)]
+    with pytest.raises(UNIT.InvalidQuantity):
+        asyncio.run(_collect(convert_lines(UNIT, _lines(lines), column=1)))
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(convert_lines(UNIT, _lines(lines), on_error="ignore")))
+    with pytest.raises(UNIT.UnknownUnit):
+        asyncio.run(_collect(convert_lines(UNIT, _lines(lines), "m")))
+
+def test_micro_batches():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"1 KiB\n" * 10)
+        reader.feed_eof()
+        return [len(batch) async for batch in convert_batches(UNIT, reader, batch_size=4)]
+
+    assert asyncio.run(run()) == [4, 4, 2]
+
+def test_offload():
+    lines = [f"{i} KiB" for i in range(100)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        records = asyncio.run(_collect(convert_lines(UNIT, _lines(lines), "KiB", executor=executor, offload_size=1)))
+    assert [record.value for record in records] == list(range(100))
+
+def test_backpressure():
+    read = []
+
+    async def run():
+        records = convert_lines(UNIT, _lines([f"{i} B" for i in range(1000)], read), batch_size=2, max_pending=10)
+        first = await records.__anext__()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        await records.aclose()
+        return first
+
+    assert asyncio.run(run()) == Record("0 B", 0)
+    assert len(read) <= 13
+
+def test_reader_errors():
+    async def failing():
+        yield "1 B"
+        raise OSError("connection reset")
+
+    with pytest.raises(OSError):
+        asyncio.run(_collect(convert_lines(UNIT, failing())))
+
+    async def partial():
+        received = []
+        with pytest.raises(OSError):
+            async for record in convert_lines(UNIT, failing()):
+                received.append(record)
+        return received
+
+    assert asyncio.run(partial()) == [Record("1 B", 1)]
+
+# code: language=python tabSize=4
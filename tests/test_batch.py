@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import array
+
+import pytest
+
+from magorder.data import IECDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+def test_transform_many_list():
+    mag = StdSIMagnitudeUnit("m")
+    assert mag.transform_many([0.1, 1, 2.5], "km") == [100, 1000, 2500]
+    assert mag.transform_many([100_000_000], "µm", "km") == [0.1]
+    assert mag.transform_many(iter([1, 2])) == [1, 2]
+
+def test_transform_many_array():
+    mag = IECDataMagnitudeUnit("B")
+    result = mag.transform_many(array.array("q", [1, 2, 3]), "KiB")
+    assert isinstance(result, array.array)
+    assert list(result) == [1024, 2048, 3072]
+
+def test_transform_many_out():
+    mag = IECDataMagnitudeUnit("B")
+    out = [None] * 3
+    assert mag.transform_many([1, 2, 3], "MiB", "KiB", out=out) is out
+    assert out == [1024, 2048, 3072]
+
+def test_transform_many_per_element_units():
+    mag = IECDataMagnitudeUnit("B")
+    values = [1, 1, 2048, 3]
+    units = ["KiB", "MiB", "B", "KiB"]
+    assert mag.transform_many(values, units, "KiB") == [1, 1024, 2, 3]
+    assert mag.transform_many(values, units) == [mag.transform(v, u) for v, u in zip(values, units)]
+
+def test_transform_many_invalid_units():
+    mag = StdSIMagnitudeUnit("m")
+    with pytest.raises(ValueError):
+        mag.transform_many([1, 2], "xxm")
+    with pytest.raises(ValueError):
+        mag.transform_many([1, 2], ["km", "nee"])
+
+def test_convert_many_numpy():
+    numpy = pytest.importorskip("numpy")
+    ms = StdSIMagnitudeUnit("m").mag_sys
+    values = numpy.array([0.1, 1, 2.5])
+    result = ms.convert_many(values, "k")
+    assert result.tolist() == [100, 1000, 2500]
+    assert ms.convert_many(values).tolist() == values.tolist()
+
+def test_transform_many_numpy_out():
+    numpy = pytest.importorskip("numpy")
+    mag = IECDataMagnitudeUnit("B")
+    values = numpy.array([1024.0, 2048.0, 4096.0])
+    result = mag.transform_many(values, "KiB", "MiB", out=values)
+    assert result is values
+    assert values.tolist() == [1, 2, 4]
+
+def test_transform_many_numpy_per_element_units():
+    numpy = pytest.importorskip("numpy")
+    mag = IECDataMagnitudeUnit("B")
+    values = numpy.array([1, 1, 2048, 3])
+    units = numpy.array(["KiB", "MiB", "B", "KiB"])
+    assert mag.transform_many(values, units, "KiB").tolist() == [1, 1024, 2, 3]
+
+# code: language=python tabSize=4
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import array
+
+import pytest
+
+from magorder import buffers
+from magorder.buffers import convert_buffer, convert_file
+from magorder.data import IECDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(buffers, "load_numpy", lambda: None)
+    return request.param
+
+
+def test_convert_buffer_in_place(backend):
+    mag_sys = StdSIMagnitudeUnit("s").mag_sys
+    values = array.array("d", [1.5, 2000, -3])
+    assert convert_buffer(mag_sys, values, "m", "", chunk_size=2) is values
+    assert list(values) == [0.0015, 2.0, -0.003]
+
+def test_convert_buffer_bytes(backend):
+    mag_sys = IECDataMagnitudeUnit("B").mag_sys
+    source = bytes(array.array("q", [1, 1024, 1025, -1]))
+    out = bytearray(len(source))
+    convert_buffer(mag_sys, source, "", "Ki", out, typecode="q", chunk_size=3)
+    assert list(memoryview(out).cast("q")) == [0, 1, 1, -1]
+    convert_buffer(mag_sys, source, "", "Ki", out, typecode="q", exact="ceil")
+    assert list(memoryview(out).cast("q")) == [1, 1, 2, 0]
+    convert_buffer(mag_sys, out, "Ki", "", typecode="q")
+    assert list(memoryview(out).cast("q")) == [1024, 1024, 2048, 0]
+
+def test_convert_buffer_large_factors(backend):
+    mag_sys = IECDataMagnitudeUnit("B").mag_sys
+    for to_order in ("Zi", "Yi"):
+        values = array.array("q", [1, 1 << 40, 0, -1])
+        convert_buffer(mag_sys, values, "", to_order, exact="ceil")
+        assert list(values) == [1, 1, 0, 0]
+        values = array.array("q", [1, 1 << 40, 0, -1])
+        convert_buffer(mag_sys, values, "", to_order)
+        assert list(values) == [0, 0, 0, -1]
+    values = array.array("q", [0, 1])
+    with pytest.raises(OverflowError):
+        convert_buffer(mag_sys, values, "Yi", "")
+
+@pytest.mark.parametrize("typecode, to_order", [("h", "Gi"), ("i", "Ti"), ("H", "Mi"), ("I", "Ti")])
+def test_convert_buffer_small_items(backend, typecode, to_order):
+    mag_sys = IECDataMagnitudeUnit("B").mag_sys
+    signed = typecode.islower()
+    items = [1, 2, -3] if signed else [1, 2, 3]
+    values = array.array(typecode, items)
+    convert_buffer(mag_sys, values, "", to_order)
+    assert list(values) == ([0, 0, -1] if signed else [0, 0, 0])
+    values = array.array(typecode, items)
+    convert_buffer(mag_sys, values, "", to_order, exact="ceil")
+    assert list(values) == ([1, 1, 0] if signed else [1, 1, 1])
+    values = array.array(typecode, [1, 2, 3])
+    convert_buffer(mag_sys, values, "Ki", "")
+    assert list(values) == [1024, 2048, 3072]
+
+def test_convert_buffer_errors(backend):
+    mag_sys = StdSIMagnitudeUnit("s").mag_sys
+    with pytest.raises(TypeError):
+        convert_buffer(mag_sys, bytes(8), typecode="d")
+    with pytest.raises(ValueError):
+        convert_buffer(mag_sys, bytearray(12), typecode="d")
+    with pytest.raises(ValueError):
+        convert_buffer(mag_sys, bytearray(8), typecode="u")
+    with pytest.raises(ValueError):
+        convert_buffer(mag_sys, array.array("d", [1]), out=array.array("d", [1, 2]))
+    with pytest.raises(ValueError):
+        convert_buffer(mag_sys, array.array("q", [1]), exact="fraction")
+    with pytest.raises(mag_sys.MagnitudeDoesNotExist):
+        convert_buffer(mag_sys, array.array("d", [1]), "x")
+
+def test_convert_buffer_numpy():
+    numpy = pytest.importorskip("numpy")
+    mag_sys = StdSIMagnitudeUnit("s").mag_sys
+    values = numpy.arange(10, dtype=numpy.float64)
+    convert_buffer(mag_sys, values, "k", "", chunk_size=4)
+    assert values.tolist() == [x * 1000.0 for x in range(10)]
+
+def test_convert_file(backend, tmp_path):
+    mag_sys = IECDataMagnitudeUnit("B").mag_sys
+    path, out_path = tmp_path / "sizes.bin", tmp_path / "out.bin"
+    path.write_bytes(bytes(array.array("d", [512.0, 1536.0] * 1000)))
+    assert convert_file(mag_sys, str(path), "d", "", "Ki", str(out_path), chunk_size=300) == 2000
+    assert array.array("d", out_path.read_bytes()) == array.array("d", [0.5, 1.5] * 1000)
+    assert convert_file(mag_sys, str(path), "d", "", "Ki") == 2000
+    assert path.read_bytes() == out_path.read_bytes()
+
+def test_convert_file_same_output(backend, tmp_path):
+    mag_sys = IECDataMagnitudeUnit("B").mag_sys
+    path = tmp_path / "sizes.bin"
+    path.write_bytes(bytes(array.array("d", [512.0, 1536.0])))
+    assert convert_file(mag_sys, str(path), "d", "", "Ki", out_path=str(path)) == 2
+    assert array.array("d", path.read_bytes()) == array.array("d", [0.5, 1.5])
+    assert convert_file(mag_sys, str(path), "d", "Ki", "", out_path=str(tmp_path / "." / "sizes.bin")) == 2
+    assert array.array("d", path.read_bytes()) == array.array("d", [512.0, 1536.0])
+
+def test_convert_file_empty(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    assert convert_file(StdSIMagnitudeUnit("s").mag_sys, str(path), "d", "m") == 0
+    path.write_bytes(b"\0" * 5)
+    with pytest.raises(ValueError):
+        convert_file(StdSIMagnitudeUnit("s").mag_sys, str(path), "d", "m")
+
+# code: language=python tabSize=4
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from magorder.base import MagnitudeSystem
+from magorder.cache import SystemCache
+from magorder.data import SIDataMagnitudeUnit, IECDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+def test_units_share_systems():
+    assert StdSIMagnitudeUnit("m").mag_sys is StdSIMagnitudeUnit("g").mag_sys
+    assert StdSIMagnitudeUnit("m").mag_sys is not StdSIMagnitudeUnit("m", lower="m").mag_sys
+    assert SIDataMagnitudeUnit("b").mag_sys is SIDataMagnitudeUnit("B").mag_sys
+    assert IECDataMagnitudeUnit("B", case=False).mag_sys is IECDataMagnitudeUnit("b", case=False).mag_sys
+    assert IECDataMagnitudeUnit("B", case=False).mag_sys is not IECDataMagnitudeUnit("B").mag_sys
+    assert IECDataMagnitudeUnit("B", legacy=True).mag_sys is not IECDataMagnitudeUnit("B").mag_sys
+
+def test_shared_user_spec():
+    spec = [
+        {"prefix": "", "power": 0},
+        {"prefix": "k", "power": 1},
+    ]
+    ms = MagnitudeSystem.shared(spec, base=1000)
+    assert ms is MagnitudeSystem.shared(list(spec), base=1000)
+    assert ms is not MagnitudeSystem.shared(spec, base=1024)
+    assert ms.convert(1, "k") == 1000
+
+def test_system_immutable():
+    ms = StdSIMagnitudeUnit("m").mag_sys
+    with pytest.raises(AttributeError):
+        ms.decimals = 3
+    with pytest.raises(AttributeError):
+        ms.base = 2
+
+def test_with_decimals():
+    mag = StdSIMagnitudeUnit("m")
+    rounded = mag.with_decimals(1)
+    assert rounded.mag_sys is not mag.mag_sys
+    assert rounded.transform(1234, "mm", "km") == 0.0
+    assert mag.transform(1234, "mm", "km") == 0.001234
+
+def test_subclass_systems():
+    class Meter(StdSIMagnitudeUnit):
+        std_si_orders = tuple(m for m in StdSIMagnitudeUnit.std_si_orders if m.prefix != "c")
+
+    class Byte(SIDataMagnitudeUnit):
+        si_orders = SIDataMagnitudeUnit.si_orders[:3]
+
+    assert Meter("m", lower="m").mag_sys is not StdSIMagnitudeUnit("m", lower="m").mag_sys
+    assert StdSIMagnitudeUnit("m", lower="m").transform(1, "cm") == 0.01
+    assert Byte("B").mag_sys is not SIDataMagnitudeUnit("B").mag_sys
+    assert SIDataMagnitudeUnit("B").transform(1, "GB") == 1_000_000_000
+    assert [m.prefix for m in Byte("B").mag_sys.magnitudes] == ["", "k", "M"]
+
+def test_system_cache_eviction():
+    cache = SystemCache(maxsize=2)
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("b", lambda: 2) == 2
+    assert cache.get("a", lambda: 10) == 1
+    assert cache.get("c", lambda: 3) == 3
+    assert len(cache) == 2
+    assert "a" in cache
+    assert "b" not in cache
+    cache.clear()
+    assert len(cache) == 0
+
+# code: language=python tabSize=4
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import importlib.util
+import json
+import os
+import pickle
+import stat
+
+import pytest
+
+from magorder import catalog as catalog_module
+from magorder.base import MagnitudeSystem
+from magorder.catalog import CACHE_SUFFIX, UnitCatalog
+
+
+SPEC = {
+    "families": {
+        "packets": {
+            "unit": "pkt",
+            "orders": [
+                {"prefix": "M", "power": 6},
+                {"prefix": "", "power": 0},
+                {"prefix": "k", "power": 3, "aliases": ["K"]},
+            ],
+        },
+        "credits": {
+            "unit": "cr",
+            "upper": "doz",
+            "orders": [
+                {"prefix": "", "power": 0},
+                {"prefix": "gross", "factor": 144},
+                {"prefix": "doz", "factor": 12},
+            ],
+        },
+    },
+}
+
+
+def _spec_file(tmp_path, spec=None):
+    path = tmp_path / "units.json"
+    path.write_text(json.dumps(spec or SPEC))
+    return str(path)
+
+
+def test_compile():
+    catalog = UnitCatalog.compile(SPEC)
+    assert sorted(catalog) == ["credits", "packets"]
+    packets = catalog["packets"]
+    assert packets is catalog["packets"]
+    assert [m.prefix for m in packets.mag_sys.magnitudes] == ["", "k", "M"]
+    assert packets.parse("1.5 Kpkt", "pkt") == 1500
+    assert [m.prefix for m in catalog["credits"].mag_sys.magnitudes] == ["", "doz"]
+    assert catalog["credits"].transform(3, "dozcr", "cr") == 36
+
+
+@pytest.mark.parametrize("spec", [
+    [],
+    {"families": []},
+    {"families": {"x": []}},
+    {"families": {"x": {"unit": "x"}}},
+    {"families": {"x": {"unit": "x", "orders": [], "colour": "red"}}},
+    {"families": {"x": {"unit": "x", "orders": [{"prefix": "k", "power": 3}], "base": "ten"}}},
+    {"families": {"x": {"unit": "x", "orders": [{"prefix": "k", "power": 3, "size": 1}]}}},
+    {"families": {"x": {"unit": "x", "orders": [{"prefix": "k", "power": 3}, {"prefix": "k", "power": 6}]}}},
+    {"families": {"x": {"unit": "x", "orders": [{"prefix": "k", "power": 3}], "upper": "M"}}},
+])
+def test_invalid_spec(spec):
+    with pytest.raises(UnitCatalog.InvalidSpec):
+        UnitCatalog.compile(spec)
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_load_cached(tmp_path, monkeypatch, use_mmap):
+    path = _spec_file(tmp_path)
+    catalog = UnitCatalog.load(path, use_mmap=use_mmap)
+    assert (tmp_path / ("units.json" + CACHE_SUFFIX)).exists()
+
+    def fail(*args):
+        raise AssertionError("the spec was compiled again")
+
+    monkeypatch.setattr(catalog_module, "parse_spec", fail)
+    cached = UnitCatalog.load(path, use_mmap=use_mmap)
+    assert cached.families == catalog.families
+    assert cached["packets"].mag_sys is catalog["packets"].mag_sys
+    assert cached["credits"].transform(1, "dozcr", "cr") == 12
+
+
+def test_load_rebuilds(tmp_path):
+    path = _spec_file(tmp_path)
+    cache_path = path + CACHE_SUFFIX
+    assert UnitCatalog.load(path)["packets"].mag_sys.base == 10
+
+    spec = json.loads(json.dumps(SPEC))
+    spec["families"]["packets"]["base"] = 2
+    _spec_file(tmp_path, spec)
+    assert UnitCatalog.load(path)["packets"].mag_sys.base == 2
+    assert UnitCatalog.load(path)["packets"].transform(1, "kpkt", "pkt") == 8
+
+    with open(cache_path, "r+b") as cache_file:
+        cache_file.truncate(40)
+    assert UnitCatalog.load(path, use_mmap=True)["packets"].transform(1, "kpkt", "pkt") == 8
+
+
+def test_load_other_python(tmp_path, monkeypatch):
+    path = _spec_file(tmp_path)
+    UnitCatalog.load(path)
+    monkeypatch.setattr(importlib.util, "MAGIC_NUMBER", b"\x00\x00\r\n")
+    compiled = []
+    monkeypatch.setattr(catalog_module, "parse_spec", lambda *args: compiled.append(args) or json.loads(json.dumps(SPEC)))
+    assert UnitCatalog.load(path)["packets"].transform(1, "kpkt", "pkt") == 1000
+    assert len(compiled) == 1
+    UnitCatalog.load(path)
+    assert len(compiled) == 1
+
+
+def test_cache_mode(tmp_path):
+    path = _spec_file(tmp_path)
+    UnitCatalog.load(path)
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(path + CACHE_SUFFIX).st_mode) == 0o666 & ~umask
+
+
+def test_write_cache_cleanup(tmp_path, monkeypatch):
+    path = _spec_file(tmp_path)
+
+    def fail(*args):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(os, "replace", fail)
+    monkeypatch.setattr(os, "unlink", fail)
+    assert len(UnitCatalog.load(path)) == 2
+    assert not (tmp_path / ("units.json" + CACHE_SUFFIX)).exists()
+
+
+def test_load_cache_path(tmp_path):
+    path = _spec_file(tmp_path)
+    cache_path = str(tmp_path / "missing" / "units.magc")
+    assert len(UnitCatalog.load(path, cache_path=cache_path)) == 2
+    cache_path = str(tmp_path / "units.magc")
+    UnitCatalog.load(path, cache_path=cache_path)
+    assert (tmp_path / "units.magc").exists()
+
+
+def test_load_toml(tmp_path):
+    pytest.importorskip("tomllib")
+    path = tmp_path / "units.toml"
+    path.write_text('[families.packets]\nunit = "pkt"\norders = [{prefix = "", power = 0}, {prefix = "k", power = 3}]\n')
+    assert UnitCatalog.load(str(path))["packets"].transform(2, "kpkt", "pkt") == 2000
+
+    path.write_text("[families\n")
+    with pytest.raises(UnitCatalog.InvalidSpec):
+        UnitCatalog.load(str(path))
+
+
+def test_pickle():
+    unit = UnitCatalog.compile(SPEC)["credits"]
+    clone = pickle.loads(pickle.dumps(unit))
+    assert clone.mag_sys is unit.mag_sys
+    assert isinstance(clone.mag_sys, MagnitudeSystem)
+
+# code: language=python tabSize=4
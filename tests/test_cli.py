@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from magorder.cli import chunked, main
+
+
+@pytest.fixture
+def quantities(tmp_path):
+    path = tmp_path / "quantities.csv"
+    path.write_text("host,used\na,1.5 GiB\nb,300 KiB\nc,2048B\n", encoding="utf-8")
+    return str(path)
+
+
+def test_chunked():
+    assert list(chunked(iter("abcde"), 2)) == [["a", "b"], ["c", "d"], ["e"]]
+    assert not list(chunked([], 2))
+
+def test_cli_convert_column(quantities, capsys):
+    assert main(["-f", "iec", "-u", "B", "-t", "KiB", "-c", "2", "-d", ",", "--on-error", "keep", quantities]) == 0
+    assert capsys.readouterr().out == "host,used\na,1572864.0\nb,300\nc,2.0\n"
+
+def test_cli_humanize_jobs(quantities, capsys):
+    args = ["-f", "iec", "-u", "B", "-H", "-c", "2", "-d", ",", "--on-error", "empty", "--chunk-lines", "1", "-j", "2", quantities]
+    assert main(args) == 0
+    assert capsys.readouterr().out == "host,\na,1.50 GiB\nb,300.00 KiB\nc,2.00 KiB\n"
+
+def test_cli_whole_line(tmp_path, capsys):
+    path = tmp_path / "lengths.txt"
+    path.write_text("1 km\n12 µm\n", encoding="utf-8")
+    assert main(["-u", "m", "-t", "mm", str(path)]) == 0
+    assert capsys.readouterr().out == "1000000.0\n0.012\n"
+
+def test_cli_invalid(quantities, capsys):
+    assert main(["-f", "iec", "-u", "B", "-c", "2", "-d", ",", quantities]) == 1
+    assert "Invalid quantity 'used'" in capsys.readouterr().err
+    assert main(["-u", "m", "-t", "xx", quantities]) == 1
+    with pytest.raises(SystemExit):
+        main(["-u", "m", "--legacy"])
+
+# code: language=python tabSize=4
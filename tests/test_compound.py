@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import array
+import pickle
+from fractions import Fraction
+
+import pytest
+
+from magorder.base import MagnitudeUnit
+from magorder.compound import CompoundUnit, DataRateUnit
+from magorder.duration import TimeMagnitudeUnit
+from magorder.registry import UnitRegistry
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+def test_data_rate_convert():
+    rate = DataRateUnit()
+    assert rate.convert(1, "MiB/s", "Gbps") == pytest.approx(0.008388608)
+    assert rate.exact_factor("MiB/s", "Mbps") == Fraction(1048576 * 8, 1_000_000)
+    assert rate.convert(1, "kB/ms", "MB/s") == 1
+    assert rate.convert(1, "GB/s", "Gb/s") == 8
+    assert rate.convert(60, "KiB/min", "KiB/s") == 1
+    assert rate.get_converter("Gbps", "MB/s")(1.5) == 187.5
+    assert rate.parse("1.5 Gbps", "MB/s") == 187.5
+    assert rate.factor("MiB/s", "Gbps") is rate.factor("MiB/s", "Gbps")
+
+def test_data_rate_convert_many():
+    rate = DataRateUnit()
+    assert rate.convert_many([1, 2], "GB/s", "Gbps") == [8, 16]
+    assert rate.convert_many(array.array("d", [1]), "B/ms", "kB/s") == array.array("d", [1])
+    out = [0, 0]
+    assert rate.convert_many((1, 2), "B/s", "bps", out) is out and out == [8, 16]
+
+def test_data_rate_convert_many_numpy():
+    numpy = pytest.importorskip("numpy")
+    rate = DataRateUnit()
+    values = numpy.array([1.0, 2.0])
+    assert rate.convert_many(values, "B/s", "kbps", out=values) is values
+    assert values.tolist() == [0.008, 0.016]
+
+def test_compound_errors():
+    rate = DataRateUnit()
+    with pytest.raises(MagnitudeUnit.UnknownUnit):
+        rate.convert(1, "XB/s", "B/s")
+    with pytest.raises(MagnitudeUnit.UnknownUnit):
+        rate.convert(1, "MiB", "B/s")
+    with pytest.raises(MagnitudeUnit.InvalidQuantity):
+        rate.parse("fast", "B/s")
+    speed = CompoundUnit([StdSIMagnitudeUnit("m"), StdSIMagnitudeUnit("B")], [TimeMagnitudeUnit()])
+    assert speed.convert(36, "km/h", "m/s") == 10
+    with pytest.raises(UnitRegistry.IncompatibleUnits):
+        speed.convert(1, "m/s", "B/s")
+
+def test_compound_pickle():
+    rate = pickle.loads(pickle.dumps(DataRateUnit()))
+    assert rate.convert(1, "GB/s", "Gbps") == 8
+
+# code: language=python tabSize=4
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from magorder.base import MagnitudeSystem, MagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+OPTIONS = [(None, None), (2, "round"), (1, "floor"), (3, "ceil"), (None, "none"), (0, None)]
+
+
+def test_shared_systems_are_immutable():
+    mag_sys = StdSIMagnitudeUnit("m").mag_sys
+    with pytest.raises(AttributeError):
+        mag_sys.decimals = 2
+    with pytest.raises(AttributeError):
+        mag_sys.set_decimals(2)
+    assert mag_sys.decimals is None
+
+def test_transform_from_threads():
+    # a system of its own, so the threads race to fill its tables
+    unit = MagnitudeUnit("m", MagnitudeSystem(StdSIMagnitudeUnit.std_si_order))
+    prefixes = [m.prefix for m in unit.mag_sys.magnitudes]
+    rng = random.Random(42)
+    tasks = [(rng.uniform(-1e6, 1e6), rng.choice(prefixes) + "m", rng.choice(prefixes) + "m", rng.choice(OPTIONS)) for _ in range(20_000)]
+
+    def run(task):
+        value, from_unit, to_unit, (decimals, rounding) = task
+        return unit.transform(value, from_unit, to_unit, decimals=decimals, rounding=rounding)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(run, tasks, chunksize=50))
+    assert results == [run(task) for task in tasks]
+
+# code: language=python tabSize=4
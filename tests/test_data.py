@@ -4,8 +4,11 @@
 # GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from fractions import Fraction
+
 import pytest
 
+from magorder.base import MagnitudeSystem
 from magorder.data import SIDataMagnitudeUnit, IECDataMagnitudeUnit
 
 
@@ -36,4 +39,53 @@ def test_iec_data_case_insensitive():
     assert mags.transform(1, "Kibps") == 1024
     assert mags.transform(8192, from_unit="Mibps", to_unit="gibps") == 8
 
+def test_iec_data_exact():
+    mags = IECDataMagnitudeUnit("B", exact=True)
+    big = 2 ** 60 + 1
+    assert mags.transform(big, "PiB", "B") == big * 2 ** 50
+    assert isinstance(mags.transform(big, "PiB", "B"), int)
+    assert mags.transform(3 * 2 ** 20, "B", "MiB") == 3
+    assert mags.transform(big, "B", "KiB") == Fraction(big, 1024)
+    assert mags.transform(1.5, "KiB") == 1536
+    assert mags.transform(1, "KiB", exact=False) == 1024.0
+
+def test_iec_data_exact_rounding():
+    mags = IECDataMagnitudeUnit("B")
+    assert mags.transform(1025, "B", "KiB", exact="floor") == 1
+    assert mags.transform(1025, "B", "KiB", exact="ceil") == 2
+    assert mags.transform(-1025, "B", "KiB", exact="floor") == -2
+    assert mags.transform(-1025, "B", "KiB", exact="ceil") == -1
+    with pytest.raises(ValueError):
+        mags.transform(1, "KiB", exact="nearest")
+
+def test_si_data_exact():
+    mags = SIDataMagnitudeUnit("B", exact="floor")
+    big = 10 ** 21 + 999
+    assert mags.transform(big, "B", "kB") == big // 1000
+    assert mags.transform(big, "PB", "B") == big * 10 ** 15
+    assert mags.transform(1999, "B", "kB", exact="ceil") == 2
+    assert mags.transform(1999, "B", "kB", exact="fraction") == Fraction(1999, 1000)
+
+def test_data_exact_converter():
+    ms = IECDataMagnitudeUnit("B").mag_sys
+    for from_order, to_order in (("Ki", ""), ("Gi", "Ki"), ("", "Mi"), ("Ki", "Ki")):
+        for policy in ("fraction", "floor", "ceil"):
+            converter = ms.get_converter(from_order, to_order, exact=policy)
+            for value in (0, 1, 1023, 1024, 2 ** 70 + 3, -5, Fraction(3, 2), 2.5):
+                assert converter(value) == ms.convert(value, from_order, to_order, exact=policy)
+
+def test_data_subclass_order_lists():
+    class QuettaSIDataUnit(SIDataMagnitudeUnit):
+        si_order = SIDataMagnitudeUnit.si_order + [{"prefix": "Q", "power": 10}]
+
+    class RobiIECDataUnit(IECDataMagnitudeUnit):
+        iec_order = IECDataMagnitudeUnit.iec_order + [{"prefix": "Ri", "power": 9}]
+
+    assert QuettaSIDataUnit("B").transform(1, "QB", "YB") == 1_000_000
+    assert RobiIECDataUnit("B").transform(1, "RiB", "YiB") == 1024
+    assert RobiIECDataUnit("B", case=False).transform(1, "riB", "yiB") == 1024
+    assert RobiIECDataUnit("B", legacy=True).transform(1, "RiB", "GB") == 1024 ** 6
+    with pytest.raises(MagnitudeSystem.MagnitudeDoesNotExist):
+        IECDataMagnitudeUnit("B").transform(1, "RiB")
+
 # code: language=python tabSize=4
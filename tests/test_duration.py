@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import array
+import pickle
+from fractions import Fraction
+
+import pytest
+
+from magorder.aggregate import UnitAccumulator
+from magorder.base import MagnitudeOrder, MagnitudeSystem
+from magorder.buffers import convert_buffer
+from magorder.duration import TimeMagnitudeUnit
+
+
+def test_time_transform():
+    t = TimeMagnitudeUnit()
+    assert t.transform(90, "min", "h") == 1.5
+    assert t.transform(1, "d", "min") == 1440
+    assert t.transform(1500, "ms", "min") == 0.025
+    assert t.transform(2, "w") == 1209600
+    assert t.transform(3, "us", "ns") == 3000
+    assert t.parse("90min", "h") == 1.5
+    assert t.parse("1.5 h") == 5400
+
+def test_time_exact():
+    t = TimeMagnitudeUnit(exact="floor")
+    assert t.transform(100, "s", "min") == 1
+    assert t.transform(100, "s", "min", exact="ceil") == 2
+    assert t.transform(1, "ms", "min", exact=True) == Fraction(1, 60000)
+    assert t.transform(90, "min", "h", exact=True) == Fraction(3, 2)
+    assert t.transform(1, "h", "ms") == 3_600_000
+    assert t.mag_sys.exact_conversion("ms", "min") == (1, 60000, None)
+    assert t.mag_sys.get_converter("min", "h", exact="floor")(150) == 2
+
+def test_time_display():
+    t = TimeMagnitudeUnit()
+    assert t.humanize(5400) == "1.50 h"
+    assert t.humanize(0.0025) == "2.50 ms"
+    assert t.humanize(90, from_unit="d") == "12.86 w"
+    assert t.mag_sys.best_prefix_many([0, 59, 61, 7200]) == ["s", "s", "min", "h"]
+    assert sorted(["1 h", "59 min", "3601 s", "1 d"], key=t.sort_key) == ["59 min", "1 h", "3601 s", "1 d"]
+    assert t.histogram([1, 100, 4000]).counts == {"ns": 0, "µs": 0, "ms": 0, "s": 1, "min": 1, "h": 1, "d": 0, "w": 0}
+
+def test_time_bounds_and_pickle():
+    t = TimeMagnitudeUnit(lower="s", upper="h")
+    assert [m.prefix for m in t.mag_sys.magnitudes] == ["s", "min", "h"]
+    assert pickle.loads(pickle.dumps(t)).mag_sys is t.mag_sys
+    with pytest.raises(t.mag_sys.MagnitudeDoesNotExist):
+        t.transform(1, "d")
+
+def test_time_buffer():
+    t = TimeMagnitudeUnit()
+    values = array.array("q", [59_999, 60_000, 90_000])
+    convert_buffer(t.mag_sys, values, "ms", "min")
+    assert list(values) == [0, 1, 1]
+
+def test_time_accumulator():
+    acc = UnitAccumulator(TimeMagnitudeUnit())
+    acc.update(["90 min", "30 min", "1 h"])
+    assert acc.total("h") == 3
+    assert acc.total("min", exact=True) == 180
+
+def test_factor_orders():
+    system = MagnitudeSystem([
+        {"prefix": "", "factor": 1},
+        {"prefix": "doz", "factor": 12},
+        {"prefix": "gr", "factor": 144},
+        {"prefix": "half", "factor": "1/2"},
+    ])
+    assert [m.prefix for m in system.magnitudes] == ["half", "", "doz", "gr"]
+    assert system.convert(3, "gr", "doz") == 36
+    assert system.convert(1, "half", "doz", exact=True) == Fraction(1, 24)
+    assert system.exact_factor("half") == Fraction(1, 2)
+    assert system.factor("half") == 0.5
+    assert MagnitudeSystem.shared([{"prefix": "", "factor": 1}, {"prefix": "doz", "factor": 12}]).convert(24, "", "doz") == 2
+
+def test_factor_ratios():
+    system = MagnitudeSystem([{"prefix": "a", "factor": 4}, {"prefix": "b", "factor": 6}], default="a")
+    assert system.exact_conversion("b", "a") == (3, 2, None)
+    assert system.convert(5, "b", "a", exact="floor") == 7
+    assert system.convert(5, "b", "a", exact="ceil") == 8
+    assert system.get_converter("b", "a", exact="floor")(5) == 7
+    assert system.convert(5, "b", "a") == 7.5
+    values = array.array("q", [5, -5])
+    convert_buffer(system, values, "b", "a")
+    assert list(values) == [7, -8]
+
+def test_factor_order_errors():
+    with pytest.raises(ValueError):
+        MagnitudeOrder("x")
+    with pytest.raises(ValueError):
+        MagnitudeOrder("x", factor=0)
+    assert MagnitudeOrder("h", factor=3600) != MagnitudeOrder("h", factor=60)
+    assert str(MagnitudeOrder("h", factor=3600)) == "<MagnitudeOrder: 'h' (x3600)>"
+
+def test_to_prefix():
+    mag_sys = TimeMagnitudeUnit().mag_sys
+    assert mag_sys.to_prefix(-3) == "ms"
+    assert mag_sys.to_prefix(0) == "s"
+    assert mag_sys.to_prefix(1) is None
+    assert MagnitudeSystem([{"prefix": "", "power": 0}, {"prefix": "doz", "factor": 12}], base=12).to_prefix(1) == "doz"
+
+def test_subclass_order_list():
+    class YearMagnitudeUnit(TimeMagnitudeUnit):
+        time_order = TimeMagnitudeUnit.time_order + [{"prefix": "y", "factor": 365 * 86400}]
+
+    assert YearMagnitudeUnit().transform(1, "y", "d") == 365
+    with pytest.raises(MagnitudeSystem.MagnitudeDoesNotExist):
+        TimeMagnitudeUnit().transform(1, "y", "d")
+
+# code: language=python tabSize=4
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import io
+import itertools
+from fractions import Fraction
+
+import pytest
+
+from magorder.data import IECDataMagnitudeUnit
+from magorder.duration import TimeMagnitudeUnit
+from magorder.formatting import template
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+def test_format():
+    unit = IECDataMagnitudeUnit("B")
+    assert unit.format(1536) == "1.50 KiB"
+    assert unit.format(1.5, "GiB", precision=1) == "1.5 GiB"
+    assert unit.format(1.5, "GiB", auto=False) == "1.50 GiB"
+    assert unit.format(3, auto=False) == "3.00 B"
+    assert unit.format(-2048) == "-2.00 KiB"
+    assert TimeMagnitudeUnit().format(5400) == "1.50 h"
+    assert TimeMagnitudeUnit().format(5400, auto=False) == "5400.00 s"
+    with pytest.raises(unit.UnknownUnit):
+        unit.format(1, "m", auto=False)
+    with pytest.raises(unit.mag_sys.MagnitudeDoesNotExist):
+        unit.format(1, "XB", auto=False)
+
+def test_format_round_trip():
+    for unit, values in ((IECDataMagnitudeUnit("B"), [0, 1, 1023, 1536, 3 << 30]),
+                         (StdSIMagnitudeUnit("m"), [0.004, 12, 1500, 2.5e7]),
+                         (TimeMagnitudeUnit(), [0.25, 90, 5400, 86400 * 3])):
+        assert unit.parse_many(unit.format_many(values, precision=6)) == pytest.approx(values)
+
+def test_format_many():
+    unit = IECDataMagnitudeUnit("B")
+    assert list(unit.format_many([1536, 1 << 20])) == ["1.50 KiB", "1.00 MiB"]
+    assert list(unit.format_many([1, 2], ["KiB", "B"])) == ["1.00 KiB", "2.00 B"]
+    assert list(unit.format_many([1, 2], ["KiB", "B"], auto=False)) == ["1.00 KiB", "2.00 B"]
+    assert list(unit.format_many([1, 2], "MiB", precision=0, auto=False)) == ["1 MiB", "2 MiB"]
+    assert unit.humanize_many([1536, 1 << 20]) == ["1.50 KiB", "1.00 MiB"]
+
+def test_format_many_stream():
+    unit = IECDataMagnitudeUnit("B")
+    rendered = unit.format_many(itertools.count())
+    assert list(itertools.islice(rendered, 3000, 3002)) == ["2.93 KiB", "2.93 KiB"]
+
+def test_format_many_numpy():
+    numpy = pytest.importorskip("numpy")
+    unit = IECDataMagnitudeUnit("B")
+    assert list(unit.format_many(numpy.array([1536.0, 0.0, 1 << 30]))) == ["1.50 KiB", "0.00 B", "1.00 GiB"]
+
+def test_write_many():
+    unit = IECDataMagnitudeUnit("B")
+    out = io.StringIO()
+    assert unit.write_many(out, range(1020, 1030, 3)) == 4
+    assert out.getvalue() == "1020.00 B\n1023.00 B\n1.00 KiB\n1.00 KiB\n"
+    out = io.StringIO()
+    assert unit.write_many(out, [], end=",") == 0
+    assert unit.write_many(out, [1, 2], "KiB", auto=False, end=",") == 2
+    assert out.getvalue() == "1.00 KiB,2.00 KiB,"
+
+@pytest.mark.parametrize("exact", [True, "fraction", "floor"])
+def test_format_exact_systems(exact):
+    unit = IECDataMagnitudeUnit("B", exact=exact)
+    assert unit.humanize(1500) == "1.46 KiB"
+    assert unit.format(1500) == "1.46 KiB"
+    assert unit.format(3, "MiB") == "3.00 MiB"
+    assert list(unit.format_many([1500, 3 << 20])) == ["1.46 KiB", "3.00 MiB"]
+    assert list(unit.format_many([1500, 3], ["B", "MiB"])) == ["1.46 KiB", "3.00 MiB"]
+    assert unit.humanize_many([1500]) == ["1.46 KiB"]
+    assert unit.transform(1500, to_unit="KiB") in (1, Fraction(375, 256))
+
+def test_template():
+    assert template("GiB", 1) is template("GiB", 1)
+    assert template("{x}", 0)(2) == "2 {x}"
+
+# code: language=python tabSize=4
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import array
+
+import pytest
+
+from magorder.data import IECDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+SIZES = [0, 1, 500, 1024, 5000, 3 << 20, 7 << 30, -2048]
+
+
+def test_histogram():
+    mags = IECDataMagnitudeUnit("B")
+    result = mags.mag_sys.histogram(iter(SIZES))
+    assert list(result.counts.items())[:5] == [("", 3), ("Ki", 3), ("Mi", 1), ("Gi", 1), ("Ti", 0)]
+    assert result.sums is None
+    assert sum(result.counts.values()) == len(SIZES)
+
+def test_histogram_units():
+    mags = IECDataMagnitudeUnit("B")
+    result = mags.histogram(array.array("q", SIZES), sums=True)
+    assert result.counts["KiB"] == 3
+    assert result.sums["KiB"] == 1024 + 5000 - 2048
+    assert mags.histogram([1, 2048], "KiB").counts["MiB"] == 1
+    with pytest.raises(mags.UnknownUnit):
+        mags.histogram([1], "kg")
+
+def test_histogram_below_decimals():
+    mag = StdSIMagnitudeUnit("m")
+    result = mag.histogram([1.4, 1.4], "nm", sums=True)
+    assert result.counts["nm"] == 2
+    assert result.sums["nm"] == pytest.approx(2.8e-9)
+    result = mag.mag_sys.histogram([1.4, 1.4], sums=True, from_order="n")
+    assert result.sums["n"] == pytest.approx(2.8e-9)
+
+def test_histogram_below_decimals_numpy():
+    numpy = pytest.importorskip("numpy")
+    result = StdSIMagnitudeUnit("m").histogram(numpy.array([1.4, 1.4]), "nm", sums=True)
+    assert result.sums["nm"] == pytest.approx(2.8e-9)
+
+def test_histogram_bounds():
+    result = IECDataMagnitudeUnit("B", lower="Ki", upper="Mi").histogram(SIZES, sums=True)
+    assert result.counts == {"KiB": 6, "MiB": 2}
+    assert result.sums == {"KiB": 1 + 500 + 1024 + 5000 - 2048, "MiB": (3 << 20) + (7 << 30)}
+
+def test_histogram_primary_prefixes():
+    result = StdSIMagnitudeUnit("s").histogram([0.5, 0.05, 2e-9, 3600])
+    assert result.counts["ms"] == 0 and result.counts["ds"] == 1 and result.counts["cs"] == 1
+    assert result.counts["ns"] == 1 and result.counts["ks"] == 1
+
+def test_histogram_numpy():
+    numpy = pytest.importorskip("numpy")
+    mags = IECDataMagnitudeUnit("B")
+    values = numpy.random.default_rng(1).lognormal(10, 4, size=10_000)
+    vectorized, fallback = mags.histogram(values, sums=True), mags.histogram(values.tolist(), sums=True)
+    assert vectorized.counts == fallback.counts
+    assert vectorized.sums == pytest.approx(fallback.sums)
+    assert mags.mag_sys.histogram(numpy.array([[1, 2048], [0, 1 << 20]])).counts["Ki"] == 1
+
+# code: language=python tabSize=4
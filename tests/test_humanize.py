@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from magorder.data import IECDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+def test_best_prefix():
+    mags = IECDataMagnitudeUnit("B")
+    assert mags.best_prefix(123_456_789) == "Mi"
+    assert mags.best_prefix(1023) == ""
+    assert mags.best_prefix(1024) == "Ki"
+    assert mags.best_prefix(-2048) == "Ki"
+    assert mags.best_prefix(0) == ""
+    assert mags.best_prefix(1, "GiB") == "Gi"
+
+def test_best_prefix_bounds():
+    mag = StdSIMagnitudeUnit("m", lower="m", upper="k")
+    assert mag.best_prefix(1e-9) == "m"
+    assert mag.best_prefix(1e9) == "k"
+    assert mag.best_prefix(0.001) == "m"
+
+def test_humanize():
+    mags = IECDataMagnitudeUnit("B")
+    assert mags.humanize(123_456_789) == "117.74 MiB"
+    assert mags.humanize(123_456_789, precision=0) == "118 MiB"
+    assert mags.humanize(1536, from_unit="KiB") == "1.50 MiB"
+    assert mags.humanize(0) == "0.00 B"
+
+def test_humanize_many():
+    mags = IECDataMagnitudeUnit("B")
+    assert mags.humanize_many([1, 2048, 5 * 2 ** 30]) == ["1.00 B", "2.00 KiB", "5.00 GiB"]
+    assert mags.humanize_many([1, 1], from_unit=["KiB", "MiB"]) == ["1.00 KiB", "1.00 MiB"]
+
+def test_humanize_many_numpy():
+    numpy = pytest.importorskip("numpy")
+    mags = IECDataMagnitudeUnit("B")
+    values = numpy.array([0, 1, 2048, 5 * 2 ** 30])
+    assert mags.mag_sys.best_prefix_many(values) == ["", "", "Ki", "Gi"]
+    assert mags.humanize_many(values) == ["0.00 B", "1.00 B", "2.00 KiB", "5.00 GiB"]
+
+# code: language=python tabSize=4
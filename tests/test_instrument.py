@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from magorder import instrument
+from magorder.base import MagnitudeSystem, MagnitudeUnit
+from magorder.cache import SystemCache
+from magorder.data import IECDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+@pytest.fixture
+def instrumented():
+    instrument.reset()
+    events = []
+    instrument.enable(lambda *event: events.append(event))
+    yield events
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled_is_original():
+    convert = MagnitudeSystem.__dict__["convert"]
+    instrument.enable()
+    assert instrument.is_enabled()
+    assert MagnitudeSystem.__dict__["convert"] is not convert
+    instrument.disable()
+    assert not instrument.is_enabled()
+    assert MagnitudeSystem.__dict__["convert"] is convert
+
+def test_counters(instrumented):
+    unit = StdSIMagnitudeUnit("m")
+    unit.transform(1500, "m", "km")
+    unit.transform(2, "km")
+    unit.mag_sys.convert(1, "k", "m")
+    with pytest.raises(MagnitudeSystem.MagnitudeDoesNotExist):
+        unit.mag_sys.magnitude_by_prefix("x")
+    with pytest.raises(MagnitudeUnit.UnknownUnit):
+        unit.transform(1, "kg")
+
+    snapshot = instrument.snapshot()
+    assert snapshot["calls"]["transform"] == 3
+    assert snapshot["calls"]["convert"] == 3
+    assert snapshot["keys"]["transform"] == {("m", "km"): 1, ("km", "m"): 1, ("kg", "m"): 1}
+    assert snapshot["keys"]["convert"] == {("", "k"): 1, ("k", ""): 1, ("k", "m"): 1}
+    assert snapshot["errors"] == {"magnitude_by_prefix": {"MagnitudeDoesNotExist": 1}, "transform": {"UnknownUnit": 1}}
+    assert snapshot["seconds"]["transform"] > 0
+    assert [event[:2] for event in instrumented if event[0] == "convert"][0] == ("convert", ("", "k"))
+    assert instrumented[-1][0] == "transform" and isinstance(instrumented[-1][3], MagnitudeUnit.UnknownUnit)
+
+    instrument.reset()
+    assert instrument.snapshot()["calls"] == {}
+
+def test_cache_counters(instrumented, monkeypatch):
+    cache = SystemCache(maxsize=1)
+    monkeypatch.setattr("magorder.data.systems", cache)
+    IECDataMagnitudeUnit("B")
+    IECDataMagnitudeUnit("B")
+    IECDataMagnitudeUnit("B", legacy=True)
+    assert instrument.snapshot()["cache"] == {"lookups": 3, "hits": 1, "misses": 2, "evictions": 1}
+
+# code: language=python tabSize=4
@@ -4,9 +4,12 @@
 # GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import pickle
+
 import pytest
 
-from magorder.base import MagnitudeSystem
+from magorder.base import MagnitudeOrder, MagnitudeSystem
+from magorder.data import IECDataMagnitudeUnit
 from magorder.stdsi import StdSIMagnitudeUnit
 
 
@@ -63,4 +66,45 @@ def test_base_magnitude_order_invalid_limits():
     with pytest.raises(ValueError):
         b = MagnitudeSystem(ord, upper="Y")
 
+def test_base_magnitude_order_get_converter():
+    ms = StdSIMagnitudeUnit("m").mag_sys
+    km_to_m = ms.get_converter("k", "")
+    assert km_to_m(0.1) == 100
+    assert km_to_m(0.1) == ms.convert(0.1, "k", "")
+    um_to_km = ms.get_converter("µ", "k")
+    assert um_to_km(100_000_000) == 0.1
+    assert ms.get_converter("u", "µ")(42) == 42
+    assert ms.get_converter()(42) == 42
+
+def test_base_magnitude_order_get_converter_invalid():
+    ms = StdSIMagnitudeUnit("m").mag_sys
+    with pytest.raises(ValueError):
+        ms.get_converter("x", "k")
+    with pytest.raises(ValueError):
+        ms.get_converter("k", "x")
+
+def test_magnitude_order_value_object():
+    m = MagnitudeOrder("µ", -6, ["u"])
+    assert m.prefixes == frozenset({"µ", "u"})
+    assert m.aliases == ("u",)
+    assert m == MagnitudeOrder("µ", -6, ("u",))
+    assert hash(m) == hash(MagnitudeOrder("µ", -6, ["u"]))
+    assert m != MagnitudeOrder("µ", -6)
+    assert pickle.loads(pickle.dumps(m)) == m
+    assert m.match("u") and not m.match("m")
+    assert m.match_all(-6)
+    with pytest.raises(AttributeError):
+        m.power = 3
+    with pytest.raises(AttributeError):
+        m.other = 1
+
+def test_base_magnitude_order_to_prefix_bounds():
+    ms = StdSIMagnitudeUnit("m", lower=-6, upper="k").mag_sys
+    assert ms.to_prefix(-6) == "µ"
+    assert ms.to_prefix(3) == "k"
+    assert ms.to_prefix(-9) is None
+    assert ms.to_prefix(6) is None
+    assert StdSIMagnitudeUnit("m", lower="u").mag_sys.to_prefix(-6) == "µ"
+    assert IECDataMagnitudeUnit("B", legacy=True).mag_sys.to_prefix(1) == "Ki"
+
 # code: language=python tabSize=4
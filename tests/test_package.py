@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import subprocess
+import sys
+
+import pytest
+
+import magorder
+from magorder.base import MagnitudeOrder, MagnitudeSystem
+from magorder.data import IECDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+def test_lazy_exports():
+    assert magorder.StdSIMagnitudeUnit is StdSIMagnitudeUnit
+    assert "IECDataMagnitudeUnit" in dir(magorder)
+    assert set(magorder.__all__) <= set(dir(magorder))
+    with pytest.raises(AttributeError):
+        magorder.NoSuchThing  # pylint: disable=pointless-statement
+
+def test_cold_import():
+    code = "import sys, magorder; assert 'magorder.base' not in sys.modules; " \
+           "assert magorder.StdSIMagnitudeUnit('m').transform(1, 'km') == 1000; assert 'numpy' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+@pytest.mark.parametrize("orders, spec, kwargs", [
+    (StdSIMagnitudeUnit.std_si_orders, StdSIMagnitudeUnit.std_si_order, {"lower": "m", "upper": "G"}),
+    (IECDataMagnitudeUnit._orders(True, False), None, {"base": 1024}),
+])
+def test_from_orders(orders, spec, kwargs):
+    if spec is None:
+        spec = [{"prefix": m.prefix, "power": m.power, "aliases": m.aliases} for m in orders]
+    trusted, checked = MagnitudeSystem.from_orders(orders, **kwargs), MagnitudeSystem(spec, **kwargs)
+    assert trusted.magnitudes == checked.magnitudes
+    assert trusted.best_prefix(123456) == checked.best_prefix(123456)
+    for prefix in checked._prefix_mag_map:
+        assert trusted.magnitude_by_prefix(prefix) == checked.magnitude_by_prefix(prefix)
+        assert trusted.conversion(prefix, trusted.magnitudes[-1].prefix) == checked.conversion(prefix, checked.magnitudes[-1].prefix)
+    assert isinstance(trusted.magnitudes[0], MagnitudeOrder)
+
+# code: language=python tabSize=4
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from magorder import parallel
+from magorder.base import MagnitudeSystem, MagnitudeUnit
+from magorder.data import IECDataMagnitudeUnit, SIDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+class Meter(StdSIMagnitudeUnit):
+    def __init__(self):
+        super().__init__("m", lower="m")
+        self.label = "length"
+
+
+@pytest.mark.parametrize("unit, to_unit", [
+    (StdSIMagnitudeUnit("m"), "km"),
+    (SIDataMagnitudeUnit("B", exact="floor"), "kB"),
+    (IECDataMagnitudeUnit("B", legacy=True, case=False), "kiB"),
+    (IECDataMagnitudeUnit("B").with_decimals(2), "KiB"),
+])
+def test_pickle_family_units(unit, to_unit):
+    data = pickle.dumps(unit)
+    assert len(data) < 150
+    restored = pickle.loads(data)
+    assert type(restored) is type(unit)
+    assert restored.mag_sys is unit.mag_sys
+    assert restored.transform(1234.5678, to_unit=to_unit) == unit.transform(1234.5678, to_unit=to_unit)
+
+def test_pickle_systems():
+    mag_sys = MagnitudeSystem.shared(StdSIMagnitudeUnit.std_si_order, lower="m", upper="k", exact="ceil")
+    data = pickle.dumps(mag_sys)
+    assert b"MagnitudeOrder" not in data
+    assert pickle.loads(data) is mag_sys
+    assert pickle.loads(pickle.dumps(mag_sys.with_decimals(1))) is mag_sys.with_decimals(1)
+
+    unit = MagnitudeUnit("m", MagnitudeSystem([{"prefix": "", "power": 0}, {"prefix": "k", "power": 3}]))
+    restored = pickle.loads(pickle.dumps(unit))
+    assert restored.mag_sys is pickle.loads(pickle.dumps(unit.mag_sys))
+    assert restored.parse("1.5 km") == 1500
+
+def test_pickle_subclass_with_constructor():
+    unit = Meter()
+    restored = pickle.loads(pickle.dumps(unit))
+    assert type(restored) is Meter
+    assert restored.mag_sys is pickle.loads(pickle.dumps(unit.mag_sys))
+    assert restored.label == "length"
+    assert restored.transform(1.5, "km") == 1500
+
+def test_map_chunks():
+    chunks = parallel.chunked(range(10), 3)
+    assert list(parallel.map_chunks(sum, chunks, jobs=1)) == [3, 12, 21, 9]
+    with ThreadPoolExecutor(2) as executor:
+        assert list(parallel.map_chunks(sum, parallel.chunked(range(10), 3), jobs=2, executor=executor)) == [3, 12, 21, 9]
+
+def test_transform_many():
+    unit = IECDataMagnitudeUnit("B")
+    values = list(range(1000))
+    expected = unit.transform_many(values, "KiB", "MiB")
+    assert parallel.transform_many(unit, values, "KiB", "MiB", jobs=2, chunk_size=300) == expected
+    with pytest.raises(MagnitudeSystem.MagnitudeDoesNotExist):
+        parallel.transform_many(unit, values, "kB", jobs=2)
+
+def test_parse_many():
+    unit = StdSIMagnitudeUnit("m")
+    lines = [f"{i} km" for i in range(100)]
+    assert parallel.parse_many(unit, lines, "m", jobs=2, chunk_size=7) == unit.parse_many(lines, "m")
+
+# code: language=python tabSize=4
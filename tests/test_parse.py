@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from magorder.data import SIDataMagnitudeUnit, IECDataMagnitudeUnit
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+def test_parse_std_si():
+    mag = StdSIMagnitudeUnit("m")
+    assert mag.parse("100m") == 100
+    assert mag.parse("0.1 km") == 100
+    assert mag.parse("12 µm", "µm") == 12
+    assert mag.parse("12 um", "µm") == 12
+    assert mag.parse("  -1.5e3 mm ") == -1.5
+    assert mag.parse(".5km") == 500
+
+def test_parse_longest_prefix():
+    mag = StdSIMagnitudeUnit("m")
+    assert mag.parse("1dam") == 10
+    assert mag.parse("1dm") == 0.1
+
+def test_parse_keeps_integers():
+    mag = SIDataMagnitudeUnit("b")
+    assert isinstance(mag.parse("300kb", "kb"), int)
+    assert mag.parse("300kb") == 300_000
+
+def test_parse_iec_variants():
+    mags = IECDataMagnitudeUnit("bps", legacy=True)
+    assert mags.parse("4096 Kibps", "Mibps") == 4
+    assert mags.parse("1 Kbps") == 1024
+    mags = IECDataMagnitudeUnit("B", case=False)
+    assert mags.parse("1.5 GiB", "MiB") == 1536
+    assert mags.parse("1.5 giB", "MiB") == 1536
+
+def test_parse_invalid():
+    mag = StdSIMagnitudeUnit("m")
+    with pytest.raises(ValueError):
+        mag.parse("km")
+    with pytest.raises(ValueError):
+        mag.parse("1 xxm")
+    with pytest.raises(ValueError):
+        mag.parse("1 km", "xx")
+
+def test_parse_many():
+    mags = IECDataMagnitudeUnit("B")
+    assert mags.parse_many(["1 KiB", "1MiB", "2048 B"], "KiB") == [1, 1024, 2]
+    assert mags.parse_many([]) == []
+    with pytest.raises(ValueError):
+        mags.parse_many(["1 KiB", "1 KB"])
+
+# code: language=python tabSize=4
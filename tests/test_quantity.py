@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bisect
+import heapq
+
+import pytest
+
+from magorder.data import IECDataMagnitudeUnit
+from magorder.quantity import Quantity
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+def test_sort_key():
+    mags = IECDataMagnitudeUnit("", legacy=True)
+    sizes = ["980K", "1.2G", "3Mi", "2000K", "0", "-1K", "-3Mi", "1023"]
+    assert sorted(sizes, key=mags.sort_key) == ["-3Mi", "-1K", "0", "1023", "980K", "2000K", "3Mi", "1.2G"]
+    assert mags.sort_key("1Ki") == mags.sort_key("1024") == mags.sort_key(1, "K")
+
+def test_sort_key_mixed_prefixes():
+    mag = StdSIMagnitudeUnit("m")
+    assert mag.sort_key(0.1, "km") == mag.sort_key(100, "m")
+    assert mag.sort_key(1, "km") > mag.sort_key(999, "m")
+    assert mag.sort_key(1, "mm") < mag.sort_key(1, "m")
+    with pytest.raises(ValueError):
+        mag.sort_key(1, "xx")
+
+def test_sort_key_below_decimals():
+    mag = StdSIMagnitudeUnit("m")
+    assert mag.sort_key(1000.0004, "m") > mag.sort_key(1.0000001, "km")
+    assert mag.sort_key(1.0000001, "km") > mag.sort_key(1000.00000004, "m")
+    assert mag.sort_key(-1000.0004, "m") < mag.sort_key(-1.0000001, "km")
+    assert Quantity(mag, 1000.0000004) != Quantity(mag, 1, "k")
+    assert Quantity(mag, 1000.0000004) > Quantity(mag, 1, "k")
+
+def test_sort_keys():
+    mags = IECDataMagnitudeUnit("B")
+    values = [3, 1, 2048]
+    units = ["MiB", "GiB", "B"]
+    keys = mags.sort_keys(values, units)
+    assert sorted(range(3), key=keys.__getitem__) == [2, 0, 1]
+    assert mags.sort_keys(["1 KiB", "1 B"]) == [mags.sort_key("1 KiB"), mags.sort_key(1)]
+
+def test_sort_keys_numpy():
+    numpy = pytest.importorskip("numpy")
+    mags = IECDataMagnitudeUnit("B")
+    values = numpy.array([3, 1, 2048, 0, -5])
+    units = numpy.array(["MiB", "GiB", "B", "KiB", "KiB"])
+    keys = mags.sort_keys(values, units)
+    assert numpy.argsort(keys).tolist() == [4, 3, 2, 0, 1]
+
+def test_sort_keys_numpy_below_decimals():
+    numpy = pytest.importorskip("numpy")
+    mag = StdSIMagnitudeUnit("m")
+    values = numpy.array([1.4, 1.0, 1.2])
+    keys = mag.sort_keys(values, "nm")
+    assert numpy.argsort(keys).tolist() == [1, 2, 0]
+    assert keys["mantissa"].tolist() == pytest.approx([1.4, 1.0, 1.2])
+    assert keys.tolist() == [tuple(mag.sort_key(value, "nm")) for value in values.tolist()]
+    keys = mag.sort_keys(values, numpy.array(["nm", "nm", "pm"]))
+    assert numpy.argsort(keys).tolist() == [2, 1, 0]
+    keys = mag.mag_sys.sort_keys(values, ["n", "n", "p"])
+    assert numpy.argsort(keys).tolist() == [2, 1, 0]
+    with pytest.raises(mag.UnknownUnit):
+        mag.sort_keys(values, ["nm", "xx", "nm"])
+
+def test_quantity_comparisons():
+    mags = IECDataMagnitudeUnit("B")
+    one_k = Quantity.parse(mags, "1 KiB")
+    assert one_k == Quantity(mags, 1024)
+    assert one_k < Quantity(mags, 1, "Mi")
+    assert one_k >= Quantity(mags, 1023)
+    assert hash(one_k) == hash(Quantity(mags, 1024))
+    assert one_k.to("B") == 1024
+    assert str(one_k) == "1 KiB"
+    assert one_k != Quantity(StdSIMagnitudeUnit("B"), 1024)
+    with pytest.raises(TypeError):
+        assert one_k < Quantity(StdSIMagnitudeUnit("B"), 1024)
+
+def test_quantity_heapq_bisect():
+    mags = IECDataMagnitudeUnit("B")
+    quantities = [Quantity.parse(mags, text) for text in ("3 MiB", "1 GiB", "512 KiB", "1 B")]
+    assert str(heapq.nsmallest(1, quantities)[0]) == "1 B"
+    ordered = sorted(quantities)
+    assert [str(q) for q in ordered] == ["1 B", "512 KiB", "3 MiB", "1 GiB"]
+    assert bisect.bisect(ordered, Quantity(mags, 1, "Mi")) == 2
+
+# code: language=python tabSize=4
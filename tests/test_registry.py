@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022, Alexei Znamensky <russoz@gmail.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from magorder.base import MagnitudeUnit
+from magorder.data import SIDataMagnitudeUnit, IECDataMagnitudeUnit
+from magorder.registry import UnitRegistry
+from magorder.stdsi import StdSIMagnitudeUnit
+
+
+@pytest.fixture
+def registry():
+    return UnitRegistry([
+        StdSIMagnitudeUnit("m"),
+        StdSIMagnitudeUnit("s"),
+        StdSIMagnitudeUnit("g"),
+        IECDataMagnitudeUnit("B"),
+        SIDataMagnitudeUnit("B"),
+        SIDataMagnitudeUnit("bps"),
+    ])
+
+
+def test_registry_resolve(registry):
+    assert registry.resolve("ms").unit.base_unit == "s"
+    assert registry.resolve("ms").prefix == "m"
+    assert registry.resolve("ng").order.power == -9
+    assert registry.resolve("MiB").prefix == "Mi"
+    assert registry.resolve("kbps").unit.base_unit == "bps"
+    assert registry.resolve("xyz") is None
+    assert "MiB" in registry
+    assert "xyz" not in registry
+
+def test_registry_tie_breaking(registry):
+    assert registry.resolve("m").unit.base_unit == "m"
+    assert registry.resolve("m").prefix == ""
+    assert registry.resolve("B").unit is registry.units[3]
+    assert registry.resolve("kB").unit is registry.units[4]
+
+def test_registry_convert(registry):
+    assert registry.convert(1, "km", "m") == 1000
+    assert registry.convert(1500, "ms", "s") == 1.5
+    assert registry.convert(1, "MiB", "kB") == 1048.576
+    assert registry.convert(1, "GB", "MiB") == 953.674316
+    assert registry.convert(2, "B", "B") == 2
+    converter = registry.get_converter("MiB", "kB")
+    assert converter(2) == 2097.152
+
+def test_registry_convert_invalid(registry):
+    with pytest.raises(MagnitudeUnit.UnknownUnit):
+        registry.convert(1, "xyz", "m")
+    with pytest.raises(MagnitudeUnit.UnknownUnit):
+        registry.convert(1, "m", "xyz")
+    with pytest.raises(UnitRegistry.IncompatibleUnits):
+        registry.convert(1, "km", "ms")
+
+# code: language=python tabSize=4
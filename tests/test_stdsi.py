@@ -6,6 +6,7 @@
 
 import pytest
 
+from magorder.base import MagnitudeSystem
 from magorder.stdsi import StdSIMagnitudeUnit
 
 
@@ -17,14 +18,17 @@ def test_simple_std_si_magnitude():
     assert mag.transform(100_000_000, "µm", "km") == 0.1
     assert mag.transform(100_000_000_000_000_000_000_000_000.0, "ym") == 100
     assert mag.transform(0.000_000_000_000_000_000_000_000_000_1, "Ym") == 0.0001
-    mag.mag_sys.set_decimals(3)
+    with pytest.raises(AttributeError, match=r"with_decimals\(3\)"):
+        mag.mag_sys.set_decimals(3)
+    mag = mag.with_decimals(3)
     assert mag.transform(0.000_000_000_000_000_000_000_1, "Ym") == 100
-    mag.mag_sys.set_decimals(4)
+    mag = mag.with_decimals(4)
     assert mag.transform(0.000_000_000_000_000_000_000_000_000_1, "Ym") == 0.0001
     assert mag.transform(0.000_000_000_000_000_000_000_000_000_1, "Ym") == 0.0001
-    mag.mag_sys.set_decimals(3)
+    mag = mag.with_decimals(3)
     assert mag.transform(0.000_000_000_000_000_000_000_000_000_1, "Ym") == 0.0
     assert mag.transform(0.000_000_000_000_000_000_000_000_000_1, "Ym") == 0.0
+    assert StdSIMagnitudeUnit("m").transform(0.000_000_000_000_000_000_000_000_000_1, "Ym") == 0.0001
 
 def test_std_si_magnitude_aliases():
     mag = StdSIMagnitudeUnit("m")
@@ -51,4 +55,44 @@ def test_magnitude_limits():
     with pytest.raises(ValueError):
         assert mag.transform(1000, "mm") == 1
 
+def test_per_call_precision():
+    mag = StdSIMagnitudeUnit("m")
+    assert mag.transform(0.000_000_000_000_000_000_000_1, "Ym", decimals=3) == 100
+    assert mag.transform(1234, "m", "km", decimals=1) == 1.2
+    assert mag.transform(1234, "m", "km", rounding="none") == 1.234
+    assert mag.transform(1251, "m", "km", decimals=1, rounding="floor") == 1.2
+    assert mag.transform(-1251, "m", "km", decimals=1, rounding="floor") == -1.3
+    assert mag.transform(1201, "m", "km", decimals=1, rounding="ceil") == 1.3
+    assert mag.transform(290, "m", "km", decimals=2, rounding="floor") == 0.29
+    assert mag.transform(290, "m", "km", decimals=2, rounding="ceil") == 0.29
+    assert mag.transform(1234, "m", "m", decimals=1, rounding="floor") == 1234
+    assert mag.transform(0.1 * 3, "km", "m", decimals=2, rounding="ceil") == 300
+    assert mag.transform(0.7 * 3, "km", "m", decimals=2, rounding="floor") == 2100
+    assert mag.transform(0.1 * 3 * 1000, "m", "km", decimals=2, rounding="ceil") == 0.3
+    assert mag.transform(0.7 * 3 * 1000, "m", "km", decimals=2, rounding="floor") == 2.1
+    assert mag.transform(-0.1 * 3, "km", "m", decimals=2, rounding="floor") == -300
+    assert mag.transform(-0.7 * 3, "km", "m", decimals=2, rounding="ceil") == -2100
+    assert mag.transform(301, "m", "km", decimals=2, rounding="ceil") == 0.31
+    assert mag.transform(2099, "m", "km", decimals=2, rounding="floor") == 2.09
+    assert mag.mag_sys.decimals is None
+    with pytest.raises(ValueError):
+        mag.transform(1, "km", rounding="up")
+
+def test_converter_precision():
+    mag_sys = StdSIMagnitudeUnit("m").mag_sys
+    for rounding in (None, "round", "floor", "ceil", "none"):
+        converter = mag_sys.get_converter("", "k", decimals=1, rounding=rounding)
+        for value in (1234, -1251, 999.99, 0.05):
+            assert converter(value) == mag_sys.convert(value, "", "k", decimals=1, rounding=rounding)
+
+def test_subclass_order_list():
+    class RonnaMagnitudeUnit(StdSIMagnitudeUnit):
+        std_si_order = StdSIMagnitudeUnit.std_si_order + [{"prefix": "R", "power": 27}]
+
+    mag = RonnaMagnitudeUnit("m")
+    assert mag.transform(1, "Rm") == 1e27
+    assert RonnaMagnitudeUnit("m", upper="R").transform(1, "Rm", "Ym") == 1000
+    with pytest.raises(MagnitudeSystem.MagnitudeDoesNotExist):
+        StdSIMagnitudeUnit("m").transform(1, "Rm")
+
 # code: language=python tabSize=4